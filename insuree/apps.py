@@ -35,9 +35,23 @@ DEFAULT_CFG = {
     "validation_code_invalid_insuree_number_exception": 5,
     "validation_code_validator_import_error": 6,
     "validation_code_validator_function_error": 7,
+    "validation_code_reserved_insuree_number": 8,
     "insuree_fsp_mandatory": False,
     "insuree_as_worker": False,
     "is_insuree_photo_required": False,
+    "reference_data_cache_timeout": 3600,  # seconds before the process-local reference data copy is reloaded
+    "http_cache_timeout": 600,  # seconds a cached reference list or insuree lookup response is kept
+    "report_workers": 2,  # size of the worker pool of asynchronous reports, per process
+    "report_artifact_ttl": 900,  # seconds a generated report is served again for identical parameters
+    "report_artifacts_root_path": os.path.abspath("./reports/insuree"),
+    "insuree_number_block_max_size": 1000,  # max insuree numbers reserved at once for a device/officer
+    "chf_id_filter_false_positive_rate": 0.01,  # of the Bloom filter of the insuree numbers for offline clients
+    "chf_id_filter_timeout": 3600,  # seconds before the insuree numbers filter is rebuilt
+    "coverage_cache_size": 100000,  # insurees whose coverage intervals are kept in the process cache
+    "coverage_cache_timeout": 300,  # seconds before the process cache of coverage intervals is dropped
+    "enquiry_max_chf_ids": 100,  # insuree numbers accepted by one batched enquiry
+    "enquiry_cache_timeout": 60,  # seconds an insuree of the batched enquiry is kept, writes invalidate it
+    "sync_safety_lag": 300,  # seconds before the watermark sent again by the delta sync (late commits)
 }
 
 
@@ -65,6 +79,7 @@ class InsureeConfig(AppConfig):
     validation_code_invalid_insuree_number_exception = None
     validation_code_validator_import_error = None
     validation_code_validator_function_error = None
+    validation_code_reserved_insuree_number = None
     insuree_photos_root_path = None
     excluded_insuree_chfids = []
     renewal_photo_age_adult = None
@@ -75,6 +90,19 @@ class InsureeConfig(AppConfig):
     insuree_fsp_mandatory = None
     insuree_as_worker = None
     is_insuree_photo_required = None
+    reference_data_cache_timeout = None
+    http_cache_timeout = None
+    report_workers = None
+    report_artifact_ttl = None
+    report_artifacts_root_path = None
+    insuree_number_block_max_size = None
+    chf_id_filter_false_positive_rate = None
+    chf_id_filter_timeout = None
+    coverage_cache_size = None
+    coverage_cache_timeout = None
+    enquiry_max_chf_ids = None
+    enquiry_cache_timeout = None
+    sync_safety_lag = None
 
     def __load_config(self, cfg):
         for field in cfg:
@@ -86,6 +114,14 @@ class InsureeConfig(AppConfig):
         cfg = ModuleConfiguration.get_or_default(MODULE_NAME, DEFAULT_CFG)
         self.__load_config(cfg)
         self._configure_photo_root(cfg)
+        from .reference_data import bind_reference_data_signals
+        from .cache import bind_insuree_data_signals
+        from .coverage import bind_coverage_signals
+        from .services import bind_member_count_signals
+        bind_reference_data_signals()
+        bind_insuree_data_signals()
+        bind_coverage_signals()
+        bind_member_count_signals()
 
     # Getting these at runtime for easier testing
     @classmethod
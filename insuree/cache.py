@@ -0,0 +1,103 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+REFERENCE_DATA = "reference_data"
+INSUREE_DATA = "insuree_data"
+COVERAGE_DATA = "coverage_data"
+
+# Per insuree versions are only kept for a day: an expired counter restarts from a newer timestamp
+INSUREE_VERSION_TIMEOUT = 86400
+
+
+def _version_key(name):
+    return f"insuree_data_version_{name}"
+
+
+def get_data_version(name, timeout=None):
+    """
+    Version counter shared by all processes through the cache backend.
+    """
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        # Start from a timestamp rather than 1, so that an evicted counter never goes back to an old version
+        cache.add(key, int(time.time() * 1000), timeout)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(name, timeout=None):
+    try:
+        cache.incr(_version_key(name))
+    except ValueError:
+        get_data_version(name, timeout)
+
+
+def bump_data_version_on_commit(name, timeout=None):
+    # Readers must not cache pre-commit data under the new version
+    transaction.on_commit(lambda: bump_data_version(name, timeout))
+
+
+def _insuree_version_name(name, chf_id):
+    # Hashed, so that any insuree number gives a valid cache key
+    return f"{name}_{hashlib.sha1(str(chf_id).encode('utf-8')).hexdigest()}"
+
+
+def get_insuree_versions(name, chf_ids):
+    """
+    {chf_id: version} of a data set per insuree (INSUREE_DATA, COVERAGE_DATA): bumped per insuree by the writes
+    of its rows, and as a whole (the version of name) by the set-based writes of many insurees.
+    The versions are read with one get_many, the missing counters are started with add, without overwriting
+    the counters created concurrently, which are read back with a second get_many.
+    """
+    keys = {chf_id: _version_key(_insuree_version_name(name, chf_id)) for chf_id in chf_ids}
+    global_key = _version_key(name)
+    versions = cache.get_many([global_key, *keys.values()])
+    missing = [key for key in {global_key, *keys.values()} if versions.get(key) is None]
+    if missing:
+        # Start from a timestamp rather than 1, see get_data_version
+        start = int(time.time() * 1000)
+        lost = [key for key in missing
+                if not cache.add(key, start, None if key == global_key else INSUREE_VERSION_TIMEOUT)]
+        versions.update({key: start for key in missing})
+        if lost:
+            versions.update(cache.get_many(lost))
+    return {chf_id: "%s.%s" % (versions[global_key], versions[key]) for chf_id, key in keys.items()}
+
+
+def bump_insuree_version(name, chf_id):
+    bump_data_version(_insuree_version_name(name, chf_id), INSUREE_VERSION_TIMEOUT)
+
+
+def get_insuree_data_versions(chf_ids):
+    """
+    {chf_id: version} of the data of the insurees
+    """
+    return get_insuree_versions(INSUREE_DATA, chf_ids)
+
+
+def get_insuree_data_version(chf_id):
+    return get_insuree_data_versions([chf_id])[chf_id]
+
+
+def bump_insuree_data_version_on_commit(chf_id):
+    bump_data_version_on_commit(_insuree_version_name(INSUREE_DATA, chf_id), INSUREE_VERSION_TIMEOUT)
+
+
+def _on_insuree_data_changed(instance, **kwargs):
+    if instance.chf_id:
+        bump_insuree_data_version_on_commit(instance.chf_id)
+
+
+def bind_insuree_data_signals():
+    """
+    Row by row insuree writes bump the version of the insuree, the set-based writes (which send no signal)
+    bump INSUREE_DATA explicitly.
+    """
+    from django.db.models.signals import post_save, post_delete
+    from insuree.models import Insuree
+    post_save.connect(_on_insuree_data_changed, sender=Insuree, dispatch_uid="insuree_data_save_Insuree")
+    post_delete.connect(_on_insuree_data_changed, sender=Insuree, dispatch_uid="insuree_data_delete_Insuree")
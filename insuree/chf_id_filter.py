@@ -0,0 +1,144 @@
+"""
+Bloom filter of the current insuree numbers (CHF IDs), so that offline enrollment clients can reject most
+duplicated numbers locally instead of at sync time.
+
+Blob layout (big endian):
+    magic b"CHFB" | format version (1 byte) | hash count k (1 byte) | bit count m (8 bytes)
+    | insuree count (8 bytes) | filter version (8 bytes) | m bits, bit j being 1 << (j % 8) of byte j // 8
+
+An insuree number is hashed with SHA-256 over its UTF-8 encoding, keeping the first 16 bytes (digest).
+h1 and h2 are the two 8 bytes big endian halves of the digest and the k bits of the number are
+(h1 + i * h2) mod m, for i in 0..k-1.
+
+The filter version is the latest validity_from of the insurees in the filter, in microseconds since epoch.
+chf_id_filter_delta() gives the bit positions, in the client filter (m and k of its header), of the insurees
+added or updated since a version (minus sync_safety_lag), to be set in that filter. Bit positions rather than digests of the numbers:
+the short insuree numbers could be recovered from their digests by brute force, the positions merged in a set
+only tell what the filter does. Deleted insurees stay in a filter (they only add false positives) until the
+next download.
+"""
+import calendar
+import datetime
+import hashlib
+import math
+import struct
+
+from django.core.cache import cache
+
+from insuree.apps import InsureeConfig
+from insuree.models import Insuree
+
+FILTER_MAGIC = b"CHFB"
+FILTER_FORMAT_VERSION = 1
+FILTER_HEADER = struct.Struct(">4sBBQQQ")
+FILTER_CHUNK_SIZE = 5000
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def chf_id_digest(chf_id):
+    return hashlib.sha256(chf_id.encode("utf-8")).digest()[:16]
+
+
+def _bit_positions(digest, bit_count, hash_count):
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big")
+    return [(h1 + i * h2) % bit_count for i in range(hash_count)]
+
+
+def bloom_parameters(count, false_positive_rate):
+    """
+    Bit count (a multiple of 8) and hash count of a Bloom filter of count items at the given false positive rate
+    """
+    count = max(count, 1)
+    bit_count = max(64, math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2))
+    bit_count += -bit_count % 8
+    hash_count = max(1, round(bit_count / count * math.log(2)))
+    return bit_count, hash_count
+
+
+def to_filter_version(timestamp):
+    if timestamp is None:
+        return 0
+    return calendar.timegm(timestamp.timetuple()) * 1_000_000 + timestamp.microsecond
+
+
+def from_filter_version(version):
+    return EPOCH + datetime.timedelta(microseconds=version)
+
+
+def _current_insurees(district_id=None, since_version=None):
+    queryset = Insuree.objects.filter(validity_to__isnull=True, legacy_id__isnull=True, chf_id__isnull=False)
+    if district_id:
+        queryset = queryset.filter(family__location__parent__parent_id=district_id)
+    if since_version:
+        # Late commits (see insuree.sync): the last sync_safety_lag seconds before the version are read again,
+        # setting their bits again is harmless
+        queryset = queryset.filter(validity_from__gt=from_filter_version(since_version) - datetime.timedelta(
+            seconds=InsureeConfig.sync_safety_lag))
+    return queryset
+
+
+def build_chf_id_filter(district_id=None):
+    """
+    Bloom filter blob of the current insuree numbers, optionally restricted to the families of a district
+    """
+    queryset = _current_insurees(district_id)
+    bit_count, hash_count = bloom_parameters(queryset.count(), InsureeConfig.chf_id_filter_false_positive_rate)
+    bits = bytearray(bit_count // 8)
+    inserted = 0
+    watermark = None
+    for chf_id, validity_from in queryset.values_list("chf_id", "validity_from").iterator(
+            chunk_size=FILTER_CHUNK_SIZE):
+        for position in _bit_positions(chf_id_digest(chf_id), bit_count, hash_count):
+            bits[position // 8] |= 1 << (position % 8)
+        inserted += 1
+        if watermark is None or validity_from > watermark:
+            watermark = validity_from
+    header = FILTER_HEADER.pack(FILTER_MAGIC, FILTER_FORMAT_VERSION, hash_count, bit_count, inserted,
+                                to_filter_version(watermark))
+    return header + bytes(bits)
+
+
+def read_filter_header(blob):
+    magic, format_version, hash_count, bit_count, count, version = FILTER_HEADER.unpack_from(blob)
+    if magic != FILTER_MAGIC or format_version != FILTER_FORMAT_VERSION:
+        raise ValueError("not an insuree number filter")
+    return {"hash_count": hash_count, "bit_count": bit_count, "count": count, "version": version}
+
+
+def might_contain(blob, chf_id):
+    """
+    False if the insuree number is certainly not in the filter (reference implementation for the clients)
+    """
+    header = read_filter_header(blob)
+    bits = memoryview(blob)[FILTER_HEADER.size:]
+    return all(bits[position // 8] & (1 << (position % 8))
+               for position in _bit_positions(chf_id_digest(chf_id), header["bit_count"], header["hash_count"]))
+
+
+def chf_id_filter_delta(since_version, bit_count, hash_count, district_id=None):
+    """
+    Sorted bit positions, in a filter of bit_count bits and hash_count hashes, of the current insurees added
+    or updated after the filter version, and the new version
+    """
+    version = since_version
+    positions = set()
+    for chf_id, validity_from in _current_insurees(district_id, since_version) \
+            .values_list("chf_id", "validity_from").iterator(chunk_size=FILTER_CHUNK_SIZE):
+        positions.update(_bit_positions(chf_id_digest(chf_id), bit_count, hash_count))
+        version = max(version, to_filter_version(validity_from))
+    return {"version": version, "positions": sorted(positions)}
+
+
+def get_chf_id_filter(district_id=None):
+    """
+    (sha1 of the blob, blob) of the filter, rebuilt every chf_id_filter_timeout seconds: clients catch up
+    with the deltas in between.
+    """
+    cache_key = f"insuree_chf_id_filter_{district_id or 'all'}"
+    entry = cache.get(cache_key)
+    if entry is None:
+        blob = build_chf_id_filter(district_id)
+        entry = (hashlib.sha1(blob).hexdigest(), blob)
+        cache.set(cache_key, entry, InsureeConfig.chf_id_filter_timeout)
+    return entry
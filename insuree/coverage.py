@@ -0,0 +1,190 @@
+import logging
+import time
+
+from django.db import transaction, IntegrityError
+from django.db.models.signals import post_save
+
+from insuree.apps import InsureeConfig
+from insuree.cache import bump_data_version, get_insuree_versions, bump_insuree_version, COVERAGE_DATA
+from insuree.models import Insuree, InsureePolicy, InsureeCoverage
+
+logger = logging.getLogger(__name__)
+
+COVERAGE_CHUNK_SIZE = 1000
+COVERAGE_FIELDS = ["product_id", "product_code", "policy_id", "effective_date", "expiry_date"]
+INTERVAL_FIELDS = ["chf_id", "insuree_policy_id", *COVERAGE_FIELDS]
+
+COVERAGE_REFRESH_ATTEMPTS = 3
+# Fields of the insuree row the coverage depends on, the policies have their own signals
+COVERAGE_INSUREE_FIELDS = ["chf_id", "validity_to"]
+# Above this many changed numbers, bumping the COVERAGE_DATA version is cheaper than one bump per number
+COVERAGE_VERSION_BUMPS = 100
+
+# Eligibility lookups read the precomputed InsureeCoverage intervals, through a process-local cache of the
+# intervals per insuree number. A coverage refresh bumps the COVERAGE_DATA version of the refreshed numbers
+# (see insuree.cache), which only drops these numbers from the local caches of all processes.
+
+# {"expires": ..., "intervals": {chf_id: (version, [interval, ...])}}
+_local_cache = {}
+
+
+def _covering_insuree_policies(insuree_ids=None):
+    from policy.models import Policy
+    queryset = InsureePolicy.objects.filter(
+        validity_to__isnull=True, effective_date__isnull=False,
+        insuree__validity_to__isnull=True, insuree__chf_id__isnull=False,
+        policy__validity_to__isnull=True, policy__status__in=[Policy.STATUS_ACTIVE, Policy.STATUS_EXPIRED])
+    if insuree_ids is not None:
+        queryset = queryset.filter(insuree_id__in=insuree_ids)
+    return queryset.values("id", "insuree_id", "insuree__chf_id", "policy_id", "policy__product_id",
+                           "policy__product__code", "effective_date", "expiry_date")
+
+
+def _coverages(rows):
+    return [InsureeCoverage(insuree_id=row["insuree_id"], chf_id=row["insuree__chf_id"],
+                            insuree_policy_id=row["id"], policy_id=row["policy_id"],
+                            product_id=row["policy__product_id"], product_code=row["policy__product__code"],
+                            effective_date=row["effective_date"], expiry_date=row["expiry_date"])
+            for row in rows]
+
+
+def _refresh_chunk(insuree_ids):
+    """
+    Replaces the intervals of the insurees if they changed, returns the insuree numbers whose intervals changed
+    """
+    existing = InsureeCoverage.objects.filter(insuree_id__in=insuree_ids)
+    previous = set(existing.values_list(*INTERVAL_FIELDS))
+    coverages = _coverages(_covering_insuree_policies(insuree_ids))
+    current = {tuple(getattr(coverage, field) for field in INTERVAL_FIELDS) for coverage in coverages}
+    if previous != current:
+        existing.delete()
+        InsureeCoverage.objects.bulk_create(coverages)
+    # chf_id being the first field
+    return {interval[0] for interval in previous ^ current}
+
+
+def refresh_insuree_coverage(insuree_ids):
+    """
+    Recomputes the coverage intervals of the insurees, from their current insuree policies.
+    Concurrent refreshes of the same insurees are arbitrated by the unique insuree_policy_id.
+    """
+    from insuree.services import chunked
+    changed = set()
+    for ids in chunked(set(insuree_ids), COVERAGE_CHUNK_SIZE):
+        for attempt in range(COVERAGE_REFRESH_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    changed |= _refresh_chunk(ids)
+                break
+            except IntegrityError:
+                # Recomputed from the intervals committed by the concurrent refresh
+                logger.info("Concurrent coverage refresh, attempt %s", attempt + 1)
+        else:
+            raise IntegrityError("coverage of insurees %s refreshed concurrently" % ids)
+    if len(changed) > COVERAGE_VERSION_BUMPS:
+        bump_data_version(COVERAGE_DATA)
+    else:
+        for chf_id in changed:
+            bump_insuree_version(COVERAGE_DATA, chf_id)
+
+
+def refresh_insuree_coverage_on_commit(insuree_ids):
+    # Computed from the committed insuree policies, and invisible to lookups before
+    insuree_ids = list(insuree_ids)
+    if insuree_ids:
+        transaction.on_commit(lambda: refresh_insuree_coverage(insuree_ids))
+
+
+def rebuild_insuree_coverage():
+    """
+    Recomputes the whole coverage table (initial load, or after writes made outside of the ORM).
+    Returns the number of intervals.
+    """
+    count = 0
+    with transaction.atomic():
+        InsureeCoverage.objects.all().delete()
+        batch = []
+        for row in _covering_insuree_policies().order_by("id").iterator(chunk_size=COVERAGE_CHUNK_SIZE):
+            batch.append(row)
+            if len(batch) >= COVERAGE_CHUNK_SIZE:
+                count += len(InsureeCoverage.objects.bulk_create(_coverages(batch)))
+                batch = []
+        count += len(InsureeCoverage.objects.bulk_create(_coverages(batch)))
+    bump_data_version(COVERAGE_DATA)
+    return count
+
+
+def _local_intervals():
+    if not _local_cache or _local_cache["expires"] <= time.monotonic() \
+            or len(_local_cache["intervals"]) > InsureeConfig.coverage_cache_size:
+        _local_cache.update(intervals={}, expires=time.monotonic() + (InsureeConfig.coverage_cache_timeout or 0))
+    return _local_cache["intervals"]
+
+
+def _covers(interval, on_date):
+    return interval["effective_date"] <= on_date and \
+        (interval["expiry_date"] is None or interval["expiry_date"] >= on_date)
+
+
+def get_coverages(chf_ids, on_date=None):
+    """
+    Coverage of many insurees: {chf_id: [{product_id, product_code, policy_id, effective_date, expiry_date}]}
+    with the intervals covering on_date (today by default), an empty list for uninsured or unknown numbers.
+    The intervals missing from the process cache, or refreshed since, are loaded with one query per chunk
+    of numbers.
+    """
+    from core import datetime
+    from insuree.services import chunked
+    on_date = on_date or datetime.date.today()
+    intervals = _local_intervals()
+    versions = get_insuree_versions(COVERAGE_DATA, chf_ids)
+    missing = {chf_id for chf_id in chf_ids if intervals.get(chf_id, (None,))[0] != versions[chf_id]}
+    if missing:
+        loaded = {chf_id: (versions[chf_id], []) for chf_id in missing}
+        for numbers in chunked(missing, COVERAGE_CHUNK_SIZE):
+            for row in InsureeCoverage.objects.filter(chf_id__in=numbers).values("chf_id", *COVERAGE_FIELDS):
+                loaded[row.pop("chf_id")][1].append(row)
+        intervals.update(loaded)
+    return {chf_id: [interval for interval in intervals[chf_id][1] if _covers(interval, on_date)]
+            for chf_id in chf_ids}
+
+
+def get_coverage(chf_id, on_date=None):
+    """
+    Intervals of the insuree covering on_date (today by default), empty if the insuree is not covered.
+    """
+    return get_coverages([chf_id], on_date)[chf_id]
+
+
+def is_covered(chf_id, on_date=None):
+    return bool(get_coverage(chf_id, on_date))
+
+
+def _on_insuree_saved(sender, instance, created=False, **kwargs):
+    # History copies (legacy_id set) don't change the coverage of the current row, new insurees have no policy
+    # yet and most updates (names, address, family...) don't change the coverage either
+    if instance.legacy_id is None and not created and instance.has_changed(COVERAGE_INSUREE_FIELDS):
+        refresh_insuree_coverage_on_commit([instance.id])
+
+
+def _on_insuree_policy_saved(sender, instance, **kwargs):
+    refresh_insuree_coverage_on_commit([instance.insuree_id])
+
+
+def _on_policy_saved(sender, instance, **kwargs):
+    # Status and dates of a policy (renewal, suspension...) are written by the policy module
+    policy_id = instance.id
+    transaction.on_commit(lambda: refresh_insuree_coverage(
+        InsureePolicy.objects.filter(policy_id=policy_id).values_list("insuree_id", flat=True).distinct()))
+
+
+def bind_coverage_signals():
+    """
+    Row by row saves refresh the coverage through signals, the set-based writes of InsureeService call
+    refresh_insuree_coverage_on_commit explicitly.
+    """
+    from policy.models import Policy
+    post_save.connect(_on_insuree_saved, sender=Insuree, dispatch_uid="insuree_coverage_insuree_save")
+    post_save.connect(_on_insuree_policy_saved, sender=InsureePolicy,
+                      dispatch_uid="insuree_coverage_insuree_policy_save")
+    post_save.connect(_on_policy_saved, sender=Policy, dispatch_uid="insuree_coverage_policy_save")
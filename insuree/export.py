@@ -0,0 +1,133 @@
+import csv
+import json
+import logging
+import tempfile
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.http import StreamingHttpResponse, FileResponse
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+
+INSUREE_EXPORT_FIELDS = ["uuid", "chf_id", "last_name", "other_names", "gender_id", "dob", "head", "marital",
+                         "passport", "phone", "email", "current_address", "current_village__code",
+                         "card_issued", "status", "status_date", "photo_date", "family__uuid",
+                         "family__location__code", "health_facility__code", "validity_from", "validity_to"]
+FAMILY_EXPORT_FIELDS = ["uuid", "head_insuree__chf_id", "head_insuree__last_name", "head_insuree__other_names",
+                        "location__code", "location__name", "poverty", "family_type_id", "address", "is_offline",
+                        "ethnicity", "confirmation_no", "confirmation_type_id", "validity_from", "validity_to"]
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _Echo:
+    """
+    File-like object for csv.writer that returns the written line instead of storing it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, fields):
+    # iterator() uses a server-side cursor where the database supports it, so only one chunk is in memory
+    return queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def csv_lines(queryset, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in iter_rows(queryset, fields):
+        yield writer.writerow(row)
+
+
+def ndjson_lines(queryset, fields):
+    for row in iter_rows(queryset, fields):
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def model_field(model, path):
+    """
+    Field of a values() path, e.g. family__location__code or gender_id
+    """
+    *relations, name = path.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def arrow_type(field):
+    import pyarrow
+    if field.is_relation:
+        field = field.target_field
+    if isinstance(field, models.BooleanField):
+        return pyarrow.bool_()
+    if isinstance(field, models.IntegerField):
+        return pyarrow.int64()
+    if isinstance(field, models.FloatField):
+        return pyarrow.float64()
+    if isinstance(field, models.DecimalField):
+        return pyarrow.decimal128(field.max_digits, field.decimal_places)
+    # DateTimeField is a DateField
+    if isinstance(field, models.DateTimeField):
+        return pyarrow.timestamp("us")
+    if isinstance(field, models.DateField):
+        return pyarrow.date32()
+    return pyarrow.string()
+
+
+def arrow_schema(model, fields, names=None):
+    """
+    Parquet schema of values() paths of the model, from the model field types: a column that is null in
+    a whole chunk keeps its type.
+    """
+    import pyarrow
+    return pyarrow.schema([(name, arrow_type(model_field(model, field)))
+                           for name, field in zip(names or fields, fields)])
+
+
+def write_parquet(queryset, fields, file):
+    """
+    Writes the rows as a parquet file, one row group per chunk. Requires pyarrow.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValidationError("parquet export requires pyarrow")
+    schema = arrow_schema(queryset.model, fields)
+    chunk = []
+    with pyarrow.parquet.ParquetWriter(file, schema) as writer:
+        for row in iter_rows(queryset, fields):
+            chunk.append(dict(zip(fields, row)))
+            if len(chunk) >= EXPORT_CHUNK_SIZE:
+                writer.write_table(pyarrow.Table.from_pylist(chunk, schema=schema))
+                chunk = []
+        if chunk:
+            writer.write_table(pyarrow.Table.from_pylist(chunk, schema=schema))
+
+
+def export_response(queryset, fields, export_format, file_name):
+    """
+    Streams the queryset in the requested format (csv, ndjson or parquet) with bounded memory.
+    Parquet being a binary format with a footer, it is spilled to a temporary file first.
+    """
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise ValidationError("unknown export format %s" % export_format)
+    if export_format == "parquet":
+        file = tempfile.TemporaryFile()
+        write_parquet(queryset, fields, file)
+        file.seek(0)
+        response = FileResponse(file, content_type=EXPORT_CONTENT_TYPES[export_format])
+    else:
+        lines = csv_lines(queryset, fields) if export_format == "csv" else ndjson_lines(queryset, fields)
+        response = StreamingHttpResponse(lines, content_type=EXPORT_CONTENT_TYPES[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{file_name}.{export_format}"'
+    return response
@@ -4,7 +4,8 @@ import pathlib
 import base64
 import graphene
 from insuree.apps import InsureeConfig
-from insuree.services import validate_insuree_number, InsureeService, FamilyService, InsureePolicyService
+from insuree.services import validate_insuree_number, InsureeService, FamilyService, InsureePolicyService, \
+    InsureeNumberPoolService
 
 from core.schema import OpenIMISMutation
 from django.contrib.auth.models import AnonymousUser
@@ -57,6 +58,8 @@ class InsureeBase:
     status = graphene.String(required=False)
     status_reason = graphene.String(required=False)
     status_date = graphene.Date(required=False)
+    # enrollment device the chf_id was reserved for (reserveInsureeNumbers), not stored on the insuree
+    device = graphene.String(required=False)
 
 
 class CreateInsureeInputType(InsureeBase, OpenIMISMutation.Input):
@@ -195,20 +198,7 @@ class DeleteFamiliesMutation(OpenIMISMutation):
     def async_mutate(cls, user, **data):
         if not user.has_perms(InsureeConfig.gql_mutation_delete_families_perms):
             raise PermissionDenied(_("unauthorized"))
-        errors = []
-        for family_uuid in data["uuids"]:
-            family = Family.objects \
-                .prefetch_related('members') \
-                .filter(uuid=(family_uuid)) \
-                .first()
-            if family is None:
-                errors.append({
-                    'title': family_uuid,
-                    'list': [{'message': _("insuree.mutation.failed_to_delete_family") % {'uuid': family_uuid}}]
-                })
-                continue
-            errors += FamilyService(user).set_deleted(family,
-                                                      data["delete_members"])
+        errors = FamilyService(user).set_deleted_bulk(data["uuids"], data["delete_members"])
         if len(errors) == 1:
             errors = errors[0]['list']
         return errors
@@ -299,27 +289,7 @@ class DeleteInsureesMutation(OpenIMISMutation):
     def async_mutate(cls, user, **data):
         if not user.has_perms(InsureeConfig.gql_mutation_delete_insurees_perms):
             raise PermissionDenied(_("unauthorized"))
-        errors = []
-        for insuree_uuid in data["uuids"]:
-            insuree = Insuree.objects \
-                .prefetch_related('family') \
-                .filter(uuid__iexact=insuree_uuid) \
-                .first()
-            if insuree is None:
-                errors.append({
-                    'title': insuree_uuid,
-                    'list': [{'message': _(
-                        "insuree.validation.id_does_not_exist") % {'id': insuree_uuid}}]
-                })
-                continue
-            if insuree.family and insuree.family.head_insuree.id == insuree.id:
-                errors.append({
-                    'title': insuree_uuid,
-                    'list': [{'message': _(
-                        "insuree.validation.delete_head_insuree") % {'id': insuree_uuid}}]
-                })
-                continue
-            errors += InsureeService(user).set_deleted(insuree)
+        errors = InsureeService(user).set_deleted_by_uuids(data["uuids"])
         if len(errors) == 1:
             errors = errors[0]['list']
         return errors
@@ -341,30 +311,7 @@ class RemoveInsureesMutation(OpenIMISMutation):
     def async_mutate(cls, user, **data):
         if not user.has_perms(InsureeConfig.gql_mutation_delete_insurees_perms):
             raise PermissionDenied(_("unauthorized"))
-        errors = []
-        for insuree_uuid in data["uuids"]:
-            insuree = Insuree.objects \
-                .prefetch_related('family') \
-                .filter(uuid=(insuree_uuid)) \
-                .first()
-            if insuree is None:
-                errors += {
-                    'title': insuree_uuid,
-                    'list': [{'message': _(
-                        "insuree.validation.id_does_not_exist") % {'id': insuree_uuid}}]
-                }
-                continue
-            if insuree.family.head_insuree.id == insuree.id:
-                errors.append({
-                    'title': insuree_uuid,
-                    'list': [{'message': _(
-                        "insuree.validation.remove_head_insuree") % {'id': insuree_uuid}}]
-                })
-                continue
-            insuree_service = InsureeService(user)
-            if data['cancel_policies']:
-                errors += insuree_service.cancel_policies(insuree)
-            errors += insuree_service.remove(insuree)
+        errors = InsureeService(user).remove_by_uuids(data["uuids"], data['cancel_policies'])
         if len(errors) == 1:
             errors = errors[0]['list']
         return errors
@@ -386,6 +333,8 @@ class SetFamilyHeadMutation(OpenIMISMutation):
         if not user.has_perms(InsureeConfig.gql_mutation_update_families_perms):
             raise PermissionDenied(_("unauthorized"))
         try:
+            from core import datetime
+            now = datetime.datetime.now()
             family = Family.objects.get(uuid=(data['uuid']))
             insuree = Insuree.objects.get(uuid=(data['insuree_uuid']))
             family.save_history()
@@ -393,11 +342,14 @@ class SetFamilyHeadMutation(OpenIMISMutation):
             if prev_head:
                 prev_head.save_history()
                 prev_head.head = False
+                prev_head.validity_from = now
                 prev_head.save()
             family.head_insuree = insuree
+            family.validity_from = now
             family.save()
             insuree.save_history()
             insuree.head = True
+            insuree.validity_from = now
             insuree.save()
             return None
         except Exception as exc:
@@ -428,8 +380,10 @@ class ChangeInsureeFamilyMutation(OpenIMISMutation):
         try:
             family = Family.objects.get(uuid=(data['family_uuid']))
             insuree = Insuree.objects.get(uuid=(data['insuree_uuid']))
+            from core import datetime
             insuree.save_history()
             insuree.family = family
+            insuree.validity_from = datetime.datetime.now()
             insuree.save()
 
             if data['cancel_policies']:
@@ -446,3 +400,80 @@ class ChangeInsureeFamilyMutation(OpenIMISMutation):
                 'message': _("insuree.mutation.failed_to_change_insuree_family"),
                 'detail': str(exc)}
             ]
+
+
+class SplitFamilyMutation(OpenIMISMutation):
+    """
+    Move one or several insurees (not heads of their family) into a family
+    """
+    _mutation_module = "insuree"
+    _mutation_class = "SplitFamilyMutation"
+
+    class Input(OpenIMISMutation.Input):
+        # target family uuid
+        uuid = graphene.String()
+        uuids = graphene.List(graphene.String)
+        cancel_policies = graphene.Boolean(default_value=False)
+
+    @classmethod
+    def async_mutate(cls, user, **data):
+        if not user.has_perms(InsureeConfig.gql_mutation_update_families_perms) or \
+                not user.has_perms(InsureeConfig.gql_mutation_update_insurees_perms):
+            raise PermissionDenied(_("unauthorized"))
+        errors = FamilyService(user).split_by_uuids(data["uuid"], data["uuids"], data["cancel_policies"])
+        if len(errors) == 1:
+            errors = errors[0]['list']
+        return errors
+
+
+class MergeFamiliesMutation(OpenIMISMutation):
+    """
+    Move all members of one or several families into a family and delete the merged families
+    """
+    _mutation_module = "insuree"
+    _mutation_class = "MergeFamiliesMutation"
+
+    class Input(OpenIMISMutation.Input):
+        # target family uuid
+        uuid = graphene.String()
+        family_uuids = graphene.List(graphene.String)
+        cancel_policies = graphene.Boolean(default_value=False)
+
+    @classmethod
+    def async_mutate(cls, user, **data):
+        if not user.has_perms(InsureeConfig.gql_mutation_update_families_perms) or \
+                not user.has_perms(InsureeConfig.gql_mutation_delete_families_perms) or \
+                not user.has_perms(InsureeConfig.gql_mutation_update_insurees_perms):
+            raise PermissionDenied(_("unauthorized"))
+        errors = FamilyService(user).merge_by_uuids(data["uuid"], data["family_uuids"], data["cancel_policies"])
+        if len(errors) == 1:
+            errors = errors[0]['list']
+        return errors
+
+
+class ReserveInsureeNumbersMutation(OpenIMISMutation):
+    """
+    Reserve a block of insuree numbers for an (offline) enrollment device and/or officer.
+    The reserved numbers are then listed by the reservedInsureeNumbers query.
+    """
+    _mutation_module = "insuree"
+    _mutation_class = "ReserveInsureeNumbersMutation"
+
+    class Input(OpenIMISMutation.Input):
+        size = graphene.Int(required=True)
+        device = graphene.String(required=False)
+        officer_id = graphene.Int(required=False)
+
+    @classmethod
+    def async_mutate(cls, user, **data):
+        if not user.has_perms(InsureeConfig.gql_mutation_create_insurees_perms):
+            raise PermissionDenied(_("unauthorized"))
+        try:
+            InsureeNumberPoolService(user).reserve_block(data['size'], data.get('device'), data.get('officer_id'))
+            return None
+        except Exception as exc:
+            logger.exception("insuree.mutation.failed_to_reserve_insuree_numbers")
+            return [{
+                'message': _("insuree.mutation.failed_to_reserve_insuree_numbers"),
+                'detail': str(exc)}
+            ]
@@ -0,0 +1,145 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import QuerySet
+
+from core.models import User
+
+
+def _enrolled_families_window_rows(dateFrom=None, dateTo=None, locationId=None):
+    """
+    Former implementation of the enrolled families report, ranking the family policies with a window
+    over the insuree x policy join.
+    """
+    from django.db.models import F, Case, When, Value
+    from django.db.models.expressions import Window
+    from django.db.models.functions import Rank
+    from insuree.models import Insuree
+    from insuree.reports.streaming import iter_queryset_rows
+    report_data = Insuree.objects.filter(
+        family__location_id=locationId,
+        validity_to__isnull=True,
+        validity_from__date__range=(dateFrom, dateTo),
+        family__location__parent__parent__parent__validity_to__isnull=True,
+        family__location__parent__parent__validity_to__isnull=True,
+        family__location__parent__validity_to__isnull=True,
+        family__location__validity_to__isnull=True,
+        family__policies__validity_to__isnull=True
+    ).annotate(
+        RegionName=F('family__location__parent__parent__parent__name'),
+        DistrictName=F('family__location__parent__parent__name'),
+        WardName=F('family__location__parent__name'),
+        VillageName=F('family__location__name'),
+        IsHead=F('family__head_insuree__head'),
+        CHFID=F('chf_id'),
+        LastName=F('last_name'),
+        OtherNames=F('other_names'),
+        EnrolDate=F('validity_from__date'),
+        PolicyStatusDesc=Case(
+            When(family__policies__status=1, then=Value('Idle')),
+            When(family__policies__status=2, then=Value('Active')),
+            When(family__policies__status=4, then=Value('Suspended')),
+            When(family__policies__status=8, then=Value('Expired'))
+        ),
+        rank=Window(
+            expression=Rank(),
+            partition_by=F('family__id'),
+            order_by=F('family__policies__validity_from').desc()
+        )
+    ).filter(rank=1).values(
+        'RegionName',
+        'DistrictName',
+        'WardName',
+        'VillageName',
+        'IsHead',
+        'CHFID',
+        'LastName',
+        'OtherNames',
+        'EnrolDate',
+        'PolicyStatusDesc'
+    )
+    return iter_queryset_rows(report_data)
+
+
+def _enrolled_families_case(user, options):
+    from insuree.reports.enrolled_families import enrolled_families_rows
+    params = dict(dateFrom=options["date_from"], dateTo=options["date_to"], locationId=options["location_id"])
+    return {
+        "window over join": lambda: list(_enrolled_families_window_rows(**params)),
+        "lateral/apply": lambda: list(enrolled_families_rows(user, **params)),
+    }
+
+
+def _current_rows_case(user, options):
+    """
+    The hot lookups on current versions covered by the partial/filtered indexes of migration 0022.
+    Run it with --explain before and after migrating to compare the plans.
+    """
+    from core import datetime
+    from insuree.models import Insuree, Family, InsureePolicy, InsureePhoto
+    sample = Insuree.objects.filter(validity_to__isnull=True, family__isnull=False) \
+        .select_related("family").order_by("-id").first()
+    if sample is None:
+        raise CommandError("No current insuree to sample, generate some with generateinsurees")
+    return {
+        "insuree by chf_id": Insuree.objects.filter(chf_id=sample.chf_id, validity_to__isnull=True),
+        "family members": Insuree.objects.filter(family_id=sample.family_id, validity_to__isnull=True)
+        .order_by("-head", "dob"),
+        "families of location": Family.objects.filter(location_id=sample.family.location_id,
+                                                      validity_to__isnull=True),
+        "insuree active policies": InsureePolicy.objects.filter(
+            insuree_id=sample.id, validity_to__isnull=True, expiry_date__gte=datetime.date.today()),
+        "insuree photo": InsureePhoto.objects.filter(insuree_id=sample.id, validity_to__isnull=True),
+    }
+
+
+# case name -> function(user, options) returning {variant name: callable returning the rows, or a queryset}
+BENCHMARK_CASES = {
+    "enrolled_families": _enrolled_families_case,
+    "current_rows": _current_rows_case,
+}
+
+# Cases whose variants are equivalent implementations, expected to return the same rows
+EQUIVALENT_VARIANT_CASES = {"enrolled_families"}
+
+
+class Command(BaseCommand):
+    help = "This command compares the timings of the former and optimized implementations of insuree queries" \
+           " and reports, or times the hot lookups on current rows (with --explain to print their plans)." \
+           " Use it on a database generated with generateinsurees to check the improvement."
+
+    def add_arguments(self, parser):
+        parser.add_argument("case", nargs=1, type=str, choices=list(BENCHMARK_CASES.keys()))
+        parser.add_argument("--runs", type=int, default=5, help="Number of timed runs per variant")
+        parser.add_argument("--username", default="Admin", help="User running the reports")
+        parser.add_argument("--location-id", dest="location_id", type=int, help="Report location (village) id")
+        parser.add_argument("--date-from", dest="date_from", default="2000-01-01")
+        parser.add_argument("--date-to", dest="date_to", default="2100-01-01")
+        parser.add_argument("--explain", action="store_true", help="Print the query plan of the queryset variants")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["username"]).first()
+        if user is None:
+            raise CommandError("Unknown user %s" % options["username"])
+        case = options["case"][0]
+        variants = BENCHMARK_CASES[case](user, options)
+        counts = {}
+        for name, run in variants.items():
+            if isinstance(run, QuerySet):
+                if options["explain"] and connection.features.supports_explaining_query_execution:
+                    print(f"{name} plan:\n{run.explain()}")
+                # .all() so that every run hits the database instead of the queryset cache
+                run = (lambda queryset: lambda: list(queryset.all()))(run)
+            # First run warms up the caches and is not timed
+            counts[name] = len(run())
+            timings = []
+            for _ in range(options["runs"]):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+            print(f"{name}: {counts[name]} rows, min {min(timings) * 1000:.1f} ms, "
+                  f"median {statistics.median(timings) * 1000:.1f} ms")
+        if case in EQUIVALENT_VARIANT_CASES and len(set(counts.values())) > 1:
+            print("WARNING: the variants returned a different number of rows", counts)
@@ -0,0 +1,71 @@
+import csv
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from insuree.services import InsureeStatusFeedService, BULK_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "This command imports a civil registry feed of insuree status changes (deaths, inactivations)." \
+           " The feed is a CSV file with the columns chf_id, status, reason, date (YYYY-MM-DD), processed in" \
+           " chunks. With --checkpoint, an interrupted import resumes where it stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("feed_file", nargs=1, type=str)
+        parser.add_argument("username", nargs=1, type=str, help="User recorded as author of the changes")
+        parser.add_argument(
+            '--checkpoint',
+            dest='checkpoint',
+            help='File keeping the number of rows already imported, to resume an interrupted import',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=BULK_CHUNK_SIZE,
+            help='Number of rows processed per transaction',
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            dest='verbose',
+            help='Be verbose about what it is doing',
+        )
+
+    def handle(self, *args, **options):
+        feed_file = options["feed_file"][0]
+        checkpoint = options["checkpoint"]
+        verbose = options["verbose"]
+        user = User.objects.filter(username=options["username"][0]).first()
+        if user is None:
+            raise CommandError("Unknown user %s" % options["username"][0])
+
+        start = 0
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                start = int(f.read().strip() or 0)
+            if verbose:
+                print("Resuming after row", start)
+
+        def save_checkpoint(position):
+            if checkpoint:
+                with open(checkpoint, "w") as f:
+                    f.write(str(position))
+            if verbose:
+                print("Imported up to row", position)
+
+        service = InsureeStatusFeedService(user, chunk_size=options["chunk_size"])
+        with open(feed_file, newline="") as f:
+            summary = service.ingest(self._read_rows(f), start=start, on_chunk_done=save_checkpoint)
+        print("Status feed imported:", ", ".join(f"{key}: {value}" for key, value in summary.items()))
+
+    @staticmethod
+    def _read_rows(f):
+        for row in csv.reader(f):
+            if not row or row[0].strip().lower() == "chf_id":
+                continue
+            chf_id, status, reason, status_date = (row + [None] * 4)[:4]
+            # The date is parsed by the service, which counts malformed ones as invalid rows
+            yield chf_id.strip(), status, reason.strip() if reason else None, status_date
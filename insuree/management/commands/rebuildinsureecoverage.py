@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from insuree.coverage import rebuild_insuree_coverage
+
+
+class Command(BaseCommand):
+    help = "This command recomputes the coverage intervals of all insurees (insuree_InsureeCoverage) used by the" \
+           " eligibility lookups. Run it once after migrating, the table is then maintained by the insuree and" \
+           " policy writes."
+
+    def handle(self, *args, **options):
+        print("Coverage intervals written:", rebuild_insuree_coverage())
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from insuree.snapshot import RegistrySnapshot
+
+
+class Command(BaseCommand):
+    help = "This command writes (or refreshes) a Parquet snapshot of the insuree registry (families, insurees," \
+           " insuree policies partitioned by region/district, and locations) for analytics. It is intended to" \
+           " run against a replica with --database. Requires pyarrow."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output_dir", nargs=1, type=str)
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            dest='full',
+            help='Rebuild the snapshot from scratch instead of appending the changes since the last run',
+        )
+        parser.add_argument(
+            '--database',
+            default="default",
+            help="Database alias to read from, typically a replica",
+        )
+
+    def handle(self, *args, **options):
+        snapshot = RegistrySnapshot(options["output_dir"][0], using=options["database"])
+        written = snapshot.refresh(full=options["full"])
+        print("Snapshot written:", ", ".join(f"{name}: {count} rows" for name, count in written.items()))
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    The missing photo report only reads current photos and families: filtered (MSSQL) or partial
+    (PostgreSQL) indexes on the current rows.
+    """
+
+    dependencies = [
+        ("insuree", "0019_auto_20231026_1205"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE NONCLUSTERED INDEX ix_tblPhotos_InsureeID_current ON [dbo].[tblPhotos]
+            (
+                [InsureeID] ASC
+            )
+            WHERE [ValidityTo] IS NULL""" if settings.MSSQL else """
+            CREATE INDEX "ix_tblPhotos_InsureeID_current" ON "tblPhotos"
+            (
+                "InsureeID" ASC
+            )
+            WHERE "ValidityTo" IS NULL""",
+            reverse_sql='DROP INDEX ix_tblPhotos_InsureeID_current ON [dbo].[tblPhotos]'
+            if settings.MSSQL else 'DROP INDEX "ix_tblPhotos_InsureeID_current"',
+        ),
+        migrations.RunSQL(
+            """
+            CREATE NONCLUSTERED INDEX ix_tblFamilies_LocationId_current ON [dbo].[tblFamilies]
+            (
+                [LocationId] ASC
+            )
+            WHERE [ValidityTo] IS NULL""" if settings.MSSQL else """
+            CREATE INDEX "ix_tblFamilies_LocationId_current" ON "tblFamilies"
+            (
+                "LocationId" ASC
+            )
+            WHERE "ValidityTo" IS NULL""",
+            reverse_sql='DROP INDEX ix_tblFamilies_LocationId_current ON [dbo].[tblFamilies]'
+            if settings.MSSQL else 'DROP INDEX "ix_tblFamilies_LocationId_current"',
+        ),
+    ]
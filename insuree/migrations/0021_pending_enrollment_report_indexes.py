@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    The CHFID lookups of the current insurees use the unique index of 0023.
+    """
+
+    dependencies = [
+        ("insuree", "0020_missing_photo_report_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE NONCLUSTERED INDEX ix_tblSubmittedPhotos_PhotoDate_CHFID ON [dbo].[tblSubmittedPhotos]
+            (
+                [PhotoDate] ASC,
+                [CHFID] ASC
+            )""" if settings.MSSQL else """
+            CREATE INDEX "ix_tblSubmittedPhotos_PhotoDate_CHFID" ON "tblSubmittedPhotos"
+            (
+                "PhotoDate" ASC,
+                "CHFID" ASC
+            )""",
+            reverse_sql='DROP INDEX ix_tblSubmittedPhotos_PhotoDate_CHFID ON [dbo].[tblSubmittedPhotos]'
+            if settings.MSSQL else 'DROP INDEX "ix_tblSubmittedPhotos_PhotoDate_CHFID"',
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def current_rows_index(name, table, columns):
+    """
+    Index restricted to the current versions (ValidityTo IS NULL): a filtered index on MSSQL,
+    a partial index on PostgreSQL.
+    """
+    if settings.MSSQL:
+        column_list = ", ".join("[%s] ASC" % column for column in columns)
+        return migrations.RunSQL(
+            f"CREATE NONCLUSTERED INDEX {name} ON [dbo].[{table}] ({column_list}) WHERE [ValidityTo] IS NULL",
+            reverse_sql=f"DROP INDEX {name} ON [dbo].[{table}]",
+        )
+    column_list = ", ".join('"%s" ASC' % column for column in columns)
+    return migrations.RunSQL(
+        f'CREATE INDEX "{name}" ON "{table}" ({column_list}) WHERE "ValidityTo" IS NULL',
+        reverse_sql=f'DROP INDEX "{name}"',
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Current rows indexes for the hot insuree lookups. The photos and families ones come with 0020,
+    the CHFID one is the unique index of 0023.
+    """
+
+    dependencies = [
+        ("insuree", "0021_pending_enrollment_report_indexes"),
+    ]
+
+    operations = [
+        current_rows_index("ix_tblInsuree_FamilyID_IsHead_DOB_current", "tblInsuree", ["FamilyID", "IsHead", "DOB"]),
+        current_rows_index("ix_tblInsureePolicy_InsureeID_ExpiryDate_current", "tblInsureePolicy",
+                           ["InsureeID", "ExpiryDate"]),
+    ]
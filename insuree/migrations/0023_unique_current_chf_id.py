@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import migrations, models
+
+# Duplicated CHF IDs listed when the migration stops
+DUPLICATES_LISTED = 100
+
+
+def check_duplicate_chf_ids(apps, schema_editor):
+    # Uniqueness used to be checked in application code only, concurrent enrolments could duplicate a CHF ID.
+    # Which insuree keeps the number is a business decision, the migration stops with the list instead.
+    Insuree = apps.get_model('insuree', 'Insuree')
+    duplicates = list(Insuree.objects.filter(validity_to__isnull=True, chf_id__isnull=False)
+                      .values('chf_id').annotate(count=models.Count('id')).filter(count__gt=1)
+                      .order_by('chf_id')[:DUPLICATES_LISTED + 1])
+    if duplicates:
+        listed = ", ".join("%s (%s insurees)" % (row['chf_id'], row['count'])
+                           for row in duplicates[:DUPLICATES_LISTED])
+        raise CommandError(
+            "Current insurees share a CHF ID, give them distinct numbers before migrating: %s%s"
+            % (listed, ", ..." if len(duplicates) > DUPLICATES_LISTED else ""))
+
+
+class Migration(migrations.Migration):
+    """
+    The CHF ID of the current insurees becomes unique at the database level. The unique index also
+    serves the CHFID lookups of the current insurees.
+    The migration stops with the list of the duplicated current CHF IDs, if any, before building the index.
+    """
+
+    dependencies = [
+        ("insuree", "0022_current_rows_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_chf_ids, migrations.RunPython.noop),
+        migrations.RunSQL(
+            """
+            CREATE UNIQUE NONCLUSTERED INDEX ux_tblInsuree_CHFID_current ON [dbo].[tblInsuree]
+            (
+                [CHFID] ASC
+            )
+            WHERE [ValidityTo] IS NULL AND [CHFID] IS NOT NULL""" if settings.MSSQL else """
+            CREATE UNIQUE INDEX "ux_tblInsuree_CHFID_current" ON "tblInsuree"
+            (
+                "CHFID" ASC
+            )
+            WHERE "ValidityTo" IS NULL AND "CHFID" IS NOT NULL""",
+            reverse_sql='DROP INDEX ux_tblInsuree_CHFID_current ON [dbo].[tblInsuree]'
+            if settings.MSSQL else 'DROP INDEX "ux_tblInsuree_CHFID_current"',
+        ),
+    ]
@@ -0,0 +1,28 @@
+import core.fields
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insuree', '0023_unique_current_chf_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InsureeNumberReservation',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('insuree_number', models.CharField(max_length=50, unique=True)),
+                ('device', models.CharField(blank=True, max_length=255, null=True)),
+                ('officer_id', models.IntegerField(blank=True, db_column='OfficerID', null=True)),
+                ('reserved_at', core.fields.DateTimeField()),
+                ('audit_user_id', models.IntegerField(db_column='AuditUserID')),
+            ],
+            options={
+                'db_table': 'insuree_InsureeNumberReservation',
+                'managed': True,
+            },
+        ),
+    ]
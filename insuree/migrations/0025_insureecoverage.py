@@ -0,0 +1,60 @@
+import core.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Policy.STATUS_ACTIVE and Policy.STATUS_EXPIRED, the statuses covered by insuree.coverage
+COVERED_POLICY_STATUSES = [2, 8]
+CHUNK_SIZE = 1000
+
+
+def populate_insuree_coverage(apps, schema_editor):
+    # Same intervals as insuree.coverage.rebuild_insuree_coverage(), the eligibility lookups only read this table
+    InsureePolicy = apps.get_model('insuree', 'InsureePolicy')
+    InsureeCoverage = apps.get_model('insuree', 'InsureeCoverage')
+    rows = InsureePolicy.objects.filter(
+        validity_to__isnull=True, effective_date__isnull=False,
+        insuree__validity_to__isnull=True, insuree__chf_id__isnull=False,
+        policy__validity_to__isnull=True, policy__status__in=COVERED_POLICY_STATUSES) \
+        .values("id", "insuree_id", "insuree__chf_id", "policy_id", "policy__product_id", "policy__product__code",
+                "effective_date", "expiry_date") \
+        .order_by("id")
+    batch = []
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        batch.append(InsureeCoverage(
+            insuree_id=row["insuree_id"], chf_id=row["insuree__chf_id"], insuree_policy_id=row["id"],
+            policy_id=row["policy_id"], product_id=row["policy__product_id"],
+            product_code=row["policy__product__code"], effective_date=row["effective_date"],
+            expiry_date=row["expiry_date"]))
+        if len(batch) >= CHUNK_SIZE:
+            InsureeCoverage.objects.bulk_create(batch)
+            batch = []
+    InsureeCoverage.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insuree', '0024_insureenumberreservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InsureeCoverage',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('chf_id', models.CharField(db_index=True, max_length=50)),
+                ('insuree_policy_id', models.IntegerField()),
+                ('policy_id', models.IntegerField()),
+                ('product_id', models.IntegerField()),
+                ('product_code', models.CharField(max_length=8)),
+                ('effective_date', core.fields.DateField()),
+                ('expiry_date', core.fields.DateField(blank=True, null=True)),
+                ('insuree', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='coverages', to='insuree.insuree')),
+            ],
+            options={
+                'db_table': 'insuree_InsureeCoverage',
+                'managed': True,
+            },
+        ),
+        migrations.RunPython(populate_insuree_coverage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def compute_member_count(apps, schema_editor):
+    Family = apps.get_model('insuree', 'Family')
+    Insuree = apps.get_model('insuree', 'Insuree')
+    members = Insuree.objects.filter(family_id=models.OuterRef('id'), validity_to__isnull=True) \
+        .order_by().values('family_id').annotate(count=models.Count('id')).values('count')
+    Family.objects.filter(validity_to__isnull=True) \
+        .update(member_count=Coalesce(models.Subquery(members), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insuree', '0025_insureecoverage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='family',
+            name='member_count',
+            field=models.IntegerField(blank=True, db_column='MemberCount', null=True),
+        ),
+        migrations.RunPython(compute_member_count, migrations.RunPython.noop),
+    ]
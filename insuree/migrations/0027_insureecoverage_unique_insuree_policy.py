@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+def delete_duplicate_intervals(apps, schema_editor):
+    # Left by concurrent refreshes, the duplicates are copies of the same insuree policy
+    InsureeCoverage = apps.get_model('insuree', 'InsureeCoverage')
+    duplicates = InsureeCoverage.objects.values('insuree_policy_id') \
+        .annotate(count=models.Count('id'), kept_id=models.Min('id')).filter(count__gt=1)
+    for duplicate in duplicates:
+        InsureeCoverage.objects.filter(insuree_policy_id=duplicate['insuree_policy_id']) \
+            .exclude(id=duplicate['kept_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insuree', '0026_family_member_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_intervals, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='insureecoverage',
+            name='insuree_policy_id',
+            field=models.IntegerField(unique=True),
+        ),
+    ]
@@ -114,6 +114,8 @@ class Family(core_models.VersionedModel, core_models.ExtendableModel):
         models.DO_NOTHING, db_column='ConfirmationType', blank=True, null=True,
         related_name='families')
     audit_user_id = models.IntegerField(db_column='AuditUserID')
+    # Current members, maintained by the insuree writes (see insuree.services.refresh_family_member_count)
+    member_count = models.IntegerField(db_column='MemberCount', blank=True, null=True)
     # rowid = models.TextField(db_column='RowID', blank=True, null=True)
 
     def __str__(self):
@@ -290,6 +292,20 @@ class Insuree(core_models.VersionedModel, core_models.ExtendableModel):
     def __str__(self):
         return f"{self.chf_id} {self.last_name} {self.other_names}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Values as loaded, so that the post_save handlers can skip the work of unchanged fields
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def has_changed(self, attnames):
+        """
+        False only if the instance was loaded from the database and none of the fields (attnames) was changed since
+        """
+        loaded = getattr(self, "_loaded_values", None)
+        return loaded is None or any(name not in loaded or loaded[name] != getattr(self, name) for name in attnames)
+
     @classmethod
     def filter_queryset(cls, queryset=None):
         if queryset is None:
@@ -367,6 +383,26 @@ class InsureePolicy(core_models.VersionedModel):
         db_table = 'tblInsureePolicy'
 
 
+class InsureeCoverage(models.Model):
+    """
+    Coverage interval of an insuree: one row per current insuree policy of an active or expired policy.
+    Precomputed from InsureePolicy/Policy and kept in sync by insuree.coverage, for eligibility lookups.
+    """
+    id = models.AutoField(primary_key=True)
+    insuree = models.ForeignKey(Insuree, models.DO_NOTHING, related_name="coverages")
+    chf_id = models.CharField(max_length=50, db_index=True)
+    insuree_policy_id = models.IntegerField(unique=True)
+    policy_id = models.IntegerField()
+    product_id = models.IntegerField()
+    product_code = models.CharField(max_length=8)
+    effective_date = core.fields.DateField()
+    expiry_date = core.fields.DateField(blank=True, null=True)
+
+    class Meta:
+        managed = True
+        db_table = "insuree_InsureeCoverage"
+
+
 class InsureeMutation(core_models.UUIDModel, core_models.ObjectMutation):
     insuree = models.ForeignKey(Insuree, models.DO_NOTHING, related_name='mutations')
     mutation = models.ForeignKey(core_models.MutationLog, models.DO_NOTHING, related_name='insurees')
@@ -385,6 +421,22 @@ class FamilyMutation(core_models.UUIDModel, core_models.ObjectMutation):
         db_table = "insuree_FamilyMutation"
 
 
+class InsureeNumberReservation(core_models.UUIDModel):
+    """
+    Insuree number (CHF ID) reserved in a block for an enrollment device and/or officer, so that offline
+    devices can assign numbers to new insurees locally, without round trips nor collisions.
+    """
+    insuree_number = models.CharField(max_length=50, unique=True)
+    device = models.CharField(max_length=255, blank=True, null=True)
+    officer_id = models.IntegerField(db_column='OfficerID', blank=True, null=True)
+    reserved_at = core.fields.DateTimeField()
+    audit_user_id = models.IntegerField(db_column='AuditUserID')
+
+    class Meta:
+        managed = True
+        db_table = "insuree_InsureeNumberReservation"
+
+
 class PolicyRenewalDetail(core_models.VersionedModel):
     """
     When there is a policy renewal in progress, there might also be a need to update the picture or something else.
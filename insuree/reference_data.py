@@ -0,0 +1,88 @@
+import logging
+import time
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from insuree.apps import InsureeConfig
+from insuree.cache import get_data_version, bump_data_version_on_commit, REFERENCE_DATA
+from insuree.models import Gender, Education, Profession, IdentificationType, ConfirmationType, Relation, \
+    FamilyType, InsureeStatusReason
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_MODELS = [Gender, Education, Profession, IdentificationType, ConfirmationType, Relation, FamilyType,
+                    InsureeStatusReason]
+
+# The version is shared by all processes through the cache backend (see insuree.cache): bumping it
+# invalidates the local copies of every process. With a process-local cache backend (LocMemCache),
+# invalidation stays local and the other processes only refresh after reference_data_cache_timeout.
+
+# model -> {"version": ..., "expires": ..., "rows": [...], "maps": {field: {value: row}}}
+_local_cache = {}
+
+
+def get_reference_data_version():
+    return get_data_version(REFERENCE_DATA)
+
+
+def clear_local_reference_data():
+    # Also for tests: rolled back rows stay in the local copy, as no version is bumped on rollback
+    _local_cache.clear()
+
+
+def invalidate_reference_data(**kwargs):
+    # The version is bumped once committed, so that other processes don't cache pre-commit rows under it.
+    # This process sees its own writes right away and drops what it may have reloaded before the commit.
+    clear_local_reference_data()
+    bump_data_version_on_commit(REFERENCE_DATA)
+    transaction.on_commit(clear_local_reference_data)
+
+
+def _load(model):
+    version = get_reference_data_version()
+    entry = _local_cache.get(model)
+    if entry and entry["version"] == version and entry["expires"] > time.monotonic():
+        return entry
+    queryset = model.objects.all()
+    if hasattr(model, "validity_to"):
+        queryset = queryset.filter(validity_to__isnull=True)
+    field_names = [field.name for field in model._meta.fields]
+    queryset = queryset.order_by("sort_order" if "sort_order" in field_names else "pk")
+    entry = {
+        "version": version,
+        "expires": time.monotonic() + (InsureeConfig.reference_data_cache_timeout or 0),
+        "rows": list(queryset),
+        "maps": {},
+    }
+    _local_cache[model] = entry
+    return entry
+
+
+def get_reference_list(model):
+    """
+    Current rows of a reference table (genders, educations...), ordered by sort_order.
+    """
+    return list(_load(model)["rows"])
+
+
+def get_reference(model, value, field="pk"):
+    """
+    Row of a reference table by its primary key (or another unique field), None if not found.
+    """
+    entry = _load(model)
+    if field not in entry["maps"]:
+        entry["maps"][field] = {getattr(row, field): row for row in entry["rows"]}
+    return entry["maps"][field].get(value)
+
+
+def get_insuree_status_reason(code):
+    return get_reference(InsureeStatusReason, code, field="code") if code else None
+
+
+def bind_reference_data_signals():
+    for model in REFERENCE_MODELS:
+        post_save.connect(invalidate_reference_data, sender=model,
+                          dispatch_uid=f"insuree_reference_data_save_{model.__name__}")
+        post_delete.connect(invalidate_reference_data, sender=model,
+                            dispatch_uid=f"insuree_reference_data_delete_{model.__name__}")
@@ -1,47 +1,118 @@
-from insuree.reports import insuree_family_overview, enrolled_families, insuree_missing_photo, \
-    insurees_pending_enrollment
+import functools
+import json
+import os
+
 from insuree.reports.enrolled_families import enrolled_families_query
 from insuree.reports.insuree_family_overview import insuree_family_overview_query
 from insuree.reports.insuree_missing_photo import insuree_missing_photo_query
 from insuree.reports.insurees_pending_enrollment import insurees_pending_enrollment_query
 
+REPORT_TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "reports", "templates")
+
+
+@functools.lru_cache(maxsize=None)
+def get_report_template_text(report_name):
+    """
+    ReportBro template of a report, read from the packaged reports/templates/<name>.json on first use
+    """
+    with open(os.path.join(REPORT_TEMPLATES_DIR, f"{report_name}.json"), encoding="utf-8") as template_file:
+        return template_file.read()
+
+
+@functools.lru_cache(maxsize=None)
+def get_report_template(report_name):
+    """
+    Parsed ReportBro template of a report, parsed once per process. Callers must not modify it.
+    """
+    return json.loads(get_report_template_text(report_name))
+
+
+class LazyReportDefinition(dict):
+    """
+    Report definition whose default_report is only loaded when it is first needed, so that
+    worker processes that never render a report don't pay for the templates. Looking up the other
+    keys keeps it lazy, the operations on the whole mapping (iteration, len, copy, dict(), {**d}) load it.
+    """
+
+    def _load(self):
+        if not super().__contains__("default_report"):
+            super().__setitem__("default_report", get_report_template_text(super().__getitem__("name")))
+
+    def __missing__(self, key):
+        if key != "default_report":
+            raise KeyError(key)
+        self._load()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        return key == "default_report" or super().__contains__(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        self._load()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load()
+        return super().__len__()
+
+    def __eq__(self, other):
+        self._load()
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def keys(self):
+        self._load()
+        return super().keys()
+
+    def values(self):
+        self._load()
+        return super().values()
+
+    def items(self):
+        self._load()
+        return super().items()
+
+    def copy(self):
+        return LazyReportDefinition(self.items())
+
 
 # Insuree_family_overview are the same report, with native code and with the stored_procedure
 report_definitions = [
-    {
+    LazyReportDefinition({
         "name": "insuree_missing_photo",
         "engine": 0,
-        "default_report": insuree_missing_photo.template,
         "description": "Missing insuree photos",
         "module": "insuree",
         "python_query": insuree_missing_photo_query,
         "permission": ["131215"],
-    },
-    {
+    }),
+    LazyReportDefinition({
         "name": "insurees_pending_enrollment",
         "engine": 0,
-        "default_report": insurees_pending_enrollment.template,
         "description": "Insurees pending enrollment",
         "module": "insuree",
         "python_query": insurees_pending_enrollment_query,
         "permission": ["131215"],
-    },
-    {
+    }),
+    LazyReportDefinition({
         "name": "insuree_family_overview",
         "engine": 0,
-        "default_report": insuree_family_overview.template,
         "description": "Simple claim report",
         "module": "insuree",
         "python_query": insuree_family_overview_query,
         "permission": ["131215"],
-    },
-    {
+    }),
+    LazyReportDefinition({
         "name": "enrolled_families",
         "engine": 0,
-        "default_report": enrolled_families.template,
         "description": "Enrolled families",
         "module": "insuree",
         "python_query": enrolled_families_query,
         "permission": ["131215"],
-    },
+    }),
 ]
+
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from insuree.apps import InsureeConfig
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+REPORT_FORMATS = ["pdf", "xlsx"]
+
+# Reports whose data depends on the user (location row security), their artifacts are not shared
+USER_SCOPED_REPORTS = ["insuree_family_overview"]
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=InsureeConfig.report_workers or 1,
+                                       thread_name_prefix="insuree_reports")
+    return _executor
+
+
+def _job_key(job_id):
+    return f"insuree_report_job_{job_id}"
+
+
+def _artifact_key(report_name, output_format, params, user):
+    scope = user.id if report_name in USER_SCOPED_REPORTS else None
+    signature = json.dumps([report_name, output_format, sorted(params.items()), scope], default=str)
+    return "insuree_report_artifact_" + hashlib.sha1(signature.encode("utf-8")).hexdigest()
+
+
+def get_report_definition(report_name):
+    from insuree.report import report_definitions
+    return next((definition for definition in report_definitions if definition["name"] == report_name), None)
+
+
+def can_run_report(user, definition):
+    """
+    Same rule as the synchronous report view: the reports permission or the permission of the report
+    """
+    from report.apps import ReportConfig
+    return not definition.get("permission") or user.has_perms(ReportConfig.gql_query_report_perms) \
+        or user.has_perms(definition["permission"])
+
+
+def can_read_job(user, job):
+    """
+    Jobs are shared by the users submitting the same report and parameters, except for the user
+    scoped reports, so any user allowed to run the report can follow it.
+    """
+    if job["report"] in USER_SCOPED_REPORTS and job["user_id"] != user.id:
+        return False
+    definition = get_report_definition(job["report"])
+    return definition is not None and can_run_report(user, definition)
+
+
+def get_job(job_id):
+    return cache.get(_job_key(job_id))
+
+
+def _save_job(job):
+    cache.set(_job_key(job["id"]), job, InsureeConfig.report_artifact_ttl)
+
+
+def _update_job(job, **values):
+    job.update(values)
+    _save_job(job)
+
+
+def submit_report(user, report_name, output_format, params):
+    """
+    Queues the query and rendering of a report on the worker pool and returns the job.
+    A job for the same report, format and parameters submitted within report_artifact_ttl is
+    returned instead (finished or still running), so repeated clicks do not multiply the load.
+    The pool lives in the web process: queued and running jobs are lost when it restarts, they
+    stay in their last status until report_artifact_ttl expires and an identical request resubmits them.
+    """
+    artifact_key = _artifact_key(report_name, output_format, params, user)
+    existing = get_job(cache.get(artifact_key)) if cache.get(artifact_key) else None
+    if existing and existing["status"] != JOB_FAILED and \
+            (existing["status"] != JOB_DONE or os.path.exists(existing["artifact"])):
+        return existing
+    job_id = str(uuid.uuid4())
+    job = {
+        "id": job_id,
+        "report": report_name,
+        "format": output_format,
+        "user_id": user.id,
+        "status": JOB_QUEUED,
+        "progress": 0,
+        "rows": None,
+        "artifact": os.path.join(InsureeConfig.report_artifacts_root_path, f"{job_id}.{output_format}"),
+        "error": None,
+    }
+    _save_job(job)
+    cache.set(artifact_key, job_id, InsureeConfig.report_artifact_ttl)
+    _get_executor().submit(_run_report, job, user, params)
+    return job
+
+
+def cleanup_artifacts(root=None, max_age=None):
+    """
+    Deletes the generated reports older than report_artifact_ttl, they can no longer be served
+    """
+    root = root or InsureeConfig.report_artifacts_root_path
+    limit = time.time() - (max_age if max_age is not None else InsureeConfig.report_artifact_ttl)
+    if not os.path.isdir(root):
+        return 0
+    removed = 0
+    for entry in os.scandir(root):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < limit:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            # deleted by a worker of another process
+            pass
+    return removed
+
+
+def _run_report(job, user, params):
+    try:
+        from report.services import generate_report, get_report_definition as get_report_template
+        cleanup_artifacts()
+        definition = get_report_definition(job["report"])
+        _update_job(job, status=JOB_RUNNING, progress=10)
+        data = definition["python_query"](user, **params)
+        _update_job(job, progress=50)
+        # The template overridden with a ReportDefinition, like the synchronous report view
+        template = get_report_template(definition["name"], definition["default_report"])
+        content = generate_report(definition["name"], template, data, job["format"])
+        # The rows are streamed, their number is known once ReportBro has read them
+        _update_job(job, progress=90, rows=len(data.get("data") or []))
+        os.makedirs(os.path.dirname(job["artifact"]), exist_ok=True)
+        with open(job["artifact"], "wb") as f:
+            f.write(content)
+        _update_job(job, status=JOB_DONE, progress=100)
+    except Exception as exc:
+        logger.exception("Failed to generate report %s", job["report"])
+        _update_job(job, status=JOB_FAILED, error=str(exc))
+    finally:
+        # Worker threads have their own database connections
+        close_old_connections()
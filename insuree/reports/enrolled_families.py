@@ -1,1812 +1,87 @@
-from insuree.models import Family, Insuree
-from report.services import run_stored_proc_report
-from django.db.models import F, Case, When, Value
-from django.db.models.functions import Cast, Rank
-from django.db.models.expressions import Window
+import datetime
 
-# If manually pasting from reportbro and you have test data, search and replace \" with \\"
-template = """
-{
-  "docElements": [
-    {
-      "elementType": "text",
-      "id": 3,
-      "containerId": "0_header",
-      "x": 0,
-      "y": 20,
-      "width": 575,
-      "height": 40,
-      "content": "Enrollment Report",
-      "eval": false,
-      "styleId": "",
-      "bold": true,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "center",
-      "verticalAlignment": "middle",
-      "textColor": "#6aa84f",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": "24",
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": 1,
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": 2,
-      "paddingTop": 2,
-      "paddingRight": 2,
-      "paddingBottom": 2,
-      "printIf": "",
-      "removeEmptyElement": false,
-      "alwaysPrintOnSamePage": true,
-      "pattern": "",
-      "link": "",
-      "cs_condition": "",
-      "cs_styleId": "",
-      "cs_bold": false,
-      "cs_italic": false,
-      "cs_underline": false,
-      "cs_strikethrough": false,
-      "cs_horizontalAlignment": "left",
-      "cs_verticalAlignment": "top",
-      "cs_textColor": "#000000",
-      "cs_backgroundColor": "",
-      "cs_font": "helvetica",
-      "cs_fontSize": 12,
-      "cs_lineSpacing": 1,
-      "cs_borderColor": "#000000",
-      "cs_borderWidth": "1",
-      "cs_borderAll": false,
-      "cs_borderLeft": false,
-      "cs_borderTop": false,
-      "cs_borderRight": false,
-      "cs_borderBottom": false,
-      "cs_paddingLeft": 2,
-      "cs_paddingTop": 2,
-      "cs_paddingRight": 2,
-      "cs_paddingBottom": 2,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_colspan": "",
-      "spreadsheet_addEmptyRow": false
-    },
-    {
-      "elementType": "line",
-      "id": 158,
-      "containerId": "0_content",
-      "x": 0,
-      "y": 0,
-      "width": 575,
-      "height": 1,
-      "color": "#000000",
-      "printIf": ""
-    },
-    {
-      "elementType": "text",
-      "id": 193,
-      "containerId": "0_content",
-      "x": 0,
-      "y": 10,
-      "width": 575,
-      "height": 20,
-      "content": "List of families and insurees",
-      "eval": false,
-      "styleId": "",
-      "bold": true,
-      "italic": false,
-      "underline": true,
-      "strikethrough": false,
-      "horizontalAlignment": "center",
-      "verticalAlignment": "top",
-      "textColor": "#000000",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": 12,
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": 1,
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": 2,
-      "paddingTop": 2,
-      "paddingRight": 2,
-      "paddingBottom": 2,
-      "printIf": "",
-      "removeEmptyElement": false,
-      "alwaysPrintOnSamePage": true,
-      "pattern": "",
-      "link": "",
-      "cs_condition": "",
-      "cs_styleId": "",
-      "cs_bold": false,
-      "cs_italic": false,
-      "cs_underline": false,
-      "cs_strikethrough": false,
-      "cs_horizontalAlignment": "left",
-      "cs_verticalAlignment": "top",
-      "cs_textColor": "#000000",
-      "cs_backgroundColor": "",
-      "cs_font": "helvetica",
-      "cs_fontSize": 12,
-      "cs_lineSpacing": 1,
-      "cs_borderColor": "#000000",
-      "cs_borderWidth": "1",
-      "cs_borderAll": false,
-      "cs_borderLeft": false,
-      "cs_borderTop": false,
-      "cs_borderRight": false,
-      "cs_borderBottom": false,
-      "cs_paddingLeft": 2,
-      "cs_paddingTop": 2,
-      "cs_paddingRight": 2,
-      "cs_paddingBottom": 2,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_colspan": "",
-      "spreadsheet_addEmptyRow": false
-    },
-    {
-      "elementType": "table",
-      "id": 195,
-      "containerId": "0_content",
-      "width": 574,
-      "x": 0,
-      "y": 40,
-      "dataSource": "${data}",
-      "columns": 4,
-      "header": true,
-      "contentRows": 4,
-      "footer": false,
-      "border": "grid",
-      "borderColor": "#000000",
-      "borderWidth": "1",
-      "printIf": "",
-      "removeEmptyElement": false,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_addEmptyRow": false,
-      "headerData": {
-        "elementType": "none",
-        "id": 196,
-        "height": 20,
-        "backgroundColor": "",
-        "repeatHeader": true,
-        "columnData": [
-          {
-            "elementType": "table_text",
-            "id": 197,
-            "width": 160,
-            "content": "Insurance Number",
-            "eval": false,
-            "colspan": "",
-            "styleId": "33",
-            "bold": true,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "middle",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": "12",
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "printIf": "",
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 205,
-            "width": 175,
-            "content": "Name",
-            "eval": false,
-            "colspan": "",
-            "styleId": "33",
-            "bold": true,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "middle",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": "12",
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "printIf": "",
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 206,
-            "width": 168,
-            "content": "Enroll Date",
-            "eval": false,
-            "colspan": "",
-            "styleId": "33",
-            "bold": true,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "middle",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": "12",
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "printIf": "",
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 239,
-            "width": 71,
-            "content": "Status",
-            "eval": false,
-            "colspan": "",
-            "styleId": "33",
-            "bold": true,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "middle",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": "12",
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "printIf": "",
-            "borderWidth": 1
-          }
-        ]
-      },
-      "contentDataRows": [
-        {
-          "elementType": "none",
-          "id": 257,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "",
-          "groupExpression": "${district}",
-          "printIf": "",
-          "alwaysPrintOnSamePage": true,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 258,
-              "width": 160,
-              "content": "${DistrictName}",
-              "eval": false,
-              "colspan": "4",
-              "styleId": "33",
-              "bold": true,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "middle",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": "12",
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 259,
-              "width": 175,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 260,
-              "width": 168,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 261,
-              "width": 71,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            }
-          ]
-        },
-        {
-          "elementType": "none",
-          "id": 252,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "",
-          "groupExpression": "${ward}",
-          "printIf": "",
-          "alwaysPrintOnSamePage": true,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 253,
-              "width": 160,
-              "content": "   ${WardName}",
-              "eval": false,
-              "colspan": "4",
-              "styleId": "33",
-              "bold": true,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "middle",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": "12",
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 254,
-              "width": 175,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 255,
-              "width": 168,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 256,
-              "width": 71,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            }
-          ]
-        },
-        {
-          "elementType": "none",
-          "id": 245,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "",
-          "groupExpression": "${village}",
-          "printIf": "",
-          "alwaysPrintOnSamePage": true,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 246,
-              "width": 160,
-              "content": "      ${VillageName}",
-              "eval": false,
-              "colspan": "4",
-              "styleId": "33",
-              "bold": true,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "middle",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": "12",
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 247,
-              "width": 175,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 248,
-              "width": 168,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 249,
-              "width": 71,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            }
-          ]
-        },
-        {
-          "elementType": "none",
-          "id": 199,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "#eeeeee",
-          "groupExpression": "",
-          "printIf": "",
-          "alwaysPrintOnSamePage": false,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 200,
-              "width": 160,
-              "content": "${CHFID}",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 208,
-              "width": 175,
-              "content": "${OtherNames} + ' ' + ${LastName}",
-              "eval": true,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 209,
-              "width": 168,
-              "content": "${EnrolDate}",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "dd/MM/yyyy",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            },
-            {
-              "elementType": "table_text",
-              "id": 240,
-              "width": 71,
-              "content": "${PolicyStatusDesc}",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "borderWidth": 1
-            }
-          ]
-        }
-      ],
-      "footerData": {
-        "elementType": "none",
-        "id": 202,
-        "height": 20,
-        "backgroundColor": "",
-        "columnData": [
-          {
-            "elementType": "table_text",
-            "id": 203,
-            "width": 160,
-            "content": "",
-            "eval": false,
-            "colspan": "",
-            "styleId": "",
-            "bold": false,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "top",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": 12,
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 211,
-            "width": 175,
-            "content": "",
-            "eval": false,
-            "colspan": "",
-            "styleId": "",
-            "bold": false,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "top",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": 12,
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 212,
-            "width": 168,
-            "content": "",
-            "eval": false,
-            "colspan": "",
-            "styleId": "",
-            "bold": false,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "top",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": 12,
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 241,
-            "width": 71,
-            "content": "",
-            "eval": false,
-            "colspan": "",
-            "styleId": "",
-            "bold": false,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "top",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": 12,
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "borderWidth": 1
-          }
-        ]
-      }
-    },
-    {
-      "elementType": "text",
-      "id": 7,
-      "containerId": "0_footer",
-      "x": 320,
-      "y": 0,
-      "width": 255,
-      "height": 30,
-      "content": "Page ${page_number} / ${page_count}",
-      "eval": false,
-      "styleId": "",
-      "bold": false,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "right",
-      "verticalAlignment": "middle",
-      "textColor": "#666666",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": 12,
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": 1,
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": 2,
-      "paddingTop": 2,
-      "paddingRight": 2,
-      "paddingBottom": 2,
-      "printIf": "",
-      "removeEmptyElement": false,
-      "alwaysPrintOnSamePage": true,
-      "pattern": "",
-      "link": "",
-      "cs_condition": "",
-      "cs_styleId": "",
-      "cs_bold": false,
-      "cs_italic": false,
-      "cs_underline": false,
-      "cs_strikethrough": false,
-      "cs_horizontalAlignment": "left",
-      "cs_verticalAlignment": "top",
-      "cs_textColor": "#000000",
-      "cs_backgroundColor": "",
-      "cs_font": "helvetica",
-      "cs_fontSize": 12,
-      "cs_lineSpacing": 1,
-      "cs_borderColor": "#000000",
-      "cs_borderWidth": "1",
-      "cs_borderAll": false,
-      "cs_borderLeft": false,
-      "cs_borderTop": false,
-      "cs_borderRight": false,
-      "cs_borderBottom": false,
-      "cs_paddingLeft": 2,
-      "cs_paddingTop": 2,
-      "cs_paddingRight": 2,
-      "cs_paddingBottom": 2,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_colspan": "",
-      "spreadsheet_addEmptyRow": false
-    },
-    {
-      "elementType": "text",
-      "id": 8,
-      "containerId": "0_footer",
-      "x": 0,
-      "y": 0,
-      "width": 290,
-      "height": 30,
-      "content": "Created on ${current_date}",
-      "eval": false,
-      "styleId": "",
-      "bold": false,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "left",
-      "verticalAlignment": "middle",
-      "textColor": "#666666",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": 12,
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": 1,
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": 2,
-      "paddingTop": 2,
-      "paddingRight": 2,
-      "paddingBottom": 2,
-      "printIf": "",
-      "removeEmptyElement": false,
-      "alwaysPrintOnSamePage": true,
-      "pattern": "",
-      "link": "",
-      "cs_condition": "",
-      "cs_styleId": "",
-      "cs_bold": false,
-      "cs_italic": false,
-      "cs_underline": false,
-      "cs_strikethrough": false,
-      "cs_horizontalAlignment": "left",
-      "cs_verticalAlignment": "top",
-      "cs_textColor": "#000000",
-      "cs_backgroundColor": "",
-      "cs_font": "helvetica",
-      "cs_fontSize": 12,
-      "cs_lineSpacing": 1,
-      "cs_borderColor": "#000000",
-      "cs_borderWidth": "1",
-      "cs_borderAll": false,
-      "cs_borderLeft": false,
-      "cs_borderTop": false,
-      "cs_borderRight": false,
-      "cs_borderBottom": false,
-      "cs_paddingLeft": 2,
-      "cs_paddingTop": 2,
-      "cs_paddingRight": 2,
-      "cs_paddingBottom": 2,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_colspan": "",
-      "spreadsheet_addEmptyRow": false
-    }
-  ],
-  "parameters": [
-    {
-      "id": 1,
-      "name": "page_count",
-      "type": "number",
-      "arrayItemType": "string",
-      "eval": false,
-      "nullable": false,
-      "pattern": "",
-      "expression": "",
-      "showOnlyNameType": true,
-      "testData": ""
-    },
-    {
-      "id": 2,
-      "name": "page_number",
-      "type": "number",
-      "arrayItemType": "string",
-      "eval": false,
-      "nullable": false,
-      "pattern": "",
-      "expression": "",
-      "showOnlyNameType": true,
-      "testData": ""
-    },
-    {
-      "id": 9,
-      "name": "current_date",
-      "type": "date",
-      "arrayItemType": "string",
-      "eval": false,
-      "nullable": false,
-      "pattern": "d/M/yyyy H:mm",
-      "expression": "",
-      "showOnlyNameType": false,
-      "testData": ""
-    },
-    {
-      "id": 233,
-      "name": "data",
-      "type": "array",
-      "arrayItemType": "string",
-      "eval": false,
-      "nullable": false,
-      "pattern": "",
-      "expression": "",
-      "showOnlyNameType": false,
-      "testData": "[{\\"FamilyID\\":\\"1234567\\",\\"LocationId\\":\\"123\\",\\"RegionName\\":\\"Reg\\",\\"DistrictName\\":\\"Dist\\",\\"WardName\\":\\"Wrd\\",\\"VillageName\\":\\"Vil\\",\\"IsHead\\":\\"1\\",\\"CHFID\\":\\"132434654\\",\\"LastName\\":\\"Doe\\",\\"OtherNames\\":\\"John\\",\\"EnrolDate\\":\\"2022-01-01\\",\\"PolicyStatus\\":\\"1\\",\\"PolicyStatusDesc\\":\\"READY\\"}]",
-      "children": [
-        {
-          "id": 234,
-          "name": "row_number",
-          "type": "number",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": false,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": true,
-          "testData": ""
-        },
-        {
-          "id": 235,
-          "name": "FamilyID",
-          "type": "number",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 236,
-          "name": "LocationId",
-          "type": "number",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 262,
-          "name": "RegionName",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": false,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 237,
-          "name": "DistrictName",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 242,
-          "name": "WardName",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 244,
-          "name": "VillageName",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 250,
-          "name": "IsHead",
-          "type": "boolean",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 251,
-          "name": "CHFID",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": false,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 263,
-          "name": "LastName",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": false,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 264,
-          "name": "OtherNames",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 265,
-          "name": "EnrolDate",
-          "type": "date",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 266,
-          "name": "PolicyStatus",
-          "type": "number",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 267,
-          "name": "PolicyStatusDesc",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        }
-      ]
-    }
-  ],
-  "styles": [
-    {
-      "id": 33,
-      "name": "Table Header",
-      "bold": true,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "left",
-      "verticalAlignment": "middle",
-      "textColor": "#000000",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": "12",
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": "1",
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": "2",
-      "paddingTop": "2",
-      "paddingRight": "2",
-      "paddingBottom": "2"
-    },
-    {
-      "id": 34,
-      "name": "Table Content",
-      "bold": false,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "left",
-      "verticalAlignment": "middle",
-      "textColor": "#000000",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": "9",
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": "1",
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": "2",
-      "paddingTop": "2",
-      "paddingRight": "2",
-      "paddingBottom": "2"
-    },
-    {
-      "id": 35,
-      "name": "Table Content Highlight",
-      "bold": true,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "center",
-      "verticalAlignment": "middle",
-      "textColor": "#3d85c6",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": "9",
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": "1",
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": "2",
-      "paddingTop": "2",
-      "paddingRight": "2",
-      "paddingBottom": "2"
-    }
-  ],
-  "version": 3,
-  "documentProperties": {
-    "pageFormat": "A4",
-    "pageWidth": "",
-    "pageHeight": "",
-    "unit": "mm",
-    "orientation": "portrait",
-    "contentHeight": "",
-    "marginLeft": "10",
-    "marginTop": "10",
-    "marginRight": "10",
-    "marginBottom": "10",
-    "header": true,
-    "headerSize": "80",
-    "headerDisplay": "always",
-    "footer": true,
-    "footerSize": "30",
-    "footerDisplay": "always",
-    "patternLocale": "en",
-    "patternCurrencySymbol": "$"
-  }
-}
+from django.conf import settings
+from location.models import Location
+from insuree.reports.streaming import iter_sql_rows, StreamedRows
 
+
+# Latest current policy of each family, picked with a lateral/apply subquery rather than ranking the whole
+# insuree x policy join. Location names are resolved once, all families being in the same village.
+enrolled_families_sql = f"""
+SELECT i."CHFID", i."LastName", i."OtherNames", i."ValidityFrom", h."IsHead", lp."PolicyStatus"
+FROM "tblInsuree" i
+         INNER JOIN "tblFamilies" f ON f."FamilyID" = i."FamilyID"
+         INNER JOIN "tblInsuree" h ON h."InsureeID" = f."InsureeID"
+         {"CROSS APPLY" if settings.MSSQL else "INNER JOIN LATERAL"} (
+             SELECT {"TOP 1" if settings.MSSQL else ""} p."PolicyStatus"
+             FROM "tblPolicy" p
+             WHERE p."FamilyID" = f."FamilyID" AND p."ValidityTo" IS NULL
+             ORDER BY p."ValidityFrom" DESC {"" if settings.MSSQL else "LIMIT 1"}
+         ) lp {"" if settings.MSSQL else "ON TRUE"}
+WHERE f."LocationId" = %(location_id)s
+  AND i."ValidityTo" IS NULL
+  AND i."ValidityFrom" >= %(date_from)s
+  AND i."ValidityFrom" < %(date_to)s
 """
 
+POLICY_STATUS_DESC = {1: 'Idle', 2: 'Active', 4: 'Suspended', 8: 'Expired'}
 
-def enrolled_families_query(user, dateFrom=None, dateTo=None, locationId=None, **kwargs):
 
-    report_data = Insuree.objects.filter(
-        family__location_id=locationId,
-        validity_to__isnull=True,
-        validity_from__date__range=(dateFrom, dateTo),
-        family__location__parent__parent__parent__validity_to__isnull=True,
-        family__location__parent__parent__validity_to__isnull=True,
-        family__location__parent__validity_to__isnull=True,
-        family__location__validity_to__isnull=True,
-        family__policies__validity_to__isnull=True
-    ).annotate(
-        RegionName=F('family__location__parent__parent__parent__name'),
-        DistrictName=F('family__location__parent__parent__name'),
-        WardName=F('family__location__parent__name'),
-        VillageName=F('family__location__name'),
-        IsHead=F('family__head_insuree__head'),
-        CHFID=F('chf_id'),
-        LastName=F('last_name'),
-        OtherNames=F('other_names'),
-        EnrolDate=F('validity_from__date'),
-        PolicyStatusDesc=Case(
-            When(family__policies__status=1, then=Value('Idle')),
-            When(family__policies__status=2, then=Value('Active')),
-            When(family__policies__status=4, then=Value('Suspended')),
-            When(family__policies__status=8, then=Value('Expired'))
-        ),
-        rank=Window(
-            expression=Rank(),
-            partition_by=F('family__id'),
-            order_by=F('family__policies__validity_from').desc()
-        )
-    ).filter(rank=1).values(
-        'RegionName',
-        'DistrictName',
-        'WardName',
-        'VillageName',
-        'IsHead',
-        'CHFID',
-        'LastName',
-        'OtherNames',
-        'EnrolDate',
-        'PolicyStatusDesc'
-    )
+def _as_date(value):
+    return datetime.date.fromisoformat(value[:10]) if isinstance(value, str) else value
+
 
+def _current_location_names(location_id):
+    """
+    Village, ward, district and region names of a village, None if any of them is not current.
+    """
+    village = Location.objects \
+        .select_related("parent__parent__parent") \
+        .filter(id=location_id) \
+        .first()
+    chain = [village, village and village.parent, village and village.parent and village.parent.parent]
+    chain.append(chain[-1] and chain[-1].parent)
+    if any(location is None or location.validity_to is not None for location in chain):
+        return None
     return {
-        "data": list(report_data)
+        "RegionName": chain[3].name,
+        "DistrictName": chain[2].name,
+        "WardName": chain[1].name,
+        "VillageName": chain[0].name,
     }
+
+
+def enrolled_families_rows(user, dateFrom=None, dateTo=None, locationId=None, **kwargs):
+    location_names = _current_location_names(locationId)
+    if location_names is None:
+        return
+    params = {
+        "location_id": locationId,
+        "date_from": _as_date(dateFrom),
+        # A missing bound compares with NULL and selects nothing, like the former date range filter
+        "date_to": _as_date(dateTo) + datetime.timedelta(days=1) if dateTo else None,
+    }
+    for row in iter_sql_rows(enrolled_families_sql, params):
+        yield {
+            **location_names,
+            "IsHead": row["IsHead"],
+            "CHFID": row["CHFID"],
+            "LastName": row["LastName"],
+            "OtherNames": row["OtherNames"],
+            "EnrolDate": row["ValidityFrom"].date(),
+            "PolicyStatusDesc": POLICY_STATUS_DESC.get(row["PolicyStatus"]),
+        }
+
+
+def enrolled_families_query(user, dateFrom=None, dateTo=None, locationId=None, **kwargs):
+    return {
+        "data": StreamedRows(lambda: enrolled_families_rows(user, dateFrom, dateTo, locationId, **kwargs))
+    }
+
+
+def __getattr__(name):
+    # The ReportBro template, formerly a module constant, is read from reports/templates on first access
+    if name == "template":
+        from insuree.report import get_report_template_text
+        return get_report_template_text("enrolled_families")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
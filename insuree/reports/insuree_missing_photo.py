@@ -1,2069 +1,95 @@
 from django.conf import settings
-from django.db import connection
 
-from tools.utils import dictfetchall
+from insuree.reports.streaming import iter_sql_rows, StreamedRows
 import logging
 logger = logging.getLogger(__name__)
 
-# If manually pasting from reportbro and you have test data, search and replace \" with \\"
-template = """
-{
-  "docElements": [
-    {
-      "elementType": "text",
-      "id": 3,
-      "containerId": "0_header",
-      "x": 0,
-      "y": 20,
-      "width": 575,
-      "height": 40,
-      "content": "Insurees without photos",
-      "richText": false,
-      "richTextContent": null,
-      "richTextHtml": "",
-      "eval": false,
-      "styleId": "",
-      "bold": true,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "center",
-      "verticalAlignment": "middle",
-      "textColor": "#6aa84f",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": "24",
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": 1,
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": 2,
-      "paddingTop": 2,
-      "paddingRight": 2,
-      "paddingBottom": 2,
-      "printIf": "",
-      "removeEmptyElement": false,
-      "alwaysPrintOnSamePage": true,
-      "pattern": "",
-      "link": "",
-      "cs_condition": "",
-      "cs_styleId": "",
-      "cs_bold": false,
-      "cs_italic": false,
-      "cs_underline": false,
-      "cs_strikethrough": false,
-      "cs_horizontalAlignment": "left",
-      "cs_verticalAlignment": "top",
-      "cs_textColor": "#000000",
-      "cs_backgroundColor": "",
-      "cs_font": "helvetica",
-      "cs_fontSize": 12,
-      "cs_lineSpacing": 1,
-      "cs_borderColor": "#000000",
-      "cs_borderWidth": "1",
-      "cs_borderAll": false,
-      "cs_borderLeft": false,
-      "cs_borderTop": false,
-      "cs_borderRight": false,
-      "cs_borderBottom": false,
-      "cs_paddingLeft": 2,
-      "cs_paddingTop": 2,
-      "cs_paddingRight": 2,
-      "cs_paddingBottom": 2,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_colspan": "",
-      "spreadsheet_addEmptyRow": false,
-      "spreadsheet_textWrap": false
-    },
-    {
-      "elementType": "line",
-      "id": 158,
-      "containerId": "0_content",
-      "x": 0,
-      "y": 0,
-      "width": 575,
-      "height": 1,
-      "color": "#000000",
-      "printIf": ""
-    },
-    {
-      "elementType": "text",
-      "id": 193,
-      "containerId": "0_content",
-      "x": 0,
-      "y": 10,
-      "width": 575,
-      "height": 20,
-      "content": "List of insurees without photos",
-      "richText": false,
-      "richTextContent": null,
-      "richTextHtml": "",
-      "eval": false,
-      "styleId": "",
-      "bold": true,
-      "italic": false,
-      "underline": true,
-      "strikethrough": false,
-      "horizontalAlignment": "center",
-      "verticalAlignment": "top",
-      "textColor": "#000000",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": 12,
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": 1,
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": 2,
-      "paddingTop": 2,
-      "paddingRight": 2,
-      "paddingBottom": 2,
-      "printIf": "",
-      "removeEmptyElement": false,
-      "alwaysPrintOnSamePage": true,
-      "pattern": "",
-      "link": "",
-      "cs_condition": "",
-      "cs_styleId": "",
-      "cs_bold": false,
-      "cs_italic": false,
-      "cs_underline": false,
-      "cs_strikethrough": false,
-      "cs_horizontalAlignment": "left",
-      "cs_verticalAlignment": "top",
-      "cs_textColor": "#000000",
-      "cs_backgroundColor": "",
-      "cs_font": "helvetica",
-      "cs_fontSize": 12,
-      "cs_lineSpacing": 1,
-      "cs_borderColor": "#000000",
-      "cs_borderWidth": "1",
-      "cs_borderAll": false,
-      "cs_borderLeft": false,
-      "cs_borderTop": false,
-      "cs_borderRight": false,
-      "cs_borderBottom": false,
-      "cs_paddingLeft": 2,
-      "cs_paddingTop": 2,
-      "cs_paddingRight": 2,
-      "cs_paddingBottom": 2,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_colspan": "",
-      "spreadsheet_addEmptyRow": false,
-      "spreadsheet_textWrap": false
-    },
-    {
-      "elementType": "table",
-      "id": 195,
-      "containerId": "0_content",
-      "width": 574,
-      "x": 0,
-      "y": 40,
-      "dataSource": "${data}",
-      "columns": 4,
-      "header": true,
-      "contentRows": 5,
-      "footer": false,
-      "border": "grid",
-      "borderColor": "#000000",
-      "borderWidth": "1",
-      "printIf": "",
-      "removeEmptyElement": false,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_addEmptyRow": false,
-      "headerData": {
-        "elementType": "none",
-        "id": 196,
-        "height": 20,
-        "backgroundColor": "",
-        "repeatHeader": true,
-        "columnData": [
-          {
-            "elementType": "table_text",
-            "id": 197,
-            "width": 160,
-            "content": "Insurance Number",
-            "eval": false,
-            "colspan": "",
-            "styleId": "33",
-            "bold": true,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "middle",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": "12",
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "spreadsheet_textWrap": false,
-            "printIf": "",
-            "growWeight": 0,
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 205,
-            "width": 175,
-            "content": "Name",
-            "eval": false,
-            "colspan": "",
-            "styleId": "33",
-            "bold": true,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "middle",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": "12",
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "spreadsheet_textWrap": false,
-            "printIf": "",
-            "growWeight": 0,
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 206,
-            "width": 168,
-            "content": "Gender",
-            "eval": false,
-            "colspan": "",
-            "styleId": "33",
-            "bold": true,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "middle",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": "12",
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "spreadsheet_textWrap": false,
-            "printIf": "",
-            "growWeight": 0,
-            "borderWidth": 1
-          },
-          {
-            "elementType": "table_text",
-            "id": 239,
-            "width": 71,
-            "content": "Is Head",
-            "eval": false,
-            "colspan": "",
-            "styleId": "33",
-            "bold": true,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "middle",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": "12",
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "spreadsheet_textWrap": false,
-            "printIf": "",
-            "growWeight": 0,
-            "borderWidth": 1
-          }
-        ]
-      },
-      "contentDataRows": [
-        {
-          "elementType": "none",
-          "id": 257,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "",
-          "groupExpression": "${district}",
-          "printIf": "",
-          "alwaysPrintOnSamePage": true,
-          "pageBreak": false,
-          "repeatGroupHeader": false,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 258,
-              "width": 160,
-              "content": "${district_name}",
-              "eval": false,
-              "colspan": "4",
-              "styleId": "33",
-              "bold": true,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "middle",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": "12",
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 259,
-              "width": 175,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 260,
-              "width": 168,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 261,
-              "width": 71,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            }
-          ]
-        },
-        {
-          "elementType": "none",
-          "id": 266,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "",
-          "groupExpression": "${officer_code}",
-          "printIf": "",
-          "alwaysPrintOnSamePage": true,
-          "pageBreak": false,
-          "repeatGroupHeader": false,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 267,
-              "width": 160,
-              "content": "('  ' + ${officer_last_name} + ' ' + ${officer_other_names} + ' (' + ${officer_code} + ')') if officer_code else '  No officer'",
-              "eval": true,
-              "colspan": "4",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 268,
-              "width": 175,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 269,
-              "width": 168,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 270,
-              "width": 71,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            }
-          ]
-        },
-        {
-          "elementType": "none",
-          "id": 252,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "",
-          "groupExpression": "${ward}",
-          "printIf": "",
-          "alwaysPrintOnSamePage": true,
-          "pageBreak": false,
-          "repeatGroupHeader": false,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 253,
-              "width": 160,
-              "content": "   ${ward_name}",
-              "eval": false,
-              "colspan": "4",
-              "styleId": "33",
-              "bold": true,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "middle",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": "12",
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 254,
-              "width": 175,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 255,
-              "width": 168,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 256,
-              "width": 71,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            }
-          ]
-        },
-        {
-          "elementType": "none",
-          "id": 245,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "",
-          "groupExpression": "${village}",
-          "printIf": "",
-          "alwaysPrintOnSamePage": true,
-          "pageBreak": false,
-          "repeatGroupHeader": false,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 246,
-              "width": 160,
-              "content": "      ${village_name}",
-              "eval": false,
-              "colspan": "4",
-              "styleId": "33",
-              "bold": true,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "middle",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": "12",
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 247,
-              "width": 175,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 248,
-              "width": 168,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 249,
-              "width": 71,
-              "content": "",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            }
-          ]
-        },
-        {
-          "elementType": "none",
-          "id": 199,
-          "height": 20,
-          "backgroundColor": "",
-          "alternateBackgroundColor": "#eeeeee",
-          "groupExpression": "",
-          "printIf": "",
-          "alwaysPrintOnSamePage": false,
-          "pageBreak": false,
-          "repeatGroupHeader": false,
-          "columnData": [
-            {
-              "elementType": "table_text",
-              "id": 200,
-              "width": 160,
-              "content": "${chf_id}",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 208,
-              "width": 175,
-              "content": "${other_names} + ' ' + ${last_name}",
-              "eval": true,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 209,
-              "width": 168,
-              "content": "${gender}",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "yyyy/MM/dd",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            },
-            {
-              "elementType": "table_text",
-              "id": 240,
-              "width": 71,
-              "content": "${is_head}",
-              "eval": false,
-              "colspan": "",
-              "styleId": "",
-              "bold": false,
-              "italic": false,
-              "underline": false,
-              "strikethrough": false,
-              "horizontalAlignment": "left",
-              "verticalAlignment": "top",
-              "textColor": "#000000",
-              "backgroundColor": "",
-              "font": "helvetica",
-              "fontSize": 12,
-              "lineSpacing": 1,
-              "paddingLeft": 2,
-              "paddingTop": 2,
-              "paddingRight": 2,
-              "paddingBottom": 2,
-              "pattern": "",
-              "link": "",
-              "cs_condition": "",
-              "cs_styleId": "",
-              "cs_bold": false,
-              "cs_italic": false,
-              "cs_underline": false,
-              "cs_strikethrough": false,
-              "cs_horizontalAlignment": "left",
-              "cs_verticalAlignment": "top",
-              "cs_textColor": "#000000",
-              "cs_backgroundColor": "",
-              "cs_font": "helvetica",
-              "cs_fontSize": 12,
-              "cs_lineSpacing": 1,
-              "cs_paddingLeft": 2,
-              "cs_paddingTop": 2,
-              "cs_paddingRight": 2,
-              "cs_paddingBottom": 2,
-              "spreadsheet_textWrap": false,
-              "borderWidth": 1,
-              "growWeight": 0
-            }
-          ]
-        }
-      ],
-      "footerData": {
-        "elementType": "none",
-        "id": 202,
-        "height": 20,
-        "backgroundColor": "",
-        "columnData": [
-          {
-            "elementType": "table_text",
-            "id": 203,
-            "width": 160,
-            "content": "",
-            "eval": false,
-            "colspan": "",
-            "styleId": "",
-            "bold": false,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "top",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": 12,
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "spreadsheet_textWrap": false,
-            "borderWidth": 1,
-            "growWeight": 0
-          },
-          {
-            "elementType": "table_text",
-            "id": 211,
-            "width": 175,
-            "content": "",
-            "eval": false,
-            "colspan": "",
-            "styleId": "",
-            "bold": false,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "top",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": 12,
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "spreadsheet_textWrap": false,
-            "borderWidth": 1,
-            "growWeight": 0
-          },
-          {
-            "elementType": "table_text",
-            "id": 212,
-            "width": 168,
-            "content": "",
-            "eval": false,
-            "colspan": "",
-            "styleId": "",
-            "bold": false,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "top",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": 12,
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "spreadsheet_textWrap": false,
-            "borderWidth": 1,
-            "growWeight": 0
-          },
-          {
-            "elementType": "table_text",
-            "id": 241,
-            "width": 71,
-            "content": "",
-            "eval": false,
-            "colspan": "",
-            "styleId": "",
-            "bold": false,
-            "italic": false,
-            "underline": false,
-            "strikethrough": false,
-            "horizontalAlignment": "left",
-            "verticalAlignment": "top",
-            "textColor": "#000000",
-            "backgroundColor": "",
-            "font": "helvetica",
-            "fontSize": 12,
-            "lineSpacing": 1,
-            "paddingLeft": 2,
-            "paddingTop": 2,
-            "paddingRight": 2,
-            "paddingBottom": 2,
-            "pattern": "",
-            "link": "",
-            "cs_condition": "",
-            "cs_styleId": "",
-            "cs_bold": false,
-            "cs_italic": false,
-            "cs_underline": false,
-            "cs_strikethrough": false,
-            "cs_horizontalAlignment": "left",
-            "cs_verticalAlignment": "top",
-            "cs_textColor": "#000000",
-            "cs_backgroundColor": "",
-            "cs_font": "helvetica",
-            "cs_fontSize": 12,
-            "cs_lineSpacing": 1,
-            "cs_paddingLeft": 2,
-            "cs_paddingTop": 2,
-            "cs_paddingRight": 2,
-            "cs_paddingBottom": 2,
-            "spreadsheet_textWrap": false,
-            "borderWidth": 1,
-            "growWeight": 0
-          }
-        ]
-      }
-    },
-    {
-      "elementType": "text",
-      "id": 7,
-      "containerId": "0_footer",
-      "x": 320,
-      "y": 0,
-      "width": 255,
-      "height": 30,
-      "content": "Page ${page_number} / ${page_count}",
-      "richText": false,
-      "richTextContent": null,
-      "richTextHtml": "",
-      "eval": false,
-      "styleId": "",
-      "bold": false,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "right",
-      "verticalAlignment": "middle",
-      "textColor": "#666666",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": 12,
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": 1,
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": 2,
-      "paddingTop": 2,
-      "paddingRight": 2,
-      "paddingBottom": 2,
-      "printIf": "",
-      "removeEmptyElement": false,
-      "alwaysPrintOnSamePage": true,
-      "pattern": "",
-      "link": "",
-      "cs_condition": "",
-      "cs_styleId": "",
-      "cs_bold": false,
-      "cs_italic": false,
-      "cs_underline": false,
-      "cs_strikethrough": false,
-      "cs_horizontalAlignment": "left",
-      "cs_verticalAlignment": "top",
-      "cs_textColor": "#000000",
-      "cs_backgroundColor": "",
-      "cs_font": "helvetica",
-      "cs_fontSize": 12,
-      "cs_lineSpacing": 1,
-      "cs_borderColor": "#000000",
-      "cs_borderWidth": "1",
-      "cs_borderAll": false,
-      "cs_borderLeft": false,
-      "cs_borderTop": false,
-      "cs_borderRight": false,
-      "cs_borderBottom": false,
-      "cs_paddingLeft": 2,
-      "cs_paddingTop": 2,
-      "cs_paddingRight": 2,
-      "cs_paddingBottom": 2,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_colspan": "",
-      "spreadsheet_addEmptyRow": false,
-      "spreadsheet_textWrap": false
-    },
-    {
-      "elementType": "text",
-      "id": 8,
-      "containerId": "0_footer",
-      "x": 0,
-      "y": 0,
-      "width": 290,
-      "height": 30,
-      "content": "Created on ${current_date}",
-      "richText": false,
-      "richTextContent": null,
-      "richTextHtml": "",
-      "eval": false,
-      "styleId": "",
-      "bold": false,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "left",
-      "verticalAlignment": "middle",
-      "textColor": "#666666",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": 12,
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": 1,
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": 2,
-      "paddingTop": 2,
-      "paddingRight": 2,
-      "paddingBottom": 2,
-      "printIf": "",
-      "removeEmptyElement": false,
-      "alwaysPrintOnSamePage": true,
-      "pattern": "",
-      "link": "",
-      "cs_condition": "",
-      "cs_styleId": "",
-      "cs_bold": false,
-      "cs_italic": false,
-      "cs_underline": false,
-      "cs_strikethrough": false,
-      "cs_horizontalAlignment": "left",
-      "cs_verticalAlignment": "top",
-      "cs_textColor": "#000000",
-      "cs_backgroundColor": "",
-      "cs_font": "helvetica",
-      "cs_fontSize": 12,
-      "cs_lineSpacing": 1,
-      "cs_borderColor": "#000000",
-      "cs_borderWidth": "1",
-      "cs_borderAll": false,
-      "cs_borderLeft": false,
-      "cs_borderTop": false,
-      "cs_borderRight": false,
-      "cs_borderBottom": false,
-      "cs_paddingLeft": 2,
-      "cs_paddingTop": 2,
-      "cs_paddingRight": 2,
-      "cs_paddingBottom": 2,
-      "spreadsheet_hide": false,
-      "spreadsheet_column": "",
-      "spreadsheet_colspan": "",
-      "spreadsheet_addEmptyRow": false,
-      "spreadsheet_textWrap": false
-    }
-  ],
-  "parameters": [
-    {
-      "id": 1,
-      "name": "page_count",
-      "type": "number",
-      "arrayItemType": "string",
-      "eval": false,
-      "nullable": false,
-      "pattern": "",
-      "expression": "",
-      "showOnlyNameType": true,
-      "testData": ""
-    },
-    {
-      "id": 2,
-      "name": "page_number",
-      "type": "number",
-      "arrayItemType": "string",
-      "eval": false,
-      "nullable": false,
-      "pattern": "",
-      "expression": "",
-      "showOnlyNameType": true,
-      "testData": ""
-    },
-    {
-      "id": 9,
-      "name": "current_date",
-      "type": "date",
-      "arrayItemType": "string",
-      "eval": false,
-      "nullable": false,
-      "pattern": "d/M/yyyy H:mm",
-      "expression": "",
-      "showOnlyNameType": false,
-      "testData": ""
-    },
-    {
-      "id": 233,
-      "name": "data",
-      "type": "array",
-      "arrayItemType": "string",
-      "eval": false,
-      "nullable": false,
-      "pattern": "",
-      "expression": "",
-      "showOnlyNameType": false,
-      "testData": "",
-      "children": [
-        {
-          "id": 234,
-          "name": "row_number",
-          "type": "number",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": false,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": true,
-          "testData": ""
-        },
-        {
-          "id": 235,
-          "name": "chf_id",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 236,
-          "name": "other_names",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 262,
-          "name": "last_name",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": false,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 237,
-          "name": "gender",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 242,
-          "name": "is_head",
-          "type": "boolean",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 244,
-          "name": "village_name",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 250,
-          "name": "ward_name",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 251,
-          "name": "district_name",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 263,
-          "name": "officer_last_name",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 264,
-          "name": "officer_other_names",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        },
-        {
-          "id": 265,
-          "name": "officer_code",
-          "type": "string",
-          "arrayItemType": "string",
-          "eval": false,
-          "nullable": true,
-          "pattern": "",
-          "expression": "",
-          "showOnlyNameType": false,
-          "testData": ""
-        }
-      ]
-    }
-  ],
-  "styles": [
-    {
-      "id": 33,
-      "name": "Table Header",
-      "bold": true,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "left",
-      "verticalAlignment": "middle",
-      "textColor": "#000000",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": "12",
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": "1",
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": "2",
-      "paddingTop": "2",
-      "paddingRight": "2",
-      "paddingBottom": "2"
-    },
-    {
-      "id": 34,
-      "name": "Table Content",
-      "bold": false,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "left",
-      "verticalAlignment": "middle",
-      "textColor": "#000000",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": "9",
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": "1",
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": "2",
-      "paddingTop": "2",
-      "paddingRight": "2",
-      "paddingBottom": "2"
-    },
-    {
-      "id": 35,
-      "name": "Table Content Highlight",
-      "bold": true,
-      "italic": false,
-      "underline": false,
-      "strikethrough": false,
-      "horizontalAlignment": "center",
-      "verticalAlignment": "middle",
-      "textColor": "#3d85c6",
-      "backgroundColor": "",
-      "font": "helvetica",
-      "fontSize": "9",
-      "lineSpacing": 1,
-      "borderColor": "#000000",
-      "borderWidth": "1",
-      "borderAll": false,
-      "borderLeft": false,
-      "borderTop": false,
-      "borderRight": false,
-      "borderBottom": false,
-      "paddingLeft": "2",
-      "paddingTop": "2",
-      "paddingRight": "2",
-      "paddingBottom": "2"
-    }
-  ],
-  "version": 3,
-  "documentProperties": {
-    "pageFormat": "A4",
-    "pageWidth": "",
-    "pageHeight": "",
-    "unit": "mm",
-    "orientation": "portrait",
-    "contentHeight": "",
-    "marginLeft": "10",
-    "marginTop": "10",
-    "marginRight": "10",
-    "marginBottom": "10",
-    "header": true,
-    "headerSize": "80",
-    "headerDisplay": "always",
-    "footer": true,
-    "footerSize": "30",
-    "footerDisplay": "always",
-    "patternLocale": "en",
-    "patternCurrencySymbol": "$"
-  }
-}
-"""
 
-
-# The CTE for recursive location isn't readily available in Django, leaving as raw SQL
-missing_photo_sql = f"""
-WITH {"" if settings.MSSQL else "RECURSIVE"} locations AS (SELECT "LocationId", "ParentLocationId"
+# The CTE for recursive location isn't readily available in Django, leaving as raw SQL.
+# Each parameter combination gets its own statement, so that every plan stays sargable:
+# the "all locations" case has no CTE at all and the subtree CTE is rooted on an indexed LocationId.
+_SUBTREE_CTE = f"""
+WITH {"" if settings.MSSQL else "RECURSIVE"} locations AS (SELECT "LocationId"
                    FROM "tblLocations"
-                   WHERE "ValidityTo" IS NULL
-                     AND ("LocationId" = %(location_id)s OR
-                          CASE WHEN %(location_id)s IS NULL THEN coalesce("ParentLocationId", 0) ELSE 0 END =
-                          coalesce(%(location_id)s, 0))
+                   WHERE "ValidityTo" IS NULL AND "LocationId" = %(location_id)s
                    UNION ALL
-                   SELECT l."LocationId", l."ParentLocationId"
+                   SELECT l."LocationId"
                    FROM "tblLocations" l
                             INNER JOIN locations ON locations."LocationId" = l."ParentLocationId"
                    WHERE l."ValidityTo" IS NULL)
-SELECT i."CHFID" as chf_id, i."LastName" as last_name, i."OtherNames" as other_names, i."Gender" as gender, 
-       i."IsHead" as is_head, d."DistrictName" as district_name, w."WardName" as ward_name,v."VillageName" as village_name,
-       o."Code" as officer_code, o."LastName" as officer_last_name, o."OtherNames" as officer_other_names,
-       {
-           "IIF(coalesce(CAST("'"'"WorksTo"'"'" AS DATE), DATEADD(DAY, 1, GETDATE())) <= CAST(GETDATE() AS DATE), 'N', 'A') OfficerStatus"
-           if settings.MSSQL else
-           "CASE WHEN COALESCE(CAST("'"'"WorksTo"'"'" AS DATE), CURRENT_DATE + INTERVAL '1 day') <= CAST(CURRENT_DATE AS DATE) THEN 'N' ELSE 'A' END AS OfficerStatus"
-       }
+"""
+
+_OFFICER_STATUS = (
+    "IIF(coalesce(CAST(o.\"WorksTo\" AS DATE), DATEADD(DAY, 1, GETDATE())) <= CAST(GETDATE() AS DATE), 'N', 'A')"
+    if settings.MSSQL else
+    "CASE WHEN COALESCE(CAST(o.\"WorksTo\" AS DATE), CURRENT_DATE + INTERVAL '1 day') <= CAST(CURRENT_DATE AS DATE)"
+    " THEN 'N' ELSE 'A' END"
+)
+
+
+def missing_photo_sql(subtree, by_officer):
+    """
+    Insurees of current families without a current photo file. With by_officer, only the families
+    having a current policy of that officer (EXISTS), otherwise one row per officer of the family
+    current policies (deduplicated on the narrow policy rows rather than with a GROUP BY on every column).
+    """
+    if by_officer:
+        officer_join = '''CROSS JOIN "tblOfficer" o'''
+        officer_filter = '''
+  AND o."OfficerID" = %(officer_id)s
+  AND EXISTS (SELECT 1 FROM "tblPolicy" p
+              WHERE p."FamilyID" = f."FamilyID" AND p."ValidityTo" IS NULL AND p."OfficerID" = o."OfficerID")'''
+    else:
+        officer_join = '''LEFT OUTER JOIN (SELECT DISTINCT "FamilyID", "OfficerID" FROM "tblPolicy" WHERE "ValidityTo" IS NULL) p
+                    ON p."FamilyID" = f."FamilyID"
+         LEFT OUTER JOIN "tblOfficer" o ON o."OfficerID" = p."OfficerID"'''
+        officer_filter = ""
+    return f"""{_SUBTREE_CTE if subtree else ""}
+SELECT i."CHFID" as chf_id, i."LastName" as last_name, i."OtherNames" as other_names, i."Gender" as gender,
+       i."IsHead" as is_head, d."LocationName" as district_name, w."LocationName" as ward_name,
+       v."LocationName" as village_name, o."Code" as officer_code, o."LastName" as officer_last_name,
+       o."OtherNames" as officer_other_names, {_OFFICER_STATUS} AS OfficerStatus
 FROM "tblFamilies" f
-         INNER JOIN locations ON locations."LocationId" = f."LocationId"
+         {'INNER JOIN locations ON locations."LocationId" = f."LocationId"' if subtree else ""}
          INNER JOIN "tblInsuree" i ON f."FamilyID" = i."FamilyID"
-         LEFT OUTER JOIN "tblPhotos" ph ON i."InsureeID" = ph."InsureeID"
-         LEFT OUTER JOIN "tblPolicy" p ON f."FamilyID" = p."FamilyID"
-         LEFT OUTER JOIN "tblOfficer" o ON p."OfficerID" = o."OfficerID"
-         INNER JOIN "tblVillages" v ON v."VillageId" = f."LocationId"
-         INNER JOIN "tblWards" w ON w."WardId" = v."WardId"
-         INNER JOIN "tblDistricts" d ON d."DistrictId" = w."DistrictId"
-         INNER JOIN "tblRegions" r ON r."RegionId" = d."Region"
-WHERE f."ValidityTo" Is NULL And i."ValidityTo" Is NULL And p."ValidityTo" Is NULL And ph."ValidityTo" Is NULL
-  And d."ValidityTo" Is NULL And w."ValidityTo" Is NULL And v."ValidityTo" Is NULL AND r."ValidityTo" IS NULL
-  AND ({"LEN" if settings.MSSQL else "length"}(RTRIM(LTRIM(ph."PhotoFileName"))) = 0
-          OR ph."PhotoFileName" IS NULL)
-  AND (p."OfficerID" = %(officer_id)s OR %(officer_id)s = 0)
-GROUP BY i."CHFID", i."LastName", i."OtherNames", i."Gender", i."IsHead", d."DistrictName", w."WardName",
-         v."VillageName", o."Code", o."LastName", o."OtherNames", o."WorksTo"
-ORDER BY d."DistrictName", o."Code", w."WardName", v."VillageName"
+         INNER JOIN "tblLocations" v ON v."LocationId" = f."LocationId" AND v."ValidityTo" IS NULL
+         INNER JOIN "tblLocations" w ON w."LocationId" = v."ParentLocationId" AND w."ValidityTo" IS NULL
+         INNER JOIN "tblLocations" d ON d."LocationId" = w."ParentLocationId" AND d."ValidityTo" IS NULL
+         INNER JOIN "tblLocations" r ON r."LocationId" = d."ParentLocationId" AND r."ValidityTo" IS NULL
+         {officer_join}
+WHERE f."ValidityTo" IS NULL AND i."ValidityTo" IS NULL
+  AND NOT EXISTS (SELECT 1 FROM "tblPhotos" ph
+                  WHERE ph."InsureeID" = i."InsureeID" AND ph."ValidityTo" IS NULL
+                    AND ph."PhotoFileName" IS NOT NULL AND RTRIM(LTRIM(ph."PhotoFileName")) <> ''){officer_filter}
+ORDER BY d."LocationName", o."Code", w."LocationName", v."LocationName"
 """
 
 
+def insuree_missing_photo_rows(user, officerId=0, locationId=0, **kwargs):
+    return iter_sql_rows(
+        missing_photo_sql(subtree=bool(locationId), by_officer=bool(officerId)),
+        {
+            "officer_id": officerId,
+            "location_id": locationId,
+        },
+    )
+
+
 def insuree_missing_photo_query(user, officerId=0, locationId=0, **kwargs):
-    with connection.cursor() as cur:
+    # The rows are fetched while ReportBro iterates them
+    def rows():
         try:
-            cur.execute(
-                missing_photo_sql,
-                {
-                    "officer_id": officerId,
-                    "location_id": locationId,
-                },
-            )
-            return {"data": dictfetchall(cur)}
+            yield from insuree_missing_photo_rows(user, officerId, locationId, **kwargs)
         except Exception as e:
             logger.exception("Error fetching missing photo query")
             raise e
 
-    logger.error("Missing photo query arrived at end of function")
-    return {"data": None}
+    return {"data": StreamedRows(rows)}
+
+
+def __getattr__(name):
+    # The ReportBro template, formerly a module constant, is read from reports/templates on first access
+    if name == "template":
+        from insuree.report import get_report_template_text
+        return get_report_template_text("insuree_missing_photo")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
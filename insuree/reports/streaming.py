@@ -0,0 +1,54 @@
+from django.db import connection
+
+REPORT_CHUNK_SIZE = 2000
+
+
+def iter_queryset_rows(queryset, chunk_size=REPORT_CHUNK_SIZE):
+    """
+    Rows of a values() queryset, fetched in chunks (server-side cursor where supported)
+    and never kept in the queryset cache.
+    """
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_sql_rows(sql, params, chunk_size=REPORT_CHUNK_SIZE):
+    """
+    Rows of a raw SQL query as dicts, fetched with fetchmany from a chunked (server-side) cursor
+    instead of dictfetchall.
+    """
+    with connection.chunked_cursor() as cur:
+        cur.execute(sql, params)
+        # Named (server-side) cursors only have a description once the first rows are fetched
+        rows = cur.fetchmany(chunk_size)
+        columns = [col[0] for col in cur.description]
+        while rows:
+            for row in rows:
+                yield dict(zip(columns, row))
+            rows = cur.fetchmany(chunk_size)
+
+
+
+class StreamedRows(list):
+    """
+    Report rows handed to ReportBro without holding them in memory. ReportBro only accepts list parameters and
+    only iterates them, copying each row into its own structures, so this list keeps no item: each iteration
+    runs rows_factory again and streams its chunked rows. len() is the number of rows of the last iteration.
+    Code reading the list storage directly (json.dumps, indexing) has to work on list(rows) instead.
+    """
+
+    def __init__(self, rows_factory):
+        super().__init__()
+        self._rows_factory = rows_factory
+        self._count = 0
+
+    def __iter__(self):
+        self._count = 0
+        for row in self._rows_factory():
+            self._count += 1
+            yield row
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        raise TypeError("streamed report rows can only be iterated")
@@ -15,11 +15,13 @@ from location.models import Location, LocationManager
 
 from insuree.apps import InsureeConfig
 from .models import FamilyMutation, InsureeMutation
+from .reference_data import get_reference_list
 from django.utils.translation import gettext as _
 from location.apps import LocationConfig
 from core.schema import OrderedDjangoFilterConnectionField, OfficerGQLType
 from core.gql_queries import ValidationMessageGQLType
 from policy.models import Policy
+from .services import family_member_count, policy_free_slots
 
 # We do need all queries and mutations in the namespace here.
 from .gql_queries import *  # lgtm [py/polluting-import]
@@ -61,6 +63,101 @@ class FamiliesConnectionField(OrderedDjangoFilterConnectionField):
         return OrderedDjangoFilterConnectionField.orderBy(qs, args)
 
 
+def insuree_filters(sender, user, **kwargs):
+    """
+    Filters of the insurees query, shared with the streaming export.
+    """
+    filters = []
+    additional_filter = kwargs.get('additional_filters', None)
+    chf_id = kwargs.get('chf_id')
+    chf_id_max_length = getattr(InsureeConfig, 'insuree_number_length')
+    if chf_id is not None:
+        if len(chf_id) > chf_id_max_length:
+            raise ValidationError(_("Insuree no. cannot be longer than 12 characters"))
+        if not re.match("^[a-zA-Z0-9]*$", chf_id):
+            raise ValidationError(_("Insuree no. can only contain letters and numbers"))
+        filters.append(Q(chf_id=chf_id))
+    if additional_filter:
+        filters_from_signal = _insuree_insuree_additional_filters(
+            sender=sender, additional_filter=additional_filter, user=user
+        )
+        filters.extend(filters_from_signal)
+    show_history = kwargs.get('show_history', False)
+    if not show_history and not kwargs.get('uuid', None):
+        filters += filter_validity(**kwargs)
+    client_mutation_id = kwargs.get("client_mutation_id", None)
+    if client_mutation_id:
+        filters.append(
+            Q(mutations__mutation__client_mutation_id=client_mutation_id))
+    parent_location = kwargs.get('parent_location')
+    if parent_location is not None:
+        parent_location_level = kwargs.get('parent_location_level')
+        if parent_location_level is None:
+            raise ValueError(
+                "Missing parentLocationLevel argument when filtering on parentLocation")
+        f = "uuid"
+        for i in range(len(LocationConfig.location_types) - parent_location_level - 1):
+            f = "parent__" + f
+        current_village = "current_village__" + f
+        family_location = "family__location__" + f
+        filters += [(Q(current_village__isnull=False) & Q(**{current_village: parent_location})) |
+                    (Q(current_village__isnull=True) & Q(**{family_location: parent_location}))]
+
+    if not user._u.is_imis_admin and (kwargs.get('ignore_location') == False or kwargs.get('ignore_location') is None):
+        # Limit the list by the logged in user location mapping
+        filters += [Q(LocationManager().build_user_location_filter_query(user._u, prefix='current_village__parent__parent', loc_types=['D']) |
+                    LocationManager().build_user_location_filter_query(user._u, prefix='family__location__parent__parent', loc_types=['D']))]
+    return filters
+
+
+def family_filters(sender, user, **kwargs):
+    """
+    Filters of the families query, shared with the streaming export.
+    """
+    filters = []
+    additional_filter = kwargs.get('additional_filter', None)
+    if additional_filter:
+        filters_from_signal = _family_additional_filters(
+            sender=sender, additional_filter=additional_filter, user=user
+        )
+        filters.extend(filters_from_signal)
+
+    officer = kwargs.get('officer', None)
+    if officer:
+        officer_policies_families = Policy.objects.filter(
+            officer__uuid=(officer)).values_list('family', flat=True)
+        filters.append(Q(id__in=officer_policies_families))
+
+    null_as_false_poverty = kwargs.get('null_as_false_poverty')
+    if null_as_false_poverty is not None:
+        filters += [Q(poverty=True)] if null_as_false_poverty else [
+            Q(poverty=False) | Q(poverty__isnull=True)]
+    show_history = kwargs.get('show_history', False)
+    if not show_history:
+        filters += filter_validity(**kwargs)
+    client_mutation_id = kwargs.get("client_mutation_id", None)
+    if client_mutation_id:
+        filters.append(
+            Q(mutations__mutation__client_mutation_id=client_mutation_id))
+    parent_location = kwargs.get('parent_location')
+    if parent_location is not None:
+        parent_location_level = kwargs.get('parent_location_level')
+        if parent_location_level is None:
+            raise NotImplementedError(
+                "Missing parentLocationLevel argument when filtering on parentLocation")
+        f = "uuid"
+        for i in range(len(LocationConfig.location_types) - parent_location_level - 1):
+            f = "parent__" + f
+        f = "location__" + f
+        filters += [Q(**{f: parent_location})]
+
+    # Limit the list by the logged in user location mapping
+    if not user._u.is_imis_admin:
+        filters += [LocationManager().build_user_location_filter_query(user._u,
+                                                                       prefix='location__parent__parent', loc_types=['D'])]
+    return filters
+
+
 class Query(ExportableQueryMixin, graphene.ObjectType):
     exportable_fields = ['insurees']
 
@@ -118,37 +215,54 @@ class Query(ExportableQueryMixin, graphene.ObjectType):
     insuree_number_validity = graphene.Field(
         ValidationMessageGQLType,
         insuree_number=graphene.String(required=True),
-        description="Checks that the specified insuree number is valid"
+        device=graphene.String(),
+        description="Checks that the specified insuree number is valid (for the enrollment device if specified)"
+    )
+    reserved_insuree_numbers = graphene.List(
+        graphene.String,
+        device=graphene.String(),
+        officer_id=graphene.Int(),
+        description="Insuree numbers reserved (reserveInsureeNumbers) for the device and/or the officer"
+                    " and not yet assigned to an insuree, at least one of them is required"
     )
 
     def resolve_insuree_number_validity(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_insurees_perms):
             raise PermissionDenied(_("unauthorized"))
-        errors = validate_insuree_number(kwargs['insuree_number'])
+        errors = validate_insuree_number(kwargs['insuree_number'], device=kwargs.get('device'),
+                                         officer_id=getattr(info.context.user, "officer_id", None))
         if errors:
             return ValidationMessageGQLType(False, errors[0]['errorCode'], errors[0]['message'])
         else:
             return ValidationMessageGQLType(True, 0, "")
 
+    def resolve_reserved_insuree_numbers(self, info, **kwargs):
+        if not info.context.user.has_perms(InsureeConfig.gql_mutation_create_insurees_perms):
+            raise PermissionDenied(_("unauthorized"))
+        # the whole pool of all devices is not listed at once
+        if not kwargs.get('device') and not kwargs.get('officer_id'):
+            raise ValidationError(_("insuree.number_pool.device_or_officer_required"))
+        return list(InsureeNumberPoolService.available_numbers(kwargs.get('device'), kwargs.get('officer_id')))
+
     def resolve_can_add_insuree(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_insuree_perms):
             raise PermissionDenied(_("unauthorized"))
-        family = Family.objects.get(id=kwargs.get('family_id'))
+        # Same rule as InsureePolicyService.add_insuree_policies, products and families in one query
+        policies = Policy.objects\
+            .filter(family_id=kwargs.get('family_id'), validity_to__isnull=True)\
+            .exclude(status__in=[Policy.STATUS_EXPIRED, Policy.STATUS_SUSPENDED])\
+            .select_related('product', 'family')
         warnings = []
-        policies = family.policies\
-            .filter(validity_to__isnull=True)\
-            .exclude(status__in=[Policy.STATUS_EXPIRED, Policy.STATUS_SUSPENDED])
         for policy in policies:
-            if not policy.can_add_insuree():
+            member_count = family_member_count(policy.family)
+            if policy_free_slots(policy, member_count) <= 0:
                 warnings.append(
                     _("insuree.validation.policy_above_max_members")
                     % {
                         "product_code": policy.product.code,
                         "start_date": policy.start_date,
                         "max": policy.product.max_members,
-                        "count": family.members.filter(
-                            validity_to__isnull=True
-                        ).count(),
+                        "count": member_count,
                     }
                 )
         return warnings
@@ -156,52 +270,12 @@ class Query(ExportableQueryMixin, graphene.ObjectType):
     def resolve_insuree_genders(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_insuree_perms):
             raise PermissionDenied(_("unauthorized"))
-        return Gender.objects.order_by('sort_order').all()
+        return get_reference_list(Gender)
 
     def resolve_insurees(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_insurees_perms):
             raise PermissionDenied(_("unauthorized"))
-        filters = []
-        additional_filter = kwargs.get('additional_filters', None)
-        chf_id = kwargs.get('chf_id')
-        chf_id_max_length = getattr(InsureeConfig, 'insuree_number_length')
-        if chf_id is not None:
-            if len(chf_id) > chf_id_max_length:
-                raise ValidationError(_("Insuree no. cannot be longer than 12 characters"))
-            if not re.match("^[a-zA-Z0-9]*$", chf_id):
-                raise ValidationError(_("Insuree no. can only contain letters and numbers"))
-            filters.append(Q(chf_id=chf_id))
-        if additional_filter:
-            filters_from_signal = _insuree_insuree_additional_filters(
-                sender=self, additional_filter=additional_filter, user=info.context.user
-            )
-            filters.extend(filters_from_signal)
-        show_history = kwargs.get('show_history', False)
-        if not show_history and not kwargs.get('uuid', None):
-            filters += filter_validity(**kwargs)
-        client_mutation_id = kwargs.get("client_mutation_id", None)
-        if client_mutation_id:
-            filters.append(
-                Q(mutations__mutation__client_mutation_id=client_mutation_id))
-        parent_location = kwargs.get('parent_location')
-        if parent_location is not None:
-            parent_location_level = kwargs.get('parent_location_level')
-            if parent_location_level is None:
-                raise ValueError(
-                    "Missing parentLocationLevel argument when filtering on parentLocation")
-            f = "uuid"
-            for i in range(len(LocationConfig.location_types) - parent_location_level - 1):
-                f = "parent__" + f
-            current_village = "current_village__" + f
-            family_location = "family__location__" + f
-            filters += [(Q(current_village__isnull=False) & Q(**{current_village: parent_location})) |
-                        (Q(current_village__isnull=True) & Q(**{family_location: parent_location}))]
-
-        if not info.context.user._u.is_imis_admin and (kwargs.get('ignore_location') == False or kwargs.get('ignore_location') is None):
-            # Limit the list by the logged in user location mapping
-            filters += [Q(LocationManager().build_user_location_filter_query(info.context.user._u, prefix='current_village__parent__parent', loc_types=['D']) |
-                        LocationManager().build_user_location_filter_query(info.context.user._u, prefix='family__location__parent__parent', loc_types=['D']))]
-
+        filters = insuree_filters(self, info.context.user, **kwargs)
         return gql_optimizer.query(Insuree.objects.filter(*filters).all(), info)
 
     def resolve_family_members(self, info, **kwargs):
@@ -216,79 +290,38 @@ class Query(ExportableQueryMixin, graphene.ObjectType):
     def resolve_educations(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_families_perms):
             raise PermissionDenied(_("unauthorized"))
-        return Education.objects.order_by('sort_order').all()
+        return get_reference_list(Education)
 
     def resolve_professions(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_families_perms):
             raise PermissionDenied(_("unauthorized"))
-        return Profession.objects.order_by('sort_order').all()
+        return get_reference_list(Profession)
 
     def resolve_identification_types(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_families_perms):
             raise PermissionDenied(_("unauthorized"))
-        return IdentificationType.objects.order_by('sort_order').all()
+        return get_reference_list(IdentificationType)
 
     def resolve_confirmation_types(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_families_perms):
             raise PermissionDenied(_("unauthorized"))
-        return ConfirmationType.objects.order_by('sort_order').all()
+        return get_reference_list(ConfirmationType)
 
     def resolve_relations(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_families_perms):
             raise PermissionDenied(_("unauthorized"))
-        return Relation.objects.order_by('sort_order').all()
+        return get_reference_list(Relation)
 
     def resolve_family_types(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_families_perms):
             raise PermissionDenied(_("unauthorized"))
-        return FamilyType.objects.order_by('sort_order').all()
+        return get_reference_list(FamilyType)
 
     def resolve_families(self, info, **kwargs):
         if not info.context.user.has_perms(InsureeConfig.gql_query_families_perms):
             raise PermissionDenied(_("unauthorized"))
 
-        filters = []
-        additional_filter = kwargs.get('additional_filter', None)
-        if additional_filter:
-            filters_from_signal = _family_additional_filters(
-                sender=self, additional_filter=additional_filter, user=info.context.user
-            )
-            filters.extend(filters_from_signal)
-
-        officer = kwargs.get('officer', None)
-        if officer:
-            officer_policies_families = Policy.objects.filter(
-                officer__uuid=(officer)).values_list('family', flat=True)
-            filters.append(Q(id__in=officer_policies_families))
-
-        null_as_false_poverty = kwargs.get('null_as_false_poverty')
-        if null_as_false_poverty is not None:
-            filters += [Q(poverty=True)] if null_as_false_poverty else [
-                Q(poverty=False) | Q(poverty__isnull=True)]
-        show_history = kwargs.get('show_history', False)
-        if not show_history:
-            filters += filter_validity(**kwargs)
-        client_mutation_id = kwargs.get("client_mutation_id", None)
-        if client_mutation_id:
-            filters.append(
-                Q(mutations__mutation__client_mutation_id=client_mutation_id))
-        parent_location = kwargs.get('parent_location')
-        if parent_location is not None:
-            parent_location_level = kwargs.get('parent_location_level')
-            if parent_location_level is None:
-                raise NotImplementedError(
-                    "Missing parentLocationLevel argument when filtering on parentLocation")
-            f = "uuid"
-            for i in range(len(LocationConfig.location_types) - parent_location_level - 1):
-                f = "parent__" + f
-            f = "location__" + f
-            filters += [Q(**{f: parent_location})]
-
-        # Limit the list by the logged in user location mapping
-        if not info.context.user._u.is_imis_admin:
-            filters += [LocationManager().build_user_location_filter_query(info.context.user._u,
-                                                                           prefix='location__parent__parent', loc_types=['D'])]
-
+        filters = family_filters(self, info.context.user, **kwargs)
         # Duplicates cannot be removed with distinct, as TEXT field is not comparable
         ids = Family.objects.filter(*filters).values_list('id')
         dinstinct_queryset = Family.objects.filter(id__in=ids)
@@ -340,57 +373,67 @@ class Mutation(graphene.ObjectType):
     remove_insurees = RemoveInsureesMutation.Field()
     set_family_head = SetFamilyHeadMutation.Field()
     change_insuree_family = ChangeInsureeFamilyMutation.Field()
+    split_family = SplitFamilyMutation.Field()
+    merge_families = MergeFamiliesMutation.Field()
+    reserve_insuree_numbers = ReserveInsureeNumbersMutation.Field()
+
+
+def _link_to_mutation(mutation_model, object_field, queryset, mutation_log_id):
+    object_ids = queryset.values_list('id', flat=True)
+    mutation_model.objects.bulk_create([
+        mutation_model(**{object_field: object_id, 'mutation_id': mutation_log_id})
+        for object_id in object_ids
+    ])
+
+
+def _mutation_uuids(kwargs):
+    uuids = kwargs['data'].get('uuids', [])
+    if not uuids:
+        uuid = kwargs['data'].get('uuid', None)
+        uuids = [uuid] if uuid else []
+    return uuids
 
 
 def on_family_mutation(kwargs, k='uuid'):
-    family_uuid = kwargs['data'].get('uuid', None)
+    family_uuid = kwargs['data'].get(k, None)
     if not family_uuid:
         return []
-    impacted_family = Family.objects.filter(Q(uuid=(family_uuid))).first()
-    if impacted_family is None:
-        return []
-    FamilyMutation.objects.create(
-        family=impacted_family, mutation_id=kwargs['mutation_log_id'])
+    _link_to_mutation(FamilyMutation, 'family_id', Family.objects.filter(uuid=family_uuid),
+                      kwargs['mutation_log_id'])
     return []
 
 
 def on_families_mutation(kwargs):
-    uuids = kwargs['data'].get('uuids', [])
-    if not uuids:
-        uuid = kwargs['data'].get('uuid', None)
-        uuids = [uuid] if uuid else []
+    uuids = _mutation_uuids(kwargs)
     if not uuids:
         return []
-    impacted_families = Family.objects.filter(uuid__in=uuids).all()
-    for family in impacted_families:
-        FamilyMutation.objects.create(
-            family=family, mutation_id=kwargs['mutation_log_id'])
+    _link_to_mutation(FamilyMutation, 'family_id', Family.objects.filter(uuid__in=uuids),
+                      kwargs['mutation_log_id'])
     return []
 
 
 def on_insuree_mutation(kwargs, k='uuid'):
-    insuree_uuid = kwargs['data'].get('uuid', None)
+    insuree_uuid = kwargs['data'].get(k, None)
     if not insuree_uuid:
         return []
-    impacted_insuree = Insuree.objects.filter(Q(uuid=(insuree_uuid))).first()
-    if impacted_insuree is None:
-        return []
-    InsureeMutation.objects.create(
-        insuree=impacted_insuree, mutation_id=kwargs['mutation_log_id'])
+    _link_to_mutation(InsureeMutation, 'insuree_id', Insuree.objects.filter(uuid=insuree_uuid),
+                      kwargs['mutation_log_id'])
     return []
 
 
 def on_insurees_mutation(kwargs):
-    uuids = kwargs['data'].get('uuids', [])
-    if not uuids:
-        uuid = kwargs['data'].get('uuid', None)
-        uuids = [uuid] if uuid else []
+    uuids = _mutation_uuids(kwargs)
     if not uuids:
         return []
-    impacted_insurees = Insuree.objects.filter(uuid__in=uuids).all()
-    for insuree in impacted_insurees:
-        InsureeMutation.objects.create(
-            insuree=insuree, mutation_id=kwargs['mutation_log_id'])
+    _link_to_mutation(InsureeMutation, 'insuree_id', Insuree.objects.filter(uuid__in=uuids),
+                      kwargs['mutation_log_id'])
+    return []
+
+
+def on_merge_families_mutation(kwargs):
+    uuids = [uuid for uuid in [kwargs['data'].get('uuid', None), *kwargs['data'].get('family_uuids', [])] if uuid]
+    _link_to_mutation(FamilyMutation, 'family_id', Family.objects.filter(uuid__in=uuids),
+                      kwargs['mutation_log_id'])
     return []
 
 
@@ -417,6 +460,8 @@ def on_mutation(sender, **kwargs):
         RemoveInsureesMutation._mutation_class: on_family_and_insurees_mutation,
         SetFamilyHeadMutation._mutation_class: on_family_mutation,
         ChangeInsureeFamilyMutation._mutation_class: on_family_and_insuree_mutation,
+        SplitFamilyMutation._mutation_class: on_family_and_insurees_mutation,
+        MergeFamiliesMutation._mutation_class: on_merge_families_mutation,
     }.get(sender._mutation_class, lambda x: [])(kwargs)
 
 
@@ -7,18 +7,28 @@ from importlib import import_module
 from os import path
 
 from core.apps import CoreConfig
-from django.db.models import Q
+from django.db import transaction, IntegrityError
+from django.db.models import Q, Max, Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.utils.dateparse import parse_date
 from django.utils.translation import gettext as _
 
 from core.signals import register_service_signal
 from insuree.apps import InsureeConfig
 from insuree.models import (InsureePhoto, PolicyRenewalDetail, Insuree, Family, InsureePolicy, InsureeStatus,
-                            InsureeStatusReason)
+                            InsureeStatusReason, InsureeNumberReservation)
+from insuree.reference_data import get_insuree_status_reason
+from insuree.cache import bump_data_version_on_commit, INSUREE_DATA
+from insuree.coverage import refresh_insuree_coverage_on_commit
 from django.core.exceptions import ValidationError
 from core.models import filter_validity, resolved_id_reference
 
 logger = logging.getLogger(__name__)
 
+# Keeps IN (...) lists below the MSSQL limit of 2100 parameters per statement
+BULK_CHUNK_SIZE = 1000
+
 
 def create_insuree_renewal_detail(policy_renewal):
     from core import datetime, datetimedelta
@@ -63,13 +73,53 @@ def custom_insuree_number_validation(insuree_number):
                  "message": _("validator_function_not_found")}]
 
 
-def validate_insuree_number(insuree_number, insuree_uuid=None):
-    query = Insuree.objects.filter(
-        chf_id=insuree_number, validity_to__isnull=True)
-    insuree = query.first()
-    if insuree_uuid and insuree and uuid.UUID(insuree.uuid) != uuid.UUID(insuree_uuid):
-        return [{"errorCode": InsureeConfig.validation_code_taken_insuree_number,
-                 "message": "Insuree number has to be unique, %s exists in system" % insuree_number}]
+# Filtered unique index on the current CHF IDs (migration 0023), arbitrating concurrent enrollments
+INSUREE_NUMBER_UNIQUE_INDEX = "ux_tblInsuree_CHFID_current"
+
+
+def taken_insuree_number(insuree_number):
+    return [{"errorCode": InsureeConfig.validation_code_taken_insuree_number,
+             "message": "Insuree number has to be unique, %s exists in system" % insuree_number}]
+
+
+def is_taken_insuree_number_error(exc):
+    return INSUREE_NUMBER_UNIQUE_INDEX.lower() in str(exc).lower()
+
+
+def reserved_insuree_number(insuree_number, device=None, officer_id=None):
+    """
+    Errors if the number is reserved (InsureeNumberPoolService) for another device or officer and
+    not yet assigned to an insuree
+    """
+    reservation = InsureeNumberReservation.objects \
+        .filter(insuree_number=insuree_number) \
+        .annotate(assigned=Exists(Insuree.objects.filter(chf_id=OuterRef("insuree_number")))) \
+        .filter(assigned=False) \
+        .first()
+    if reservation and (reservation.device and reservation.device != device
+                        or reservation.officer_id and reservation.officer_id != officer_id):
+        return [{"errorCode": InsureeConfig.validation_code_reserved_insuree_number,
+                 "message": "Insuree number %s is reserved for another device or officer" % insuree_number}]
+    return []
+
+
+def validate_insuree_number(insuree_number, insuree_uuid=None, check_unique=True, device=None, officer_id=None,
+                            check_reservation=True):
+    """
+    With check_unique=False, the uniqueness is left to the database unique index (no query):
+    callers then have to handle the IntegrityError, see is_taken_insuree_number_error().
+    Numbers reserved for a device or officer are only valid for that device (device) or officer (officer_id).
+    """
+    if check_unique:
+        query = Insuree.objects.filter(
+            chf_id=insuree_number, validity_to__isnull=True)
+        insuree = query.first()
+        if insuree_uuid and insuree and uuid.UUID(insuree.uuid) != uuid.UUID(insuree_uuid):
+            return taken_insuree_number(insuree_number)
+    if check_reservation and insuree_number:
+        errors = reserved_insuree_number(insuree_number, device, officer_id)
+        if errors:
+            return errors
 
     if InsureeConfig.get_insuree_number_validator():
         return custom_insuree_number_validation(insuree_number)
@@ -126,6 +176,25 @@ def invalid_checksum():
              "message": "Invalid checksum"}]
 
 
+def make_insuree_number(sequence, length, modulo_root=None):
+    """
+    Insuree number of the given sequence, zero padded to length and ending with the check digit of
+    validate_insuree_number() when a modulo root is configured. None if the sequence has no valid
+    check digit (modulo roots above 10 yield remainders of two digits).
+    """
+    if not modulo_root:
+        return str(sequence).zfill(length)
+    base = str(sequence).zfill(length - 1)
+    if modulo_root == 10:
+        return next(base + str(digit) for digit in range(10) if is_modulo_10_number_valid(base + str(digit)))
+    check_digit = sequence % modulo_root
+    return base + str(check_digit) if check_digit < 10 else None
+
+
+def insuree_number_sequence(insuree_number, modulo_root=None):
+    return int(insuree_number[:-1] if modulo_root else insuree_number)
+
+
 def reset_insuree_before_update(insuree):
     insuree.family = None
     insuree.chf_id = None
@@ -263,7 +332,7 @@ def validate_worker_data(insuree):
         raise ValidationError(_("worker_requires_last_name"))
 
 
-def validate_insuree(insuree):
+def validate_insuree(insuree, check_unique=True, device=None, officer_id=None, check_reservation=True):
     """
     This function checks if the CHF ID is valid for the insuree or worker and
     then performs additional validation based on the type of insuree.
@@ -271,8 +340,13 @@ def validate_insuree(insuree):
     Note:
         - If InsureeConfig.insuree_as_worker is True, the function performs worker data validation.
         - If InsureeConfig.insuree_as_worker is False, the function performs insuree data validation.
+        - If check_unique is False, the CHF ID uniqueness is left to the database unique index.
+        - A CHF ID reserved for a device or officer is only accepted from that device or officer.
+        - If check_reservation is False (the CHF ID of an existing insuree is unchanged), the reservations
+          are not looked up.
     """
-    errors = validate_insuree_number(insuree.chf_id, insuree.uuid)
+    errors = validate_insuree_number(insuree.chf_id, insuree.uuid, check_unique=check_unique,
+                                     device=device, officer_id=officer_id, check_reservation=check_reservation)
     if errors:
         raise ValidationError("invalid_insuree_number")
 
@@ -282,6 +356,141 @@ def validate_insuree(insuree):
         validate_insuree_data(insuree)
 
 
+def chunked(values, size=BULK_CHUNK_SIZE):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def refresh_family_member_count(family_ids=None):
+    """
+    Recomputes Family.member_count of the current rows of the families (of all families without ids)
+    with set-based UPDATE statements. Returns the number of families updated.
+    """
+    members = Insuree.objects.filter(family_id=OuterRef("id"), validity_to__isnull=True) \
+        .order_by().values("family_id").annotate(count=Count("id")).values("count")
+    member_count = Coalesce(Subquery(members), 0)
+    families = Family.objects.filter(validity_to__isnull=True)
+    if family_ids is None:
+        return families.update(member_count=member_count)
+    updated = 0
+    for ids in chunked({family_id for family_id in family_ids if family_id}):
+        updated += families.filter(id__in=ids).update(member_count=member_count)
+    return updated
+
+
+def family_member_count(family):
+    # Families written outside of the ORM (legacy stored procedures) have no count yet
+    if family.member_count is None:
+        return family.members.filter(validity_to__isnull=True).count()
+    return family.member_count
+
+
+def policy_active_insurees(policies, now):
+    """
+    (policy_id, insuree_id) of the insurees still covered by the policies: current insuree policies that are
+    neither expired nor cancelled (see InsureeService.cancel_policies), one query per chunk
+    """
+    active = set()
+    for ids in chunked(policy.id for policy in policies):
+        active.update(InsureePolicy.objects
+                      .filter(policy_id__in=ids, validity_to__isnull=True)
+                      .filter(Q(expiry_date__isnull=True) | Q(expiry_date__gt=now))
+                      .values_list("policy_id", "insuree_id"))
+    return active
+
+
+def policy_free_slots(policy, member_count):
+    """
+    In memory Policy.can_add_insuree() (free slots > 0), for a policy loaded with its product: the members
+    a family of member_count current members can still gain within the max members of the product
+    """
+    return policy.product.max_members - member_count
+
+
+def _is_history_copy(instance):
+    # save_history copies are closed rows, they never count as members
+    return instance.legacy_id is not None and instance.validity_to is not None
+
+
+def _on_insuree_saving(sender, instance, **kwargs):
+    # The family the row leaves (family change, removal) is refreshed too
+    if _is_history_copy(instance):
+        return
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded is not None and "family_id" in loaded:
+        instance._previous_family_id = loaded["family_id"]
+    elif instance.pk:
+        instance._previous_family_id = Insuree.objects.filter(pk=instance.pk) \
+            .values_list("family_id", flat=True).first()
+
+
+def _on_insuree_saved(sender, instance, created=False, **kwargs):
+    if _is_history_copy(instance):
+        return
+    if not created and not instance.has_changed(["family_id", "validity_to"]):
+        return
+    refresh_family_member_count({instance.family_id, getattr(instance, "_previous_family_id", None)})
+
+
+def _on_insuree_deleted(sender, instance, **kwargs):
+    refresh_family_member_count({instance.family_id})
+
+
+def bind_member_count_signals():
+    """
+    Row by row insuree writes that add, move or close a member refresh the member count of their family
+    (and of the family they leave) through signals, history copies and other updates are skipped.
+    The set-based writes of InsureeService call refresh_family_member_count explicitly.
+    """
+    pre_save.connect(_on_insuree_saving, sender=Insuree, dispatch_uid="insuree_member_count_insuree_pre_save")
+    post_save.connect(_on_insuree_saved, sender=Insuree, dispatch_uid="insuree_member_count_insuree_save")
+    post_delete.connect(_on_insuree_deleted, sender=Insuree, dispatch_uid="insuree_member_count_insuree_delete")
+
+
+def filter_by_uuids(queryset, uuids):
+    """
+    Case insensitive uuid__in lookup, the lookup of uuids throughout the bulk services. The stored uuids are
+    upper or lower case depending on the client that wrote them: both forms of each uuid are looked up, which
+    keeps the lookup on the uuid index.
+    """
+    values = {str(value) for value in uuids}
+    return queryset.filter(uuid__in={form for value in values for form in (value.upper(), value.lower())})
+
+
+def build_history_copies(instances, now):
+    """
+    Same copies as VersionedModel.save_history() but without saving them, so that they can be
+    written with a single bulk_create.
+    """
+    copies = []
+    for instance in instances:
+        model = type(instance)
+        values = {field.attname: getattr(instance, field.attname) for field in model._meta.concrete_fields}
+        values[model._meta.pk.attname] = None
+        if "uuid" in values:
+            values["uuid"] = str(uuid.uuid4())
+        values["validity_to"] = now
+        values["legacy_id"] = instance.id
+        copies.append(model(**values))
+    return copies
+
+
+def bulk_save_history(model, instances, now):
+    if instances:
+        model.objects.bulk_create(build_history_copies(instances, now), batch_size=BULK_CHUNK_SIZE)
+
+
+def bulk_delete_history(model, instances, now):
+    """
+    Set-based VersionedModel.delete_history(): history copies are inserted in bulk and the current
+    rows are closed with chunked UPDATE statements.
+    """
+    bulk_save_history(model, instances, now)
+    for ids in chunked(instance.id for instance in instances):
+        model.objects.filter(id__in=ids).update(validity_from=now, validity_to=now)
+
+
 class InsureeService:
     def __init__(self, user):
         self.user = user
@@ -289,6 +498,8 @@ class InsureeService:
     @register_service_signal('insuree_service.create_or_update')
     def create_or_update(self, data):
         photo_data = data.pop('photo', None)
+        # enrollment device, which may hold a reservation of the insuree number
+        device = data.pop('device', None)
         from core import datetime
         now = datetime.datetime.now()
         data['audit_user_id'] = self.user.id_for_audit
@@ -299,8 +510,7 @@ class InsureeService:
         if InsureeConfig.is_insuree_photo_required and photo_data is None:
             raise ValidationError(_("mutation.insuree.no_required_photo"))
         if status in [InsureeStatus.INACTIVE, InsureeStatus.DEAD]:
-            status_reason = InsureeStatusReason.objects.get(code=data.get('status_reason', None),
-                                                            validity_to__isnull=True)
+            status_reason = get_insuree_status_reason(data.get('status_reason', None))
             if status_reason is None or status_reason.status_type != status:
                 raise ValidationError(_("mutation.insuree.wrong_status"))
             data['status_reason'] = status_reason
@@ -316,30 +526,95 @@ class InsureeService:
             raise ValidationError("mutation.insuree.fsp_required")
 
         insuree = Insuree(**data)
-        return self._create_or_update(insuree, photo_data)
+        return self._create_or_update(insuree, photo_data, device)
 
     def disable_policies_of_insuree(self, insuree, status_date):
-        policies_to_cancel = InsureePolicy.objects.filter(insuree=insuree.id, validity_to__isnull=True).all()
-        for policy in policies_to_cancel:
-            policy.expiry_date = status_date
-            policy.save()
+        self._disable_insuree_policies([insuree.id], status_date)
 
     def activate_policies_of_insuree(self, insuree, audit_user_id):
+        self._activate_insuree_policies([insuree], audit_user_id)
+
+    @staticmethod
+    def _disable_insuree_policies(insuree_ids, status_date):
+        from core import datetime
+        now = datetime.datetime.now()
+        for ids in chunked(insuree_ids):
+            # validity_from is the change marker of the delta sync
+            InsureePolicy.objects \
+                .filter(insuree_id__in=ids, validity_to__isnull=True) \
+                .filter(Q(expiry_date__isnull=True) | Q(expiry_date__gt=status_date)) \
+                .update(expiry_date=status_date, validity_from=now)
+        refresh_insuree_coverage_on_commit(insuree_ids)
+
+    @staticmethod
+    def _activate_insuree_policies(insurees, audit_user_id):
+        """
+        Attaches the insurees to the current, not yet expired, policies of their family.
+        The policies are loaded in one query and the insuree policies written with one bulk_create.
+        """
         from core import datetime
         now = datetime.date.today()
+        validity_from = datetime.datetime.now()
         from policy.models import Policy
-        policies_to_activate = Policy.objects.filter(family=insuree.family, validity_to__isnull=True)
-        for policy in policies_to_activate:
-            if policy.expiry_date >= now:
-                current_policy_dict = {"effective_date": now, "expiry_date": policy.expiry_date,
-                                       "audit_user_id": audit_user_id, "offline": policy.offline,
-                                       "start_date": policy.start_date, "policy": policy, "insuree": insuree,
-                                       "enrollment_date": policy.enroll_date}
-                current_policy = InsureePolicy(**current_policy_dict)
-                current_policy.save()
-
-    def _create_or_update(self, insuree, photo_data=None):
-        validate_insuree(insuree)
+        family_ids = {insuree.family_id for insuree in insurees if insuree.family_id}
+        policies_by_family = {}
+        for ids in chunked(family_ids):
+            for policy in Policy.objects.filter(family_id__in=ids, validity_to__isnull=True, expiry_date__gte=now):
+                policies_by_family.setdefault(policy.family_id, []).append(policy)
+        insuree_policies = [
+            InsureePolicy(effective_date=now, expiry_date=policy.expiry_date, audit_user_id=audit_user_id,
+                          offline=policy.offline, start_date=policy.start_date, policy=policy, insuree=insuree,
+                          enrollment_date=policy.enroll_date, validity_from=validity_from)
+            for insuree in insurees
+            for policy in policies_by_family.get(insuree.family_id, [])
+        ]
+        InsureePolicy.objects.bulk_create(insuree_policies, batch_size=BULK_CHUNK_SIZE)
+        refresh_insuree_coverage_on_commit(insuree.id for insuree in insurees)
+
+    def change_status_bulk(self, insuree_ids, status, status_reason=None, status_date=None):
+        """
+        Changes the status of many insurees at once (e.g. from a civil registry death feed).
+        Only insurees whose status actually changes are touched, so calling it twice is harmless.
+        Their insuree policies are expired (INACTIVE/DEAD) or re-attached to the current family
+        policies (ACTIVE) with set-based statements.
+        The status reason can be given as a code or as an already loaded InsureeStatusReason.
+        Returns the number of insurees updated.
+        """
+        if status not in [choice[0] for choice in InsureeStatus.choices]:
+            raise ValidationError(_("mutation.insuree.wrong_status"))
+        from core import datetime
+        now = datetime.datetime.now()
+        status_date = status_date or now.date()
+        if status in [InsureeStatus.INACTIVE, InsureeStatus.DEAD]:
+            if not isinstance(status_reason, InsureeStatusReason):
+                status_reason = get_insuree_status_reason(status_reason)
+            if status_reason is None or status_reason.status_type != status:
+                raise ValidationError(_("mutation.insuree.wrong_status"))
+        else:
+            status_reason = None
+        audit_user_id = self.user.id_for_audit
+        updated = 0
+        with transaction.atomic():
+            for ids in chunked(insuree_ids):
+                insurees = list(Insuree.objects
+                                .filter(id__in=ids, validity_to__isnull=True)
+                                .exclude(status=status))
+                if not insurees:
+                    continue
+                changed_ids = [insuree.id for insuree in insurees]
+                bulk_save_history(Insuree, insurees, now)
+                Insuree.objects.filter(id__in=changed_ids).update(
+                    status=status, status_reason=status_reason, status_date=status_date,
+                    validity_from=now, audit_user_id=audit_user_id)
+                if status_reason:
+                    self._disable_insuree_policies(changed_ids, status_date)
+                else:
+                    self._activate_insuree_policies(insurees, audit_user_id)
+                updated += len(insurees)
+            bump_data_version_on_commit(INSUREE_DATA)
+        return updated
+
+    def _create_or_update(self, insuree, photo_data=None, device=None):
         if insuree.id:
             filters = Q(id=insuree.id)
             # remove it from now3 to avoid id at creation
@@ -350,10 +625,21 @@ class InsureeService:
             filters = None
         existing_insuree = Insuree.objects.filter(filters).prefetch_related(
             "photo").first() if filters else None
-        if existing_insuree:
-            existing_insuree.save_history()
-            insuree.id = existing_insuree.id
-        insuree.save()
+        # The CHF ID uniqueness is enforced by the unique index, without a query per enrollment. An unchanged
+        # CHF ID is assigned to this insuree already, it cannot be reserved for someone else.
+        validate_insuree(insuree, check_unique=False, device=device, officer_id=getattr(self.user, "officer_id", None),
+                         check_reservation=existing_insuree is None or existing_insuree.chf_id != insuree.chf_id)
+        try:
+            with transaction.atomic():
+                if existing_insuree:
+                    existing_insuree.save_history()
+                    insuree.id = existing_insuree.id
+                insuree.save()
+        except IntegrityError as exc:
+            if not is_taken_insuree_number_error(exc):
+                raise
+            error = taken_insuree_number(insuree.chf_id)[0]
+            raise ValidationError(error["message"], code=error["errorCode"])
         if photo_data:
             photo = handle_insuree_photo(self.user, insuree.validity_from, insuree, photo_data)
             if photo:
@@ -364,8 +650,10 @@ class InsureeService:
 
     def remove(self, insuree):
         try:
+            from core import datetime
             insuree.save_history()
             insuree.family = None
+            insuree.validity_from = datetime.datetime.now()
             insuree.save()
             return []
         except Exception as exc:
@@ -377,13 +665,11 @@ class InsureeService:
                     'detail': insuree.uuid}]
             }
 
-    @register_service_signal('insuree_service.delete')
     def set_deleted(self, insuree):
         try:
             insuree.delete_history()
             [ip.delete_history()
              for ip in insuree.insuree_policies.filter(validity_to__isnull=True)]
-            return []
         except Exception as exc:
             logger.exception("insuree.mutation.failed_to_delete_insuree")
             return {
@@ -392,16 +678,143 @@ class InsureeService:
                     'message': _("insuree.mutation.failed_to_delete_insuree") % {'chfid': insuree.chf_id},
                     'detail': insuree.uuid}]
             }
+        return self._insuree_deleted(insuree)
+
+    @register_service_signal('insuree_service.delete')
+    def _insuree_deleted(self, insuree):
+        """
+        insuree_service.delete service signal of an insuree whose rows are written, by set_deleted or in bulk
+        by set_deleted_bulk
+        """
+        return []
+
+    @register_service_signal('insuree_service.delete_bulk')
+    def set_deleted_bulk(self, insurees, now):
+        """
+        Set-based set_deleted for a list of insurees, to be called inside a transaction.
+        The current insuree policies of all insurees are fetched in one query (per chunk of ids).
+        The insuree_service.delete service signal is still sent for each insuree, once the rows are written.
+        """
+        insuree_ids = [insuree.id for insuree in insurees]
+        insuree_policies = []
+        for ids in chunked(insuree_ids):
+            insuree_policies += list(InsureePolicy.objects.filter(insuree_id__in=ids, validity_to__isnull=True))
+        bulk_delete_history(InsureePolicy, insuree_policies, now)
+        bulk_delete_history(Insuree, insurees, now)
+        refresh_family_member_count(insuree.family_id for insuree in insurees)
+        refresh_insuree_coverage_on_commit(insuree_ids)
+        for insuree in insurees:
+            insuree.validity_from = insuree.validity_to = now
+            self._insuree_deleted(insuree)
+
+    def remove_bulk(self, insurees, now):
+        """
+        Set-based remove for a list of insurees, to be called inside a transaction.
+        """
+        bulk_save_history(Insuree, insurees, now)
+        for ids in chunked(insuree.id for insuree in insurees):
+            Insuree.objects.filter(id__in=ids).update(family=None, validity_from=now)
+        refresh_family_member_count(insuree.family_id for insuree in insurees)
+
+    def set_deleted_by_uuids(self, insuree_uuids):
+        """
+        Set-based path of DeleteInsureesMutation. Returns the errors per insuree uuid.
+        """
+        insurees, errors = self._load_members_for_bulk(insuree_uuids, "insuree.validation.delete_head_insuree")
+        if not insurees:
+            return errors
+        from core import datetime
+        now = datetime.datetime.now()
+        try:
+            with transaction.atomic():
+                self.set_deleted_bulk(insurees, now)
+                bump_data_version_on_commit(INSUREE_DATA)
+        except Exception as exc:
+            logger.exception("insuree.mutation.failed_to_delete_insuree")
+            errors += self._bulk_failure_errors(insurees, "insuree.mutation.failed_to_delete_insuree")
+        return errors
+
+    def remove_by_uuids(self, insuree_uuids, cancel_policies=False):
+        """
+        Set-based path of RemoveInsureesMutation. Returns the errors per insuree uuid.
+        """
+        insurees, errors = self._load_members_for_bulk(insuree_uuids, "insuree.validation.remove_head_insuree")
+        if not insurees:
+            return errors
+        from core import datetime
+        now = datetime.datetime.now()
+        try:
+            with transaction.atomic():
+                if cancel_policies:
+                    self.cancel_policies_bulk(insurees, now)
+                self.remove_bulk(insurees, now)
+                bump_data_version_on_commit(INSUREE_DATA)
+        except Exception as exc:
+            logger.exception("insuree.mutation.failed_to_remove_insuree")
+            errors += self._bulk_failure_errors(insurees, "insuree.mutation.failed_to_remove_insuree")
+        return errors
+
+    def _load_members_for_bulk(self, insuree_uuids, head_error_message):
+        """
+        Loads the current insurees with their family in one query and checks in memory that none of them is
+        the head of its family. Deleted insurees are reported as not found.
+        """
+        insurees_by_uuid = {}
+        for uuids in chunked({str(insuree_uuid).lower() for insuree_uuid in insuree_uuids}):
+            insurees_by_uuid.update({
+                str(insuree.uuid).lower(): insuree
+                for insuree in filter_by_uuids(
+                    Insuree.objects.filter(validity_to__isnull=True).select_related('family'), uuids)
+            })
+        insurees = {}
+        errors = []
+        for insuree_uuid in insuree_uuids:
+            insuree = insurees_by_uuid.get(str(insuree_uuid).lower())
+            if insuree is None:
+                errors.append({
+                    'title': insuree_uuid,
+                    'list': [{'message': _("insuree.validation.id_does_not_exist") % {'id': insuree_uuid}}]
+                })
+            elif insuree.family and insuree.family.head_insuree_id == insuree.id:
+                errors.append({
+                    'title': insuree_uuid,
+                    'list': [{'message': _(head_error_message) % {'id': insuree_uuid}}]
+                })
+            else:
+                insurees[insuree.id] = insuree
+        return list(insurees.values()), errors
+
+    @staticmethod
+    def _bulk_failure_errors(insurees, message):
+        return [{
+            'title': insuree.chf_id,
+            'list': [{
+                'message': _(message) % {'chfid': insuree.chf_id},
+                'detail': insuree.uuid}]
+        } for insuree in insurees]
+
+    def cancel_policies_bulk(self, insurees, now):
+        """
+        Set-based cancel_policies for a list of insurees, to be called inside a transaction.
+        """
+        for ids in chunked(insuree.id for insuree in insurees):
+            InsureePolicy.objects \
+                .filter(insuree_id__in=ids, validity_to__isnull=True) \
+                .filter(Q(expiry_date__isnull=True) | Q(expiry_date__gt=now)) \
+                .update(expiry_date=now, validity_from=now)
+        refresh_insuree_coverage_on_commit(insuree.id for insuree in insurees)
 
     def cancel_policies(self, insuree):
         try:
             from core import datetime
             now = datetime.datetime.now()
             ips = insuree.insuree_policies.filter(
-                Q(expiry_date__isnull=True) | Q(expiry_date__gt=now))
+                Q(expiry_date__isnull=True) | Q(expiry_date__gt=now), validity_to__isnull=True)
             for ip in ips:
                 ip.expiry_date = now
-            InsureePolicy.objects.bulk_update(ips, ['expiry_date'])
+                ip.validity_from = now
+            InsureePolicy.objects.bulk_update(ips, ['expiry_date', 'validity_from'])
+            refresh_insuree_coverage_on_commit([insuree.id])
             return []
         except Exception as exc:
             logger.exception(
@@ -419,22 +832,58 @@ class InsureePolicyService:
         self.user = user
 
     def add_insuree_policy(self, insuree):
+        return self.add_insuree_policies([insuree])
+
+    def add_insuree_policies(self, insurees):
+        """
+        Attaches the insurees, already saved in their family, to the current, not expired, policies of the
+        family. The members the family had before them come first: the free slots of each policy are those
+        left by the family member count (Family.member_count) without the insurees not covered yet, so that
+        one insuree is attached when the family does not exceed the max members of the product, as checked
+        by canAddInsuree. Insurees whose attachment expired or was cancelled get a new one.
+        Policies (locked, with their product and family) and their active attachments are loaded once per
+        chunk and the insuree policies are written with one bulk_create, in one transaction. Returns the
+        created insuree policies.
+        """
         from policy.models import Policy
-        policies = Policy.objects.filter(family_id=insuree.family_id)
-        for policy in policies:
-            if policy.can_add_insuree():
-                ip = InsureePolicy(
-                    insuree=insuree,
-                    policy=policy,
-                    enrollment_date=policy.enroll_date,
-                    start_date=policy.start_date,
-                    effective_date=policy.effective_date,
-                    expiry_date=policy.expiry_date,
-                    offline=False,
-                    audit_user_id=self.user.i_user.id
-                )
-                print(ip.__dict__)
-                ip.save()
+        from core import datetime
+        insurees = [insuree for insuree in insurees if insuree.family_id]
+        insuree_policies = []
+        now = datetime.datetime.now()
+        with transaction.atomic():
+            # The policies are locked so that concurrent attaches cannot exceed the max members. The products
+            # and families are prefetched rather than joined, to leave them unlocked.
+            policies_by_family = {}
+            for ids in chunked({insuree.family_id for insuree in insurees}):
+                for policy in Policy.objects \
+                        .select_for_update() \
+                        .filter(family_id__in=ids, validity_to__isnull=True) \
+                        .exclude(status=Policy.STATUS_EXPIRED) \
+                        .prefetch_related('product', 'family'):
+                    policies_by_family.setdefault(policy.family_id, []).append(policy)
+            policies = [policy for family_policies in policies_by_family.values() for policy in family_policies]
+            active = policy_active_insurees(policies, now)
+            for family_id, family_policies in policies_by_family.items():
+                members = {insuree.id: insuree for insuree in insurees if insuree.family_id == family_id}
+                for policy in family_policies:
+                    newcomers = [insuree for insuree in members.values() if (policy.id, insuree.id) not in active]
+                    free_slots = policy_free_slots(policy, family_member_count(policy.family) - len(newcomers))
+                    for insuree in newcomers[:max(free_slots, 0)]:
+                        insuree_policies.append(InsureePolicy(
+                            insuree=insuree,
+                            policy=policy,
+                            enrollment_date=policy.enroll_date,
+                            start_date=policy.start_date,
+                            effective_date=policy.effective_date,
+                            expiry_date=policy.expiry_date,
+                            offline=False,
+                            audit_user_id=self.user.id_for_audit,
+                            validity_from=now
+                        ))
+            InsureePolicy.objects.bulk_create(insuree_policies, batch_size=BULK_CHUNK_SIZE)
+            # bulk_create sends no post_save signal
+            refresh_insuree_coverage_on_commit({ip.insuree_id for ip in insuree_policies})
+        return insuree_policies
 
 
 class FamilyService:
@@ -485,6 +934,7 @@ class FamilyService:
     def _update(self, existing_family, family):
         existing_family.save_history()
         family.id = existing_family.id
+        family.member_count = existing_family.member_count
         family.save()
         if family.head_insuree.family != family:
             family.head_insuree.family = family
@@ -506,9 +956,303 @@ class FamilyService:
                     'detail': family.uuid}]
             }
 
+    def set_deleted_bulk(self, family_uuids, delete_members):
+        """
+        Set-based counterpart of set_deleted for DeleteFamiliesMutation: families, members and insuree
+        policies are loaded in three queries and all history is written in bulk, in one transaction.
+        Returns the errors per family uuid, in the same shape as set_deleted.
+        """
+        families = {}
+        for uuids in chunked(family_uuids):
+            families.update({str(family.uuid).lower(): family for family in filter_by_uuids(Family.objects, uuids)})
+        errors = [{
+            'title': family_uuid,
+            'list': [{'message': _("insuree.mutation.failed_to_delete_family") % {'uuid': family_uuid}}]
+        } for family_uuid in family_uuids if str(family_uuid).lower() not in families]
+        if not families:
+            return errors
+        from core import datetime
+        now = datetime.datetime.now()
+        try:
+            with transaction.atomic():
+                members = []
+                for ids in chunked(family.id for family in families.values()):
+                    members += list(Insuree.objects.filter(family_id__in=ids, validity_to__isnull=True))
+                insuree_service = InsureeService(self.user)
+                if delete_members:
+                    insuree_service.set_deleted_bulk(members, now)
+                else:
+                    insuree_service.remove_bulk(members, now)
+                bulk_delete_history(Family, list(families.values()), now)
+                bump_data_version_on_commit(INSUREE_DATA)
+        except Exception as exc:
+            logger.exception("insuree.mutation.failed_to_delete_family")
+            errors += [{
+                'title': family.uuid,
+                'list': [{
+                    'message': _("insuree.mutation.failed_to_delete_family") % {'uuid': family.uuid},
+                    'detail': family.uuid}]
+            } for family in families.values()]
+        return errors
+
+    def split_by_uuids(self, family_uuid, insuree_uuids, cancel_policies=False):
+        """
+        Moves the insurees (none of them head of its family) into the family, in one transaction.
+        Returns the errors per insuree uuid.
+        """
+        target, errors = self._load_target_family(family_uuid)
+        if target is None:
+            return errors
+        insurees, member_errors = InsureeService(self.user)._load_members_for_bulk(
+            insuree_uuids, "insuree.validation.move_head_insuree")
+        return errors + member_errors + self._move_members(target, insurees, [], cancel_policies)
+
+    def merge_by_uuids(self, family_uuid, family_uuids, cancel_policies=False):
+        """
+        Moves all current members of the families into the family, heads included, and deletes the
+        merged families, in one transaction. Returns the errors per family uuid.
+        """
+        target, errors = self._load_target_family(family_uuid)
+        if target is None:
+            return errors
+        # Merging the target into itself is a no-op, not a missing family
+        family_uuids = [uuid for uuid in family_uuids if str(uuid).lower() != str(target.uuid).lower()]
+        families = {}
+        for uuids in chunked(family_uuids):
+            families.update({
+                str(family.uuid).lower(): family
+                for family in filter_by_uuids(Family.objects.filter(validity_to__isnull=True), uuids)
+            })
+        errors += [{
+            'title': uuid,
+            'list': [{'message': _("insuree.validation.id_does_not_exist") % {'id': uuid}}]
+        } for uuid in family_uuids if str(uuid).lower() not in families]
+        members = []
+        for ids in chunked(family.id for family in families.values()):
+            members += list(Insuree.objects.filter(family_id__in=ids, validity_to__isnull=True))
+        return errors + self._move_members(target, members, list(families.values()), cancel_policies)
+
+    def _load_target_family(self, family_uuid):
+        target = filter_by_uuids(Family.objects.filter(validity_to__isnull=True), [family_uuid]).first()
+        if target is None:
+            return None, [{
+                'title': family_uuid,
+                'list': [{'message': _("insuree.validation.id_does_not_exist") % {'id': family_uuid}}]
+            }]
+        return target, []
+
+    def _move_members(self, target, insurees, merged_families, cancel_policies):
+        """
+        Set-based family change: history copies and family updates of the insurees are written in bulk,
+        their policies optionally cancelled and the current policies of the target family attached in bulk.
+        The moved insurees are no longer heads, the merged families are deleted.
+        """
+        insurees = [insuree for insuree in insurees if insuree.family_id != target.id]
+        if not insurees and not merged_families:
+            return []
+        from core import datetime
+        now = datetime.datetime.now()
+        try:
+            with transaction.atomic():
+                if cancel_policies:
+                    InsureeService(self.user).cancel_policies_bulk(insurees, now)
+                previous_family_ids = {insuree.family_id for insuree in insurees}
+                bulk_save_history(Insuree, insurees, now)
+                for ids in chunked(insuree.id for insuree in insurees):
+                    Insuree.objects.filter(id__in=ids).update(
+                        family=target, head=False, validity_from=now, audit_user_id=self.user.id_for_audit)
+                bulk_delete_history(Family, merged_families, now)
+                for insuree in insurees:
+                    insuree.family = target
+                    insuree.head = False
+                refresh_family_member_count(previous_family_ids | {target.id})
+                InsureePolicyService(self.user).add_insuree_policies(insurees)
+                bump_data_version_on_commit(INSUREE_DATA)
+        except Exception as exc:
+            logger.exception("insuree.mutation.failed_to_move_insuree")
+            return InsureeService._bulk_failure_errors(insurees, "insuree.mutation.failed_to_move_insuree")
+        return []
+
     def handle_member_on_family_delete(self, member, delete_members):
         insuree_service = InsureeService(self.user)
         if delete_members:
             insuree_service.set_deleted(member)
         else:
             insuree_service.remove(member)
+
+
+class InsureeStatusFeedService:
+    """
+    Ingests a civil registry feed of (chf_id, status, reason, date) rows, e.g. deaths or inactivations.
+    Dates are given as date objects or YYYY-MM-DD strings, rows with a malformed date are counted as invalid.
+    Status reasons come from the reference data cache and rows are processed in chunks: one query
+    resolves the chf_ids of a chunk, then each (status, reason, date) group goes through
+    InsureeService.change_status_bulk.
+    Ingestion is idempotent (insurees already in the target status are skipped) and resumable:
+    on_chunk_done is called with the number of rows committed so far, which can be given back
+    as start to continue an interrupted run.
+    """
+
+    def __init__(self, user, chunk_size=BULK_CHUNK_SIZE):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.insuree_service = InsureeService(user)
+
+    def ingest(self, rows, start=0, on_chunk_done=None):
+        summary = {"read": 0, "updated": 0, "unknown_insurees": 0, "invalid_rows": 0}
+        position = 0
+        chunk = []
+        for row in rows:
+            position += 1
+            if position <= start:
+                continue
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                self._ingest_chunk(chunk, summary)
+                chunk = []
+                if on_chunk_done:
+                    on_chunk_done(position)
+        if chunk:
+            self._ingest_chunk(chunk, summary)
+            if on_chunk_done:
+                on_chunk_done(position)
+        return summary
+
+    def _ingest_chunk(self, chunk, summary):
+        summary["read"] += len(chunk)
+        # Only the last row of a chunk counts for an insuree appearing several times
+        rows_by_chf_id = {row[0]: row for row in chunk}
+        insuree_ids = dict(
+            Insuree.objects
+            .filter(chf_id__in=list(rows_by_chf_id.keys()), validity_to__isnull=True)
+            .values_list("chf_id", "id")
+        )
+        groups = {}
+        for chf_id, status, reason, status_date in rows_by_chf_id.values():
+            if chf_id not in insuree_ids:
+                summary["unknown_insurees"] += 1
+                continue
+            status = self._parse_status(status)
+            status_reason = get_insuree_status_reason(reason)
+            try:
+                status_date = self._parse_date(status_date)
+            except ValueError:
+                status = None
+            if status is None or (status != InsureeStatus.ACTIVE and (
+                    status_reason is None or status_reason.status_type != status)):
+                logger.warning("Invalid status feed row for insuree %s: %s %s %s", chf_id, status, reason,
+                               status_date)
+                summary["invalid_rows"] += 1
+                continue
+            groups.setdefault((status, reason, status_date), []).append(insuree_ids[chf_id])
+        with transaction.atomic():
+            for (status, reason, status_date), ids in groups.items():
+                summary["updated"] += self.insuree_service.change_status_bulk(
+                    ids, status, get_insuree_status_reason(reason), status_date)
+
+    @staticmethod
+    def _parse_status(status):
+        status = (status or "").strip().upper()
+        if status in InsureeStatus.values:
+            return status
+        if status in InsureeStatus.names:
+            return InsureeStatus[status].value
+        return None
+
+    @staticmethod
+    def _parse_date(status_date):
+        # Feeds give YYYY-MM-DD strings, a malformed date only invalidates its row
+        if not isinstance(status_date, str):
+            return status_date
+        if not status_date.strip():
+            return None
+        parsed = parse_date(status_date.strip())
+        if parsed is None:
+            raise ValueError(f"invalid date {status_date}")
+        return parsed
+
+
+class InsureeNumberPoolService:
+    """
+    Allocates blocks of insuree numbers to enrollment devices and officers. The numbers are generated
+    sequentially after the last reserved one, honouring insuree_number_length/modulo_root (and the
+    custom validator if any), skipping the numbers already known in tblInsuree.
+    """
+    # candidates tried per requested number before giving up (custom validators rejecting most numbers)
+    MAX_CANDIDATES_PER_NUMBER = 100
+    RESERVATION_ATTEMPTS = 3
+
+    def __init__(self, user):
+        self.user = user
+
+    def reserve_block(self, size, device=None, officer_id=None):
+        """
+        Reserves size numbers in one transaction and returns them. Concurrent reservations of the same
+        numbers are arbitrated by the unique constraint and retried after the new last reserved number.
+        """
+        if not size or not 0 < size <= InsureeConfig.insuree_number_block_max_size:
+            raise ValidationError(_("insuree.number_pool.invalid_block_size") % {
+                'max': InsureeConfig.insuree_number_block_max_size})
+        if not InsureeConfig.get_insuree_number_length():
+            raise ValidationError(_("insuree.number_pool.length_required"))
+        for attempt in range(self.RESERVATION_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    return self._reserve_block(size, device, officer_id)
+            except IntegrityError:
+                logger.info("Concurrent insuree number reservation, attempt %s", attempt + 1)
+        raise ValidationError(_("insuree.number_pool.reservation_conflict"))
+
+    def _reserve_block(self, size, device, officer_id):
+        from core import datetime
+        now = datetime.datetime.now()
+        numbers = self._next_numbers(size)
+        InsureeNumberReservation.objects.bulk_create([
+            InsureeNumberReservation(insuree_number=number, device=device, officer_id=officer_id,
+                                     reserved_at=now, audit_user_id=self.user.id_for_audit)
+            for number in numbers
+        ], batch_size=BULK_CHUNK_SIZE)
+        return numbers
+
+    def _next_numbers(self, size):
+        length = InsureeConfig.get_insuree_number_length()
+        modulo_root = InsureeConfig.get_insuree_number_modulo_root()
+        last = InsureeNumberReservation.objects.aggregate(last=Max("insuree_number"))["last"]
+        sequence = insuree_number_sequence(last, modulo_root) + 1 if last else 1
+        numbers = []
+        tried = 0
+        while len(numbers) < size:
+            candidates = []
+            while len(candidates) < size - len(numbers):
+                tried += 1
+                if tried > size * self.MAX_CANDIDATES_PER_NUMBER:
+                    raise ValidationError(_("insuree.number_pool.exhausted"))
+                number = make_insuree_number(sequence, length, modulo_root)
+                sequence += 1
+                if number is None:
+                    continue
+                if len(number) > length:
+                    raise ValidationError(_("insuree.number_pool.exhausted"))
+                # after the last reserved number, the candidates cannot be reserved yet
+                if not validate_insuree_number(number, check_unique=False, check_reservation=False):
+                    candidates.append(number)
+            # numbers of deleted insurees are not handed out again either
+            taken = set()
+            for chunk in chunked(candidates):
+                taken.update(Insuree.objects.filter(chf_id__in=chunk).values_list("chf_id", flat=True))
+            numbers.extend(number for number in candidates if number not in taken)
+        return numbers
+
+    @staticmethod
+    def available_numbers(device=None, officer_id=None):
+        """
+        Reserved numbers of the device/officer that are not yet assigned to an insuree
+        """
+        queryset = InsureeNumberReservation.objects \
+            .annotate(assigned=Exists(Insuree.objects.filter(chf_id=OuterRef("insuree_number")))) \
+            .filter(assigned=False)
+        if device:
+            queryset = queryset.filter(device=device)
+        if officer_id:
+            queryset = queryset.filter(officer_id=officer_id)
+        return queryset.order_by("insuree_number").values_list("insuree_number", flat=True)
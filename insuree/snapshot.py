@@ -0,0 +1,143 @@
+import datetime
+import json
+import logging
+import os
+import shutil
+
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_datetime
+from location.models import Location
+
+from insuree.apps import InsureeConfig
+from insuree.export import EXPORT_CHUNK_SIZE, arrow_schema
+from insuree.models import Insuree, Family, InsureePolicy
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "_snapshot.json"
+
+# Families are attached to villages: village > ward > district > region
+_FAMILY_DISTRICT = "location__parent__parent__code"
+_FAMILY_REGION = "location__parent__parent__parent__code"
+
+# dataset -> (model, fields, region field, district field)
+SNAPSHOT_DATASETS = {
+    "families": (Family, ["id", "uuid", "head_insuree_id", "location_id", "poverty", "family_type_id",
+                          "is_offline", "ethnicity", "confirmation_type_id", "validity_from", "validity_to"],
+                 _FAMILY_REGION, _FAMILY_DISTRICT),
+    "insurees": (Insuree, ["id", "uuid", "chf_id", "family_id", "gender_id", "dob", "head", "marital",
+                           "current_village_id", "card_issued", "relationship_id", "profession_id",
+                           "education_id", "health_facility_id", "offline", "status", "status_date",
+                           "photo_date", "validity_from", "validity_to"],
+                 "family__" + _FAMILY_REGION, "family__" + _FAMILY_DISTRICT),
+    "insuree_policies": (InsureePolicy, ["id", "insuree_id", "policy_id", "enrollment_date", "start_date",
+                                         "effective_date", "expiry_date", "offline", "validity_from",
+                                         "validity_to"],
+                         "insuree__family__" + _FAMILY_REGION, "insuree__family__" + _FAMILY_DISTRICT),
+}
+LOCATION_FIELDS = ["id", "uuid", "code", "name", "type", "parent_id", "male_population", "female_population",
+                   "other_population", "families"]
+
+
+class RegistrySnapshot:
+    """
+    Parquet snapshot of the insuree registry for analytics, partitioned by region and district.
+    The first run (or a full run) writes the current rows. Later runs only append the rows whose
+    validity_from is past the watermark of the previous run, including deleted rows (deleted=true),
+    so the current state of a record is its row with the latest validity_from. As in the delta sync,
+    the last sync_safety_lag seconds before the watermark are read again (late commits): a record can
+    appear twice with the same validity_from.
+    Each dataset has a fixed schema, from the model field types.
+    Locations are small and rewritten at every run. Reads can be sent to a replica with using.
+    """
+
+    def __init__(self, root, using="default"):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValidationError("registry snapshots require pyarrow")
+        self.pyarrow = pyarrow
+        self.root = root
+        self.using = using
+
+    def _read_state(self):
+        state_path = os.path.join(self.root, STATE_FILE)
+        if not os.path.exists(state_path):
+            return {}
+        with open(state_path) as f:
+            return json.load(f)
+
+    def _write_state(self, state):
+        with open(os.path.join(self.root, STATE_FILE), "w") as f:
+            json.dump(state, f)
+
+    def refresh(self, full=False):
+        """
+        Returns the number of rows written per dataset.
+        """
+        from core import datetime
+        state = {} if full else self._read_state()
+        os.makedirs(self.root, exist_ok=True)
+        if full:
+            # Only remove what the snapshot writes, the output directory may hold other files
+            for name in SNAPSHOT_DATASETS:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+        since = state.get("watermark")
+        # Rows committed while the snapshot runs are picked up by the next refresh
+        watermark = datetime.datetime.now().isoformat()
+        run = watermark.replace(":", "").replace("-", "").replace(".", "")
+        written = {name: self._write_dataset(name, since, run) for name in SNAPSHOT_DATASETS}
+        written["locations"] = self._write_locations()
+        self._write_state({"watermark": watermark})
+        return written
+
+    def _write_dataset(self, name, since, run):
+        model, fields, region_field, district_field = SNAPSHOT_DATASETS[name]
+        queryset = model.objects.using(self.using).filter(legacy_id__isnull=True)
+        if since:
+            queryset = queryset.filter(validity_from__gt=parse_datetime(since) - datetime.timedelta(
+                seconds=InsureeConfig.sync_safety_lag))
+        else:
+            queryset = queryset.filter(validity_to__isnull=True)
+        rows = queryset.order_by("pk").values_list(*fields, region_field, district_field) \
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        columns = fields + ["region", "district"]
+        schema = arrow_schema(model, fields + [region_field, district_field], columns) \
+            .append(self.pyarrow.field("deleted", self.pyarrow.bool_()))
+        written = 0
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= EXPORT_CHUNK_SIZE:
+                self._write_chunk(name, schema, chunk, f"{run}-{written}")
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            self._write_chunk(name, schema, chunk, f"{run}-{written}")
+            written += len(chunk)
+        return written
+
+    def _write_chunk(self, name, schema, chunk, part):
+        import pyarrow.parquet
+        # All partition files share the dataset schema, even when a column is null in a whole chunk
+        records = [dict(zip(schema.names, row)) for row in chunk]
+        for record in records:
+            record["deleted"] = record["validity_to"] is not None
+            # Partition values must not be null
+            record["region"] = record["region"] or "none"
+            record["district"] = record["district"] or "none"
+        pyarrow.parquet.write_to_dataset(
+            self.pyarrow.Table.from_pylist(records, schema=schema),
+            os.path.join(self.root, name),
+            partition_cols=["region", "district"],
+            basename_template=f"{part}-{{i}}.parquet",
+        )
+
+    def _write_locations(self):
+        import pyarrow.parquet
+        locations = list(Location.objects.using(self.using).filter(validity_to__isnull=True)
+                         .values(*LOCATION_FIELDS))
+        table = self.pyarrow.Table.from_pylist(locations, schema=arrow_schema(Location, LOCATION_FIELDS))
+        pyarrow.parquet.write_table(table, os.path.join(self.root, "locations.parquet"))
+        return len(locations)
@@ -0,0 +1,92 @@
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from location.models import LocationManager
+
+from insuree.apps import InsureeConfig
+from insuree.models import Insuree, Family, InsureePhoto, InsureePolicy
+
+SYNC_CHUNK_SIZE = 2000
+
+INSUREE_SYNC_FIELDS = ["uuid", "chf_id", "last_name", "other_names", "gender_id", "dob", "head", "marital",
+                       "passport", "phone", "email", "current_address", "geolocation", "current_village__uuid",
+                       "card_issued", "relationship_id", "profession_id", "education_id", "type_of_id_id",
+                       "health_facility__uuid", "offline", "status", "status_date", "status_reason__code",
+                       "photo_date", "family__uuid", "json_ext"]
+FAMILY_SYNC_FIELDS = ["uuid", "head_insuree__uuid", "location__uuid", "poverty", "family_type_id", "address",
+                      "is_offline", "ethnicity", "confirmation_no", "confirmation_type_id", "json_ext"]
+PHOTO_SYNC_FIELDS = ["uuid", "insuree__uuid", "chf_id", "folder", "filename", "officer_id", "date"]
+INSUREE_POLICY_SYNC_FIELDS = ["id", "insuree__uuid", "policy__uuid", "enrollment_date", "start_date",
+                              "effective_date", "expiry_date", "offline"]
+
+# record type -> (model, key field, fields, district prefixes for the user districts filter)
+SYNC_ENTITIES = [
+    ("family", Family, "uuid", FAMILY_SYNC_FIELDS, ["location__parent__parent"]),
+    ("insuree", Insuree, "uuid", INSUREE_SYNC_FIELDS,
+     ["current_village__parent__parent", "family__location__parent__parent"]),
+    ("photo", InsureePhoto, "uuid", PHOTO_SYNC_FIELDS, ["insuree__family__location__parent__parent"]),
+    ("insuree_policy", InsureePolicy, "id", INSUREE_POLICY_SYNC_FIELDS,
+     ["insuree__family__location__parent__parent"]),
+]
+
+
+def _changed_since(model, since, user, location_prefixes):
+    # History copies carry a legacy_id, only the current rows (and the deleted ones) are synced.
+    # For insurees, this matches ix_tblInsuree_validity (ValidityFrom, LegacyID, InsureeID)
+    filters = [Q(legacy_id__isnull=True)]
+    if since:
+        # validity_from is set when a write starts, a transaction committed after the previous sync can carry
+        # an older validity_from than the watermark: the last sync_safety_lag seconds are sent again.
+        filters.append(Q(validity_from__gt=since - datetime.timedelta(seconds=InsureeConfig.sync_safety_lag)))
+    else:
+        # A full sync has no use for tombstones
+        filters.append(Q(validity_to__isnull=True))
+    if not user._u.is_imis_admin:
+        location_filter = Q()
+        for prefix in location_prefixes:
+            location_filter |= LocationManager().build_user_location_filter_query(
+                user._u, prefix=prefix, loc_types=['D'])
+        filters.append(location_filter)
+    return model.objects.filter(*filters).order_by("validity_from", "pk")
+
+
+def delta_sync_records(user, since=None):
+    """
+    Generates the families, insurees, photos (metadata only) and insuree policies changed since the
+    validity_from watermark, in the user districts. Records whose validity_to is set are sent as
+    tombstones ({"type": ..., "key": ..., "deleted": true}). The last record holds the next watermark.
+    Records changed within sync_safety_lag before the watermark are sent again, clients apply them as upserts.
+    The next watermark is at least sync_safety_lag seconds before the start of the sync, so that an idle
+    registry does not get the same records sent again on every sync.
+    """
+    # Writes started before this point and still uncommitted are covered by the safety lag of the next sync
+    floor = datetime.datetime.now() - datetime.timedelta(seconds=InsureeConfig.sync_safety_lag)
+    watermark = since if since is not None and since > floor else floor
+    for record_type, model, key, fields, location_prefixes in SYNC_ENTITIES:
+        queryset = _changed_since(model, since, user, location_prefixes) \
+            .values(key, "validity_from", "validity_to", *[field for field in fields if field != key])
+        for row in queryset.iterator(chunk_size=SYNC_CHUNK_SIZE):
+            validity_from = row.pop("validity_from")
+            if watermark is None or validity_from > watermark:
+                watermark = validity_from
+            if row.pop("validity_to") is not None:
+                yield {"type": record_type, "key": row[key], "deleted": True}
+            else:
+                yield {"type": record_type, "key": row[key], "data": row}
+    yield {"type": "watermark", "next": watermark}
+
+
+def delta_sync_ndjson(user, since=None):
+    """
+    delta_sync_records as newline delimited JSON, in blocks of SYNC_CHUNK_SIZE records.
+    """
+    lines = []
+    for record in delta_sync_records(user, since):
+        lines.append(json.dumps(record, cls=DjangoJSONEncoder, separators=(",", ":")))
+        if len(lines) >= SYNC_CHUNK_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
@@ -1,6 +1,7 @@
 from insuree.apps import InsureeConfig
 from insuree.models import Insuree, Family, Gender, InsureePhoto
 from insuree.services import validate_insuree_number
+from insuree.reference_data import get_reference
 from location.models import Location
 import random
 import re
@@ -46,7 +47,7 @@ def create_test_insuree(with_family=True, is_head=False, custom_props=None, fami
                 last_name = get_from_custom_props(custom_props, 'last_name',"Test Last" ),
                 other_names= get_from_custom_props(custom_props, 'other_names', "First Second"),
                 family= family,
-                gender= get_from_custom_props(custom_props, 'gender', Gender.objects.get(code='M')),
+                gender= get_from_custom_props(custom_props, 'gender', get_reference(Gender, 'M')),
                 dob=  get_from_custom_props(custom_props, 'dob', '1972-08-09'),
                 chf_id= ref,
                 head= is_head,
@@ -1,4 +1,8 @@
+from .test_export import ParquetExportTest, RegistrySnapshotTest
 from .test_graphql import InsureeGQLTestCase
 from .test_insuree_photo import InsureePhotoTest
 from .test_insuree_validation import InsureeValidationTest
-from .test_reports import APITestCase
+from .test_reports import APITestCase, ReportJobTests
+from .test_services import FamilyServiceBulkTest, InsureeServiceBulkTest, InsureeNumberPoolServiceTest, \
+    InsureeStatusFeedServiceTest, InsureeCoverageTest, InsureePolicyServiceTest, ReferenceDataCacheTest
+from .test_views import CachedViewsTests
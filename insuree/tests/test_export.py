@@ -0,0 +1,56 @@
+import io
+import tempfile
+from importlib.util import find_spec
+from unittest import mock, skipUnless
+
+from django.test import TestCase
+
+from core.test_helpers import create_test_interactive_user
+from insuree.export import write_parquet, INSUREE_EXPORT_FIELDS
+from insuree.models import Insuree
+from insuree.services import InsureeService
+from insuree.snapshot import RegistrySnapshot
+from insuree.test_helpers import create_test_insuree
+
+
+@skipUnless(find_spec("pyarrow"), "parquet export requires pyarrow")
+class ParquetExportTest(TestCase):
+    def test_null_columns_across_chunks(self):
+        import pyarrow.parquet
+        without_email = create_test_insuree(with_family=False, custom_props={"email": None, "phone": None})
+        with_email = create_test_insuree(with_family=False, custom_props={"email": "test@openimis.org",
+                                                                          "phone": "0123456"})
+        queryset = Insuree.objects.filter(id__in=[without_email.id, with_email.id]).order_by("id")
+        file = io.BytesIO()
+        # One row per chunk: the columns of the first chunk are all null
+        with mock.patch("insuree.export.EXPORT_CHUNK_SIZE", 1):
+            write_parquet(queryset, INSUREE_EXPORT_FIELDS, file)
+        file.seek(0)
+        table = pyarrow.parquet.read_table(file)
+        self.assertEqual(table.column_names, INSUREE_EXPORT_FIELDS)
+        self.assertEqual(table.column("email").to_pylist(), [None, "test@openimis.org"])
+        self.assertEqual(table.column("phone").to_pylist(), [None, "0123456"])
+        self.assertEqual(str(table.schema.field("dob").type), "date32[day]")
+
+
+@skipUnless(find_spec("pyarrow"), "registry snapshots require pyarrow")
+class RegistrySnapshotTest(TestCase):
+    def test_incremental_refresh(self):
+        import pyarrow.parquet
+        head = create_test_insuree(with_family=True, is_head=True)
+        member = create_test_insuree(with_family=False, custom_props={"family": head.family, "marital": None})
+        with tempfile.TemporaryDirectory() as root:
+            snapshot = RegistrySnapshot(root)
+            with mock.patch("insuree.snapshot.EXPORT_CHUNK_SIZE", 1):
+                written = snapshot.refresh(full=True)
+            self.assertGreaterEqual(written["insurees"], 2)
+            # Removal from the family is an update in place, picked up by the next refresh
+            user = create_test_interactive_user(username="testRegistrySnapshot")
+            self.assertEqual(InsureeService(user).remove_by_uuids([member.uuid]), [])
+            self.assertGreaterEqual(snapshot.refresh()["insurees"], 1)
+            # Files of all chunks and runs share one schema, the dataset is read as a whole
+            insurees = pyarrow.parquet.read_table(f"{root}/insurees").to_pylist()
+            member_rows = sorted((row for row in insurees if row["id"] == member.id),
+                                 key=lambda row: row["validity_from"])
+            self.assertIsNotNone(member_rows[0]["family_id"])
+            self.assertIsNone(member_rows[-1]["family_id"])
@@ -1,7 +1,12 @@
+import uuid
+
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
 from insuree.apps import InsureeConfig
-from insuree.services import validate_insuree_number
+from insuree.models import Insuree
+from insuree.services import validate_insuree_number, is_taken_insuree_number_error
+from insuree.test_helpers import create_test_insuree
 
 
 def fail1(x):
@@ -62,3 +67,15 @@ class InsureeValidationTest(TestCase):
             self.assertEqual(len(validate_insuree_number("12345")), 1)
             self.assertEqual(len(validate_insuree_number("1234561")), 0)
             self.assertEqual(len(validate_insuree_number("1234560")), 1)
+
+    def test_unique_current_insuree_number(self):
+        insuree = create_test_insuree(with_family=False, custom_props={"chf_id": "990000001"})
+        duplicate = Insuree.objects.get(id=insuree.id)
+        duplicate.id = None
+        duplicate.uuid = str(uuid.uuid4())
+        with self.assertRaises(IntegrityError) as context, transaction.atomic():
+            duplicate.save()
+        self.assertTrue(is_taken_insuree_number_error(context.exception))
+        # historical versions don't conflict with the current one
+        insuree.save_history()
+        self.assertEqual(Insuree.objects.filter(chf_id="990000001").count(), 2)
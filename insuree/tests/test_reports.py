@@ -1,3 +1,7 @@
+import os
+import tempfile
+from unittest import mock
+
 from core.test_helpers import create_test_interactive_user
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -5,6 +9,10 @@ from dataclasses import dataclass
 from graphql_jwt.shortcuts import get_token
 from core.models import User
 from django.conf import settings
+from django.core.cache import cache
+from insuree import report_jobs
+from insuree.apps import InsureeConfig
+import json
 
 
 @dataclass
@@ -47,3 +55,103 @@ class ReportAPITests( APITestCase):
         headers={"HTTP_AUTHORIZATION": f"Bearer {self.admin_token}"}
         response = self.client.get(self.IME_URL, format='json', **headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_report_templates_loaded_on_first_use(self):
+        from insuree.report import report_definitions, get_report_template
+        for definition in report_definitions:
+            self.assertIn("default_report", definition)
+            self.assertEqual(json.loads(definition["default_report"]), get_report_template(definition["name"]))
+
+    def test_report_definitions_are_complete_mappings(self):
+        import importlib
+        from insuree.report import report_definitions, LazyReportDefinition, get_report_template_text
+        definition = LazyReportDefinition(name=report_definitions[0]["name"])
+        self.assertEqual(set(definition.keys()), {"name", "default_report"})
+        for copy in [dict(definition), {**definition}, definition.copy()]:
+            self.assertEqual(copy["default_report"], get_report_template_text(definition["name"]))
+        module = importlib.import_module(f"insuree.reports.{definition['name']}")
+        self.assertEqual(module.template, get_report_template_text(definition["name"]))
+
+    def test_report_rows_are_streamed(self):
+        from insuree.reports.streaming import StreamedRows
+        queries = []
+
+        def rows():
+            queries.append(1)
+            yield {"CHFID": "1"}
+            yield {"CHFID": "2"}
+
+        data = StreamedRows(rows)
+        # ReportBro only accepts lists, the rows are fetched while it iterates them
+        self.assertIsInstance(data, list)
+        self.assertEqual(queries, [])
+        self.assertEqual([row["CHFID"] for row in data], ["1", "2"])
+        self.assertEqual(len(data), 2)
+
+
+class ReportJobTests(APITestCase):
+
+    admin_user = None
+    admin_token = None
+    SUBMIT_URL = f'/{settings.SITE_ROOT()}insuree/report/insuree_missing_photo/pdf/async/'
+    JOB_URL = f'/{settings.SITE_ROOT()}insuree/report/jobs/%s/'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin_user = create_test_interactive_user(username="testReportJobAdmin")
+        cls.admin_token = get_token(cls.admin_user, DummyContext(user=cls.admin_user))
+
+    def setUp(self):
+        cache.clear()
+        artifacts_root = tempfile.TemporaryDirectory()
+        self.addCleanup(artifacts_root.cleanup)
+        # Jobs run inline, on the test connection (which the worker must not close)
+        for patcher in [
+            mock.patch.object(InsureeConfig, "report_artifacts_root_path", artifacts_root.name),
+            mock.patch.object(report_jobs, "_get_executor",
+                              return_value=mock.Mock(submit=lambda fn, *args: fn(*args))),
+            mock.patch.object(report_jobs, "close_old_connections"),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _headers(self, user):
+        return {"HTTP_AUTHORIZATION": f"Bearer {get_token(user, DummyContext(user=user))}"}
+
+    def test_submit_poll_and_download(self):
+        headers = self._headers(self.admin_user)
+        response = self.client.post(self.SUBMIT_URL, **headers)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.json()["id"]
+        response = self.client.get(self.JOB_URL % job_id, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], report_jobs.JOB_DONE, response.json()["error"])
+        response = self.client.get(f"{self.JOB_URL % job_id}artifact/", **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        # An identical request gets the finished job back
+        response = self.client.post(self.SUBMIT_URL, **headers)
+        self.assertEqual(response.json()["id"], job_id)
+
+    def test_shared_job_readable_by_other_report_users(self):
+        response = self.client.post(self.SUBMIT_URL, **self._headers(self.admin_user))
+        job_id = response.json()["id"]
+        other_admin = create_test_interactive_user(username="testReportJobOtherAdmin")
+        response = self.client.get(self.JOB_URL % job_id, **self._headers(other_admin))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        unauthorized = create_test_interactive_user(username="testReportJobNoRights", roles=[])
+        response = self.client.get(self.JOB_URL % job_id, **self._headers(unauthorized))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cleanup_artifacts(self):
+        root = InsureeConfig.report_artifacts_root_path
+        old_artifact, new_artifact = os.path.join(root, "old.pdf"), os.path.join(root, "new.pdf")
+        for path in [old_artifact, new_artifact]:
+            with open(path, "wb") as f:
+                f.write(b"%PDF")
+        expired = os.path.getmtime(old_artifact) - InsureeConfig.report_artifact_ttl - 1
+        os.utime(old_artifact, (expired, expired))
+        self.assertEqual(report_jobs.cleanup_artifacts(), 1)
+        self.assertFalse(os.path.exists(old_artifact))
+        self.assertTrue(os.path.exists(new_artifact))
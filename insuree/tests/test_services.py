@@ -0,0 +1,423 @@
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from core.test_helpers import create_test_interactive_user
+from insuree.apps import InsureeConfig
+from insuree.coverage import get_coverage, get_coverages, rebuild_insuree_coverage, refresh_insuree_coverage
+from insuree.models import Family, Insuree, InsureeStatus, InsureeStatusReason, Gender, InsureeCoverage
+from insuree.reference_data import get_reference, get_reference_list, invalidate_reference_data, \
+    clear_local_reference_data
+from insuree.services import FamilyService, InsureeService, InsureeNumberPoolService, InsureePolicyService, \
+    InsureeStatusFeedService, validate_insuree_number
+from insuree.test_helpers import create_test_insuree
+
+
+class FamilyServiceBulkTest(TestCase):
+    test_user = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = create_test_interactive_user(username="testBulkFamilyServices")
+
+    def _create_family_with_member(self):
+        head = create_test_insuree(with_family=True, is_head=True)
+        member = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        return head.family, head, member
+
+    def test_set_deleted_bulk_with_members(self):
+        family, head, member = self._create_family_with_member()
+        errors = FamilyService(self.test_user).set_deleted_bulk([family.uuid], True)
+        self.assertEqual(errors, [])
+        family.refresh_from_db()
+        member.refresh_from_db()
+        self.assertIsNotNone(family.validity_to)
+        self.assertIsNotNone(member.validity_to)
+        self.assertTrue(Family.objects.filter(legacy_id=family.id).exists())
+        self.assertTrue(Insuree.objects.filter(legacy_id=member.id).exists())
+
+    def test_set_deleted_bulk_sends_delete_signal_per_member(self):
+        family, head, member = self._create_family_with_member()
+        with mock.patch.object(InsureeService, "_insuree_deleted", autospec=True, return_value=[]) as deleted:
+            errors = FamilyService(self.test_user).set_deleted_bulk([family.uuid], True)
+        self.assertEqual(errors, [])
+        self.assertEqual({call.args[1].id for call in deleted.call_args_list}, {head.id, member.id})
+        member.refresh_from_db()
+        self.assertIsNotNone(member.validity_to)
+
+    def test_set_deleted_bulk_without_members(self):
+        family, head, member = self._create_family_with_member()
+        errors = FamilyService(self.test_user).set_deleted_bulk([family.uuid], False)
+        self.assertEqual(errors, [])
+        member.refresh_from_db()
+        self.assertIsNone(member.validity_to)
+        self.assertIsNone(member.family_id)
+
+    def test_split_by_uuids_refuses_head(self):
+        family, head, member = self._create_family_with_member()
+        target = create_test_insuree(with_family=True, is_head=True).family
+        errors = FamilyService(self.test_user).split_by_uuids(target.uuid, [head.uuid, member.uuid])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['title'], head.uuid)
+        member.refresh_from_db()
+        self.assertEqual(member.family_id, target.id)
+        self.assertEqual(Insuree.objects.filter(legacy_id=member.id).count(), 1)
+        self.assertEqual(Family.objects.get(id=target.id).member_count, 2)
+        self.assertEqual(Family.objects.get(id=family.id).member_count, 1)
+
+    def test_split_by_uuids_refuses_deleted_insuree(self):
+        from core import datetime
+        family, head, member = self._create_family_with_member()
+        Insuree.objects.filter(id=member.id).update(validity_to=datetime.datetime.now())
+        target = create_test_insuree(with_family=True, is_head=True).family
+        errors = FamilyService(self.test_user).split_by_uuids(target.uuid, [member.uuid])
+        self.assertEqual([error['title'] for error in errors], [member.uuid])
+        member.refresh_from_db()
+        self.assertEqual(member.family_id, family.id)
+
+    def test_merge_by_uuids(self):
+        family, head, member = self._create_family_with_member()
+        target = create_test_insuree(with_family=True, is_head=True).family
+        # the target itself is ignored, not reported as missing, and uuids match whatever their case
+        errors = FamilyService(self.test_user).merge_by_uuids(
+            str(target.uuid).upper(), [str(family.uuid).upper(), target.uuid])
+        self.assertEqual(errors, [])
+        head.refresh_from_db()
+        family.refresh_from_db()
+        self.assertEqual(head.family_id, target.id)
+        self.assertFalse(head.head)
+        self.assertIsNotNone(family.validity_to)
+        self.assertEqual(Family.objects.get(id=target.id).member_count, 3)
+
+    def test_set_deleted_bulk_unknown_uuid(self):
+        errors = FamilyService(self.test_user).set_deleted_bulk(["00000000-0000-0000-0000-000000000000"], True)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['title'], "00000000-0000-0000-0000-000000000000")
+
+
+class InsureeServiceBulkTest(TestCase):
+    test_user = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = create_test_interactive_user(username="testBulkInsureeServices")
+
+    def tearDown(self):
+        # test status reasons are rolled back but stay in the local reference data
+        clear_local_reference_data()
+
+    def test_create_or_update_taken_insuree_number(self):
+        existing = create_test_insuree(with_family=False)
+        data = {
+            "chf_id": existing.chf_id,
+            "last_name": "Taken",
+            "other_names": "Number",
+            "gender": existing.gender,
+            "dob": existing.dob,
+            "head": False,
+            "card_issued": False,
+        }
+        # The unique index arbitrates, its violation is reported with the validation error code
+        with self.assertRaises(ValidationError) as context:
+            InsureeService(self.test_user).create_or_update(data)
+        self.assertEqual(context.exception.code, InsureeConfig.validation_code_taken_insuree_number)
+        self.assertEqual(Insuree.objects.filter(chf_id=existing.chf_id, validity_to__isnull=True).count(), 1)
+
+    def test_update_keeping_insuree_number_skips_reservations(self):
+        existing = create_test_insuree(with_family=False)
+        data = {
+            "uuid": existing.uuid,
+            "chf_id": existing.chf_id,
+            "last_name": "Renamed",
+            "other_names": existing.other_names,
+            "gender": existing.gender,
+            "dob": existing.dob,
+            "head": False,
+            "card_issued": False,
+        }
+        number = next(str(n) for n in range(10000000, 99999999) if validate_insuree_number(str(n)) == [])
+        with mock.patch("insuree.services.reserved_insuree_number", return_value=[]) as reserved:
+            InsureeService(self.test_user).create_or_update(dict(data))
+            reserved.assert_not_called()
+            # a changed number is checked
+            InsureeService(self.test_user).create_or_update({**data, "chf_id": number})
+            reserved.assert_called_once()
+
+    def test_remove_by_uuids_refuses_head(self):
+        head = create_test_insuree(with_family=True, is_head=True)
+        member = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        family_id = head.family_id
+        errors = InsureeService(self.test_user).remove_by_uuids(
+            [head.uuid, str(member.uuid).upper()], cancel_policies=True)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['title'], head.uuid)
+        self.assertIsNone(Insuree.objects.get(id=member.id).family_id)
+        self.assertEqual(Insuree.objects.get(id=head.id).family_id, family_id)
+        self.assertEqual(Family.objects.get(id=family_id).head_insuree_id, head.id)
+
+    def test_set_deleted_by_uuids(self):
+        head = create_test_insuree(with_family=True, is_head=True)
+        member = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        errors = InsureeService(self.test_user).set_deleted_by_uuids([member.uuid, member.uuid])
+        self.assertEqual(errors, [])
+        member.refresh_from_db()
+        self.assertIsNotNone(member.validity_to)
+        self.assertEqual(Insuree.objects.filter(legacy_id=member.id).count(), 1)
+
+    def test_family_member_count(self):
+        head = create_test_insuree(with_family=True, is_head=True)
+        member = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        other = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        family = Family.objects.get(id=head.family_id)
+        self.assertEqual(family.member_count, 3)
+        service = InsureeService(self.test_user)
+        self.assertEqual(service.remove_by_uuids([member.uuid]), [])
+        self.assertEqual(service.set_deleted_by_uuids([other.uuid]), [])
+        family.refresh_from_db()
+        self.assertEqual(family.member_count, 1)
+
+    def test_family_member_count_single_row_moves(self):
+        from insuree.gql_mutations import ChangeInsureeFamilyMutation
+        head = create_test_insuree(with_family=True, is_head=True)
+        member = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        moved = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        target_head = create_test_insuree(with_family=True, is_head=True)
+        self.assertEqual(Family.objects.get(id=head.family_id).member_count, 3)
+        # The family left by a removed insuree is refreshed, even if the insuree has no family anymore
+        self.assertEqual(InsureeService(self.test_user).remove(Insuree.objects.get(id=member.id)), [])
+        self.assertEqual(Family.objects.get(id=head.family_id).member_count, 2)
+        self.assertIsNone(ChangeInsureeFamilyMutation.async_mutate(
+            self.test_user, family_uuid=target_head.family.uuid, insuree_uuid=moved.uuid, cancel_policies=False))
+        self.assertEqual(Family.objects.get(id=head.family_id).member_count, 1)
+        self.assertEqual(Family.objects.get(id=target_head.family_id).member_count, 2)
+        # history copies and updates that keep the member in its family do not refresh the count
+        with mock.patch("insuree.services.refresh_family_member_count") as refresh:
+            insuree = Insuree.objects.get(id=moved.id)
+            insuree.save_history()
+            insuree.other_names = "Renamed"
+            insuree.save()
+        refresh.assert_not_called()
+
+    def test_change_status_bulk(self):
+        reason = InsureeStatusReason.objects.create(
+            id=990, code="TDEAD", insuree_status_reason="Test death", status_type=InsureeStatus.DEAD,
+            validity_from="2019-01-01")
+        head = create_test_insuree(with_family=True, is_head=True)
+        member = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        service = InsureeService(self.test_user)
+        self.assertEqual(service.change_status_bulk([head.id, member.id], InsureeStatus.DEAD, reason.code), 2)
+        # already dead insurees are left untouched
+        self.assertEqual(service.change_status_bulk([head.id, member.id], InsureeStatus.DEAD, reason.code), 0)
+        member.refresh_from_db()
+        self.assertEqual(member.status, InsureeStatus.DEAD)
+        self.assertEqual(member.status_reason_id, reason.id)
+        self.assertEqual(Insuree.objects.filter(legacy_id=member.id).count(), 1)
+
+
+class InsureeStatusFeedServiceTest(TestCase):
+    test_user = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = create_test_interactive_user(username="testInsureeStatusFeed")
+        cls.reason = InsureeStatusReason.objects.create(
+            id=991, code="TFEED", insuree_status_reason="Test feed death", status_type=InsureeStatus.DEAD,
+            validity_from="2019-01-01")
+
+    def tearDown(self):
+        clear_local_reference_data()
+
+    def _rows(self, first, second):
+        return [
+            (first.chf_id, "DEAD", self.reason.code, "2024-01-02"),
+            ("990000030", "DEAD", self.reason.code, "2024-01-02"),
+            (second.chf_id, "DEAD", self.reason.code, "2024-13-45"),
+        ]
+
+    def test_ingest_is_idempotent(self):
+        first = create_test_insuree(with_family=False)
+        second = create_test_insuree(with_family=False)
+        service = InsureeStatusFeedService(self.test_user)
+        summary = service.ingest(self._rows(first, second))
+        self.assertEqual(summary, {"read": 3, "updated": 1, "unknown_insurees": 1, "invalid_rows": 1})
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, InsureeStatus.DEAD)
+        self.assertEqual(str(first.status_date), "2024-01-02")
+        self.assertNotEqual(second.status, InsureeStatus.DEAD)
+        self.assertEqual(service.ingest(self._rows(first, second))["updated"], 0)
+
+    def test_ingest_resumes_after_row(self):
+        first = create_test_insuree(with_family=False)
+        second = create_test_insuree(with_family=False)
+        rows = self._rows(first, second)
+        rows[2] = (second.chf_id, "DEAD", self.reason.code, "2024-01-03")
+        positions = []
+        summary = InsureeStatusFeedService(self.test_user, chunk_size=1).ingest(
+            rows, start=1, on_chunk_done=positions.append)
+        self.assertEqual(positions, [2, 3])
+        self.assertEqual(summary["read"], 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        # rows up to the checkpoint are not imported again
+        self.assertNotEqual(first.status, InsureeStatus.DEAD)
+        self.assertEqual(second.status, InsureeStatus.DEAD)
+
+
+class InsureeNumberPoolServiceTest(TestCase):
+    test_user = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = create_test_interactive_user(username="testInsureeNumberPool")
+
+    def test_reserve_block(self):
+        with self.settings(
+                INSUREE_NUMBER_VALIDATOR=None,
+                INSUREE_NUMBER_LENGTH=9,
+                INSUREE_NUMBER_MODULE_ROOT=7):
+            service = InsureeNumberPoolService(self.test_user)
+            first = service.reserve_block(5, device="tablet-1")
+            second = service.reserve_block(3, officer_id=1)
+            self.assertEqual(len(first), 5)
+            self.assertEqual(len(second), 3)
+            self.assertFalse(set(first) & set(second))
+            for number in first:
+                self.assertEqual(validate_insuree_number(number, device="tablet-1"), [])
+            for number in second:
+                self.assertEqual(validate_insuree_number(number, officer_id=1), [])
+            self.assertEqual(list(service.available_numbers(device="tablet-1")), sorted(first))
+
+    def test_reserved_number_refused_for_other_device(self):
+        with self.settings(
+                INSUREE_NUMBER_VALIDATOR=None,
+                INSUREE_NUMBER_LENGTH=9,
+                INSUREE_NUMBER_MODULE_ROOT=7):
+            number = InsureeNumberPoolService(self.test_user).reserve_block(1, device="tablet-1")[0]
+            for device in [None, "tablet-2"]:
+                errors = validate_insuree_number(number, device=device)
+                self.assertEqual([error["errorCode"] for error in errors],
+                                 [InsureeConfig.validation_code_reserved_insuree_number])
+            # once assigned, the reservation no longer restricts the number (updates of the insuree)
+            create_test_insuree(with_family=False, custom_props={"chf_id": number})
+            self.assertEqual(validate_insuree_number(number, check_unique=False), [])
+
+    def test_reserve_block_skips_assigned_numbers(self):
+        with self.settings(
+                INSUREE_NUMBER_VALIDATOR=None,
+                INSUREE_NUMBER_LENGTH=9,
+                INSUREE_NUMBER_MODULE_ROOT=10):
+            service = InsureeNumberPoolService(self.test_user)
+            number = service.reserve_block(1, device="tablet-2")[0]
+            create_test_insuree(with_family=False, custom_props={"chf_id": number})
+            self.assertEqual(list(service.available_numbers(device="tablet-2")), [])
+            self.assertNotIn(number, service.reserve_block(2, device="tablet-2"))
+
+
+class InsureeCoverageTest(TestCase):
+    test_user = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = create_test_interactive_user(username="testInsureeCoverage")
+
+    def test_coverage_follows_insuree_policies(self):
+        from core import datetime, datetimedelta
+        from policy.models import Policy
+        from policy.test_helpers import create_test_policy_with_IPs
+        from product.test_helpers import create_test_product
+        today = datetime.date.today()
+        head = create_test_insuree(with_family=True, is_head=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_test_policy_with_IPs(
+                create_test_product("TCOV"), head,
+                policy_props={"status": Policy.STATUS_ACTIVE, "expiry_date": today + datetimedelta(years=1)},
+                IP_props={"effective_date": today, "expiry_date": today + datetimedelta(years=1)})
+        coverage = get_coverage(head.chf_id)
+        self.assertEqual(len(coverage), 1)
+        self.assertEqual(coverage[0]["product_code"], "TCOV")
+        self.assertEqual(get_coverages([head.chf_id, "unknown"])["unknown"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            InsureeService(self.test_user).cancel_policies(head)
+        self.assertEqual(get_coverage(head.chf_id, today + datetimedelta(days=1)), [])
+        self.assertEqual(rebuild_insuree_coverage(), InsureeCoverage.objects.count())
+
+    def test_refresh_drops_only_the_changed_numbers(self):
+        from core import datetime
+        first = create_test_insuree(with_family=False)
+        second = create_test_insuree(with_family=False)
+        # An interval without insuree policy, removed by the next refresh of the insuree
+        InsureeCoverage.objects.create(insuree=first, chf_id=first.chf_id, insuree_policy_id=-first.id,
+                                       policy_id=0, product_id=0, product_code="TSTALE",
+                                       effective_date=datetime.date.today())
+        self.assertEqual(len(get_coverages([first.chf_id, second.chf_id])[first.chf_id]), 1)
+        refresh_insuree_coverage([first.id, second.id])
+        # Only the intervals of the refreshed number are loaded again
+        with self.assertNumQueries(1):
+            coverages = get_coverages([first.chf_id, second.chf_id])
+        self.assertEqual(coverages, {first.chf_id: [], second.chf_id: []})
+
+    def test_refresh_skipped_when_coverage_fields_unchanged(self):
+        insuree = Insuree.objects.get(id=create_test_insuree(with_family=False).id)
+        with mock.patch("insuree.coverage.refresh_insuree_coverage_on_commit") as refresh:
+            insuree.last_name = "Renamed"
+            insuree.save()
+            refresh.assert_not_called()
+            insuree.chf_id = "990000046"
+            insuree.save()
+            refresh.assert_called_once_with([insuree.id])
+
+
+class InsureePolicyServiceTest(TestCase):
+    test_user = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = create_test_interactive_user(username="testInsureePolicyService")
+
+    def test_add_insuree_policies_within_max_members(self):
+        from core import datetime, datetimedelta
+        from policy.models import Policy
+        from policy.test_helpers import create_test_policy_with_IPs
+        from product.test_helpers import create_test_product
+        today = datetime.date.today()
+        head = create_test_insuree(with_family=True, is_head=True)
+        policy = create_test_policy_with_IPs(
+            create_test_product("TMAX", custom_props={"max_members": 2}), head,
+            policy_props={"status": Policy.STATUS_ACTIVE, "expiry_date": today + datetimedelta(years=1)})
+        first = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        second = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        service = InsureePolicyService(self.test_user)
+        created = service.add_insuree_policies([first, second])
+        self.assertEqual([(ip.insuree_id, ip.policy_id) for ip in created], [(first.id, policy.id)])
+        # already attached insurees and full policies are skipped
+        self.assertEqual(service.add_insuree_policies([first, second]), [])
+        # the can add insuree warning follows the same rule: the family already exceeds the max members
+        from insuree.services import family_member_count, policy_free_slots
+        policy = Policy.objects.select_related('product', 'family').get(id=policy.id)
+        self.assertEqual(family_member_count(policy.family), 3)
+        self.assertLess(policy_free_slots(policy, family_member_count(policy.family)), 1)
+        # a cancelled attachment no longer covers the insuree, it gets a new one
+        InsureeService(self.test_user).cancel_policies(first)
+        created = service.add_insuree_policies([first, second])
+        self.assertEqual([(ip.insuree_id, ip.policy_id) for ip in created], [(first.id, policy.id)])
+
+
+class ReferenceDataCacheTest(TestCase):
+    def tearDown(self):
+        clear_local_reference_data()
+
+    def test_reference_data_is_cached(self):
+        invalidate_reference_data()
+        genders = get_reference_list(Gender)
+        male = Gender.objects.filter(code='M').first()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_reference_list(Gender), genders)
+            self.assertEqual(get_reference(Gender, 'M'), male)
+
+    def test_save_invalidates_reference_data(self):
+        get_reference_list(Gender)
+        Gender.objects.create(code='X', gender='Test', sort_order=99)
+        self.assertIsNotNone(get_reference(Gender, 'X'))
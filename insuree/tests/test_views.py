@@ -0,0 +1,177 @@
+import base64
+import json
+from urllib.parse import quote
+
+from core.test_helpers import create_test_interactive_user
+from rest_framework import status
+from rest_framework.test import APITestCase
+from dataclasses import dataclass
+from graphql_jwt.shortcuts import get_token
+from core.models import User
+from django.conf import settings
+from django.core.cache import cache
+from insuree.apps import InsureeConfig
+from insuree.chf_id_filter import might_contain, read_filter_header
+from insuree.models import Insuree, InsureePhoto
+from insuree.services import InsureeService
+from insuree.test_helpers import create_test_insuree
+
+
+@dataclass
+class DummyContext:
+    """ Just because we need a context to generate. """
+    user: User
+
+
+class CachedViewsTests(APITestCase):
+
+    admin_user = None
+    admin_token = None
+    GENDERS_URL = f'/{settings.SITE_ROOT()}insuree/reference/genders/'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin_user = create_test_interactive_user(username="testCachedViewsAdmin")
+        cls.admin_token = get_token(cls.admin_user, DummyContext(user=cls.admin_user))
+
+    def test_reference_list_etag(self):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.admin_token}"}
+        response = self.client.get(self.GENDERS_URL, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertTrue(etag)
+        response = self.client.get(self.GENDERS_URL, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_unknown_reference_list(self):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.admin_token}"}
+        response = self.client.get(f'/{settings.SITE_ROOT()}insuree/reference/unknown/', **headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_insuree_by_chf_id_cache(self):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.admin_token}"}
+        insuree = create_test_insuree(with_family=False, custom_props={"chf_id": "990000032"})
+        url = f'/{settings.SITE_ROOT()}insuree/chf_id/{insuree.chf_id}/'
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        # A write without signal is not seen: the response comes from the cache
+        Insuree.objects.filter(id=insuree.id).update(last_name="Uncached")
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.json()["last_name"], insuree.last_name)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, **headers).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+        # A write of the insuree invalidates its entry
+        with self.captureOnCommitCallbacks(execute=True):
+            insuree.last_name = "Updated"
+            insuree.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["last_name"], "Updated")
+        response = self.client.get(f'/{settings.SITE_ROOT()}insuree/chf_id/{"9" * 300}/', **headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _delta_sync(self, since=None):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.admin_token}"}
+        url = f'/{settings.SITE_ROOT()}insuree/sync/'
+        if since:
+            url += f'?since={quote(since)}'
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [json.loads(line) for line in b"".join(response.streaming_content).decode("utf-8").splitlines()]
+
+    def test_delta_sync(self):
+        head = create_test_insuree(with_family=True, is_head=True)
+        member = create_test_insuree(with_family=False, custom_props={"family": head.family})
+        records = self._delta_sync()
+        self.assertEqual(records[-1]["type"], "watermark")
+        insuree_keys = {record["key"] for record in records if record["type"] == "insuree"}
+        self.assertTrue({head.uuid, member.uuid} <= insuree_keys)
+        watermark = records[-1]["next"]
+
+        # Removal from the family is an in place update, it must still be sent after the watermark
+        self.assertEqual(InsureeService(self.admin_user).remove_by_uuids([member.uuid]), [])
+        records = self._delta_sync(watermark)
+        removed = [record for record in records if record["type"] == "insuree" and record["key"] == member.uuid]
+        self.assertEqual(len(removed), 1)
+        self.assertIsNone(removed[0]["data"]["family__uuid"])
+        self.assertGreater(records[-1]["next"], watermark)
+
+        self.assertEqual(InsureeService(self.admin_user).set_deleted_by_uuids([member.uuid]), [])
+        records = self._delta_sync(watermark)
+        self.assertIn({"type": "insuree", "key": member.uuid, "deleted": True}, records)
+
+        # Time zone aware watermarks are accepted and an old watermark moves forward, even without changes
+        records = self._delta_sync("2000-01-01T00:00:00+02:00")
+        self.assertGreater(records[-1]["next"], "2000-01-02")
+
+    def test_chf_id_filter(self):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.admin_token}"}
+        insuree = create_test_insuree(with_family=False, custom_props={"chf_id": "990000045"})
+        cache.clear()
+        response = self.client.get(f'/{settings.SITE_ROOT()}insuree/chf_id_filter/', **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(might_contain(response.content, insuree.chf_id))
+        blob = response.content
+        header = read_filter_header(blob)
+        delta_url = f'/{settings.SITE_ROOT()}insuree/chf_id_filter/delta/' \
+                    f'?bits={header["bit_count"]}&hashes={header["hash_count"]}'
+        # The numbers of the last sync_safety_lag seconds are sent again (late commits), their positions are
+        # those already set for them in the downloaded filter
+        response = self.client.get(f'{delta_url}&since={header["version"]}', **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["version"], header["version"])
+        positions = response.json()["positions"]
+        self.assertTrue(positions)
+        bits = blob[-(header["bit_count"] // 8):]
+        self.assertTrue(all(bits[position // 8] & (1 << (position % 8)) for position in positions))
+        after_lag = header["version"] + (InsureeConfig.sync_safety_lag + 1) * 1_000_000
+        response = self.client.get(f'{delta_url}&since={after_lag}', **headers)
+        self.assertEqual(response.json(), {"version": after_lag, "positions": []})
+        response = self.client.get(f'/{settings.SITE_ROOT()}insuree/chf_id_filter/delta/?since=0', **headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_chf_id_filter_district_required(self):
+        from unittest import mock
+        from django.core.exceptions import PermissionDenied
+        from insuree.views import _check_district_allowed
+        user = mock.Mock()
+        user._u.is_imis_admin = False
+        # the nationwide filter is for administrators only
+        with self.assertRaises(PermissionDenied):
+            _check_district_allowed(user, None)
+        user._u.is_imis_admin = True
+        _check_district_allowed(user, None)
+
+    def test_insuree_enquiry(self):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.admin_token}"}
+        insuree = create_test_insuree(with_family=False, custom_props={"chf_id": "990000047"})
+        url = f'/{settings.SITE_ROOT()}insuree/enquiry/'
+        for _ in range(2):
+            response = self.client.post(url, {"chf_ids": [insuree.chf_id, "990000048", insuree.chf_id]},
+                                        format="json", **headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            content = response.json()
+            self.assertEqual([row["chf_id"] for row in content["insurees"]], [insuree.chf_id])
+            self.assertEqual(content["insurees"][0]["last_name"], insuree.last_name)
+            self.assertEqual(content["insurees"][0]["coverage"], [])
+            self.assertEqual(content["not_found"], ["990000048"])
+        response = self.client.get(f'{url}?chf_ids={",".join(str(n) for n in range(1000))}', **headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f'{url}?chf_ids=990000047,{quote("bad number:*")}', **headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_insuree_photo(self):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.admin_token}"}
+        insuree = create_test_insuree(with_family=False)
+        photo = InsureePhoto.objects.create(insuree=insuree, chf_id=insuree.chf_id, officer_id=-1,
+                                            date="2024-01-01", audit_user_id=-1,
+                                            photo=base64.b64encode(b"inline image").decode("utf-8"))
+        url = f'/{settings.SITE_ROOT()}insuree/photo/{photo.uuid}/'
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"inline image")
+        InsureePhoto.objects.filter(id=photo.id).update(photo="not base64!")
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -1 +1,18 @@
-urlpatterns = []
\ No newline at end of file
+from django.urls import path
+
+from insuree import views
+
+urlpatterns = [
+    path("reference/<str:name>/", views.reference_list),
+    path("chf_id/<str:chf_id>/", views.insuree_by_chf_id),
+    path("enquiry/", views.insuree_enquiry),
+    path("photo/<str:photo_uuid>/", views.insuree_photo, name="insuree_photo"),
+    path("sync/", views.delta_sync),
+    path("chf_id_filter/", views.chf_id_filter),
+    path("chf_id_filter/delta/", views.chf_id_filter_update),
+    path("export/insurees/", views.export_insurees),
+    path("export/families/", views.export_families),
+    path("report/<str:report_name>/<str:output_format>/async/", views.submit_report),
+    path("report/jobs/<str:job_id>/", views.report_job),
+    path("report/jobs/<str:job_id>/artifact/", views.report_job_artifact),
+]
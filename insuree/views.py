@@ -1 +1,417 @@
-# Create your views here.
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, Http404, StreamingHttpResponse, JsonResponse, FileResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext as _
+from location.models import LocationManager
+from rest_framework.decorators import api_view
+
+from insuree.apps import InsureeConfig
+from insuree.cache import get_data_version, get_insuree_data_version, get_insuree_data_versions, REFERENCE_DATA
+from insuree.models import Gender, Education, Profession, IdentificationType, ConfirmationType, Relation, \
+    FamilyType, Insuree, InsureePhoto, Family
+from insuree.coverage import get_coverages
+from insuree.reference_data import get_reference_list
+from insuree.sync import delta_sync_ndjson
+from insuree.export import export_response, INSUREE_EXPORT_FIELDS, FAMILY_EXPORT_FIELDS
+from insuree.chf_id_filter import get_chf_id_filter, chf_id_filter_delta
+from insuree import report_jobs
+
+logger = logging.getLogger(__name__)
+
+# name in url -> (model, permissions of the equivalent GraphQL query)
+REFERENCE_LISTS = {
+    "genders": (Gender, "gql_query_insuree_perms"),
+    "educations": (Education, "gql_query_families_perms"),
+    "professions": (Profession, "gql_query_families_perms"),
+    "identification_types": (IdentificationType, "gql_query_families_perms"),
+    "confirmation_types": (ConfirmationType, "gql_query_families_perms"),
+    "relations": (Relation, "gql_query_families_perms"),
+    "family_types": (FamilyType, "gql_query_families_perms"),
+}
+
+
+def _etag_matches(request, etag):
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+def cached_json_response(request, cache_key, build_data):
+    """
+    Serves the JSON built by build_data, cached under cache_key (which must contain the data version)
+    with a strong ETag. A matching If-None-Match gets a 304 without any database access.
+    """
+    entry = cache.get(cache_key)
+    if entry is None:
+        body = json.dumps(build_data(), cls=DjangoJSONEncoder)
+        entry = ('"%s"' % hashlib.sha1(body.encode("utf-8")).hexdigest(), body)
+        cache.set(cache_key, entry, InsureeConfig.http_cache_timeout)
+    etag, body = entry
+    response = HttpResponse(status=304) if _etag_matches(request, etag) \
+        else HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    # Clients must revalidate, the data is per user and may change at any write
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@api_view(["GET"])
+def reference_list(request, name):
+    if name not in REFERENCE_LISTS:
+        raise Http404
+    model, perms = REFERENCE_LISTS[name]
+    if not request.user.has_perms(getattr(InsureeConfig, perms)):
+        raise PermissionDenied(_("unauthorized"))
+    cache_key = f"insuree_http_reference_{name}_{get_data_version(REFERENCE_DATA)}"
+    return cached_json_response(
+        request, cache_key,
+        lambda: [{field.attname: getattr(row, field.attname) for field in model._meta.concrete_fields}
+                 for row in get_reference_list(model)])
+
+
+INSUREE_LOOKUP_FIELDS = ["uuid", "chf_id", "last_name", "other_names", "gender_id", "dob", "head", "marital",
+                         "phone", "email", "status", "status_date", "card_issued", "photo_date", "family__uuid",
+                         "current_village__uuid", "health_facility__uuid", "validity_from"]
+
+
+def _is_valid_chf_id(chf_id):
+    # Same rules as the chf_id filter of the insurees query
+    return len(chf_id) <= InsureeConfig.insuree_number_length and re.match("^[a-zA-Z0-9]+$", chf_id) is not None
+
+
+@api_view(["GET"])
+def insuree_by_chf_id(request, chf_id):
+    if not request.user.has_perms(InsureeConfig.gql_query_insurees_perms):
+        raise PermissionDenied(_("unauthorized"))
+    if not _is_valid_chf_id(chf_id):
+        return HttpResponse(status=400)
+    # Row security depends on the user, so is the cached response
+    cache_key = f"insuree_http_chf_id_{request.user.id}_{chf_id}_{get_insuree_data_version(chf_id)}"
+
+    def build_data():
+        insuree = Insuree.get_queryset(None, request.user) \
+            .filter(chf_id=chf_id, validity_to__isnull=True) \
+            .values(*INSUREE_LOOKUP_FIELDS) \
+            .first()
+        if insuree is None:
+            raise Http404
+        return insuree
+
+    return cached_json_response(request, cache_key, build_data)
+
+
+ENQUIRY_FIELDS = ["chf_id", "last_name", "other_names", "gender_id", "dob", "photo__uuid"]
+
+
+def _enquiry_chf_ids(request):
+    if request.method == "POST":
+        chf_ids = request.data.get("chf_ids")
+    else:
+        chf_ids = request.GET.get("chf_ids", "").split(",")
+    if not isinstance(chf_ids, list) or not all(isinstance(chf_id, str) for chf_id in chf_ids):
+        raise ValidationError("chf_ids must be a list of insuree numbers")
+    # Duplicated scans are answered once, in the scanned order
+    chf_ids = list(dict.fromkeys(chf_id.strip() for chf_id in chf_ids if chf_id.strip()))
+    if not chf_ids or len(chf_ids) > InsureeConfig.enquiry_max_chf_ids:
+        raise ValidationError(f"between 1 and {InsureeConfig.enquiry_max_chf_ids} insuree numbers expected")
+    # The numbers are part of the cache keys
+    invalid = [chf_id for chf_id in chf_ids if not _is_valid_chf_id(chf_id)]
+    if invalid:
+        raise ValidationError("invalid insuree numbers: %s" % ", ".join(invalid[:10]))
+    return chf_ids
+
+
+def _enquiry_insurees(chf_ids):
+    """
+    Compact projection of the current insurees, cached per insuree number until the next write of the insuree
+    (or enquiry_cache_timeout). The numbers missing from the cache are read with a single query.
+    """
+    versions = get_insuree_data_versions(chf_ids)
+    keys = {chf_id: f"insuree_enquiry_{chf_id}_{versions[chf_id]}" for chf_id in chf_ids}
+    cached = cache.get_many(keys.values())
+    insurees = {chf_id: cached[key] for chf_id, key in keys.items() if key in cached}
+    missing = [chf_id for chf_id in chf_ids if chf_id not in insurees]
+    if missing:
+        loaded = dict.fromkeys(missing)
+        for row in Insuree.objects.filter(chf_id__in=missing, validity_to__isnull=True).values(*ENQUIRY_FIELDS):
+            photo_uuid = row.pop("photo__uuid")
+            row["gender"] = row.pop("gender_id")
+            row["photo_url"] = reverse("insuree_photo", args=[photo_uuid]) if photo_uuid else None
+            loaded[row["chf_id"]] = row
+        # Unknown numbers are cached too (as None), repeated scans of a wrong card don't hit the database
+        cache.set_many({keys[chf_id]: row for chf_id, row in loaded.items()}, InsureeConfig.enquiry_cache_timeout)
+        insurees.update(loaded)
+    return insurees
+
+
+@api_view(["GET", "POST"])
+def insuree_enquiry(request):
+    """
+    Batched enquiry of health facilities: for up to enquiry_max_chf_ids insuree numbers (?chf_ids=a,b or
+    POST {"chf_ids": [...]}), the name, gender, dob, photo url and current coverage of the insurees.
+    Like the single insuree enquiry, it is not restricted to the locations of the user.
+    """
+    if not request.user.has_perms(InsureeConfig.gql_query_insuree_perms):
+        raise PermissionDenied(_("unauthorized"))
+    try:
+        chf_ids = _enquiry_chf_ids(request)
+    except ValidationError as exc:
+        return HttpResponse(" ".join(exc.messages), status=400)
+    insurees = _enquiry_insurees(chf_ids)
+    found = [chf_id for chf_id in chf_ids if insurees[chf_id] is not None]
+    coverages = get_coverages(found)
+    return JsonResponse({
+        "insurees": [
+            {**insurees[chf_id], "coverage": [
+                {key: interval[key] for key in ["product_code", "effective_date", "expiry_date"]}
+                for interval in coverages[chf_id]]}
+            for chf_id in found],
+        "not_found": [chf_id for chf_id in chf_ids if insurees[chf_id] is None],
+    })
+
+
+@api_view(["GET"])
+def insuree_photo(request, photo_uuid):
+    """
+    Image of a current insuree photo, from its file or from the database when stored inline.
+    """
+    if not request.user.has_perms(InsureeConfig.gql_query_insuree_photo_perms):
+        raise PermissionDenied(_("unauthorized"))
+    photo = InsureePhoto.objects.filter(uuid=photo_uuid, validity_to__isnull=True).first()
+    if photo is None:
+        raise Http404
+    content_type = mimetypes.guess_type(photo.filename or "")[0] or "image/jpeg"
+    file_path = photo.full_file_path()
+    if file_path and os.path.exists(file_path):
+        response = FileResponse(open(file_path, "rb"), content_type=content_type)
+    elif photo.photo:
+        try:
+            response = HttpResponse(base64.b64decode(photo.photo), content_type=content_type)
+        except binascii.Error:
+            logger.warning("Corrupt inline photo %s", photo_uuid)
+            raise Http404
+    else:
+        raise Http404
+    response["Cache-Control"] = "private, max-age=%s" % InsureeConfig.http_cache_timeout
+    return response
+
+
+@api_view(["GET"])
+def delta_sync(request):
+    """
+    Families, insurees, photos metadata and insuree policies changed since the ?since=<validity_from>
+    watermark (ISO datetime), as newline delimited JSON. Without since, it is a full sync.
+    """
+    if not request.user.has_perms(InsureeConfig.gql_query_insurees_perms) \
+            or not request.user.has_perms(InsureeConfig.gql_query_families_perms):
+        raise PermissionDenied(_("unauthorized"))
+    since = request.GET.get("since")
+    if since:
+        try:
+            since = parse_datetime(since)
+        except ValueError:
+            since = None
+        if since is None:
+            return HttpResponse(status=400)
+        # validity_from values are naive, in the server time zone
+        if timezone.is_aware(since):
+            since = timezone.make_naive(since)
+    return StreamingHttpResponse(delta_sync_ndjson(request.user, since), content_type="application/x-ndjson")
+
+
+def _int_param(request, name):
+    value = request.GET.get(name)
+    return int(value) if value else None
+
+
+def _check_district_allowed(user, district_id):
+    """
+    A filter restricted to a district is only served to the users of that district (location row security),
+    the nationwide filter (no district) only to the administrators
+    """
+    if user._u.is_imis_admin:
+        return
+    if not district_id or not LocationManager().is_allowed(user._u, [district_id]):
+        raise PermissionDenied(_("unauthorized"))
+
+
+@api_view(["GET"])
+def chf_id_filter(request):
+    """
+    Bloom filter of the current insuree numbers (?district=<id> to restrict it to a district, required but for
+    administrators), as a binary blob described in insuree.chf_id_filter. Offline clients then keep it up to date with chf_id_filter_delta.
+    """
+    if not request.user.has_perms(InsureeConfig.gql_query_insurees_perms):
+        raise PermissionDenied(_("unauthorized"))
+    try:
+        district_id = _int_param(request, "district")
+    except ValueError:
+        return HttpResponse(status=400)
+    _check_district_allowed(request.user, district_id)
+    digest, blob = get_chf_id_filter(district_id)
+    etag = '"%s"' % digest
+    response = HttpResponse(status=304) if _etag_matches(request, etag) \
+        else HttpResponse(blob, content_type="application/octet-stream")
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@api_view(["GET"])
+def chf_id_filter_update(request):
+    """
+    Bit positions of the insuree numbers added since the ?since=<filter version>, to set in the client filter
+    (?bits=<m>&hashes=<k> of its header), with the new filter version.
+    """
+    if not request.user.has_perms(InsureeConfig.gql_query_insurees_perms):
+        raise PermissionDenied(_("unauthorized"))
+    try:
+        since = _int_param(request, "since")
+        bit_count = _int_param(request, "bits")
+        hash_count = _int_param(request, "hashes")
+        district_id = _int_param(request, "district")
+    except ValueError:
+        return HttpResponse(status=400)
+    if since is None or not bit_count or bit_count % 8 or not hash_count or not 0 < hash_count <= 255:
+        return HttpResponse(status=400)
+    _check_district_allowed(request.user, district_id)
+    return JsonResponse(chf_id_filter_delta(since, bit_count, hash_count, district_id))
+
+
+# Arguments of the insurees/families queries that can be given as query parameters of the exports
+EXPORT_QUERY_ARGS = {
+    "chf_id": str,
+    "show_history": lambda value: value.lower() == "true",
+    "ignore_location": lambda value: value.lower() == "true",
+    "null_as_false_poverty": lambda value: value.lower() == "true",
+    "parent_location": str,
+    "parent_location_level": int,
+    "officer": str,
+    "additional_filters": json.loads,
+    "additional_filter": json.loads,
+}
+
+
+def _export_args(request, filter_fields):
+    """
+    Splits the query parameters into arguments of the query resolver and django-filter lookups
+    (e.g. last_name__icontains=foo), restricted to the filter_fields of the GraphQL type.
+    """
+    kwargs = {}
+    lookups = {}
+    for name, value in request.GET.items():
+        if name in EXPORT_QUERY_ARGS:
+            kwargs[name] = EXPORT_QUERY_ARGS[name](value)
+            continue
+        if "exact" in filter_fields.get(name, []):
+            lookups[name] = value
+            continue
+        field, _sep, lookup = name.rpartition("__")
+        if field and lookup in filter_fields.get(field, []):
+            lookups[name] = value.lower() == "true" if lookup == "isnull" else value
+    return kwargs, lookups
+
+
+def _export_fields(request, default_fields):
+    fields = request.GET.get("fields")
+    if not fields:
+        return default_fields
+    fields = [field for field in fields.split(",") if field in default_fields]
+    if not fields:
+        raise ValidationError("no exportable field requested")
+    return fields
+
+
+@api_view(["GET"])
+def export_insurees(request):
+    """
+    Streaming export of the insurees query (?format=csv|ndjson|parquet), with the same filters,
+    location restrictions and row security as the GraphQL insurees query.
+    """
+    from insuree.schema import insuree_filters
+    from insuree.gql_queries import InsureeGQLType
+    if not request.user.has_perms(InsureeConfig.gql_query_insurees_perms):
+        raise PermissionDenied(_("unauthorized"))
+    try:
+        kwargs, lookups = _export_args(request, InsureeGQLType._meta.filter_fields)
+        filters = insuree_filters(None, request.user, **kwargs)
+        queryset = Insuree.get_queryset(None, request.user).filter(*filters, **lookups).order_by("id")
+        return export_response(queryset, _export_fields(request, INSUREE_EXPORT_FIELDS),
+                               request.GET.get("format", "csv"), "insurees")
+    except (ValidationError, ValueError) as exc:
+        return HttpResponse(str(exc), status=400)
+
+
+@api_view(["GET"])
+def export_families(request):
+    """
+    Streaming export of the families query (?format=csv|ndjson|parquet), with the same filters,
+    location restrictions and row security as the GraphQL families query.
+    """
+    from insuree.schema import family_filters
+    from insuree.gql_queries import FamilyGQLType
+    if not request.user.has_perms(InsureeConfig.gql_query_families_perms):
+        raise PermissionDenied(_("unauthorized"))
+    try:
+        kwargs, lookups = _export_args(request, FamilyGQLType._meta.filter_fields)
+        filters = family_filters(None, request.user, **kwargs)
+        # Duplicates cannot be removed with distinct, as TEXT field is not comparable
+        ids = Family.objects.filter(*filters, **lookups).values_list('id')
+        queryset = Family.get_queryset(None, request.user).filter(id__in=ids).order_by("id")
+        return export_response(queryset, _export_fields(request, FAMILY_EXPORT_FIELDS),
+                               request.GET.get("format", "csv"), "families")
+    except (ValidationError, ValueError) as exc:
+        return HttpResponse(str(exc), status=400)
+
+
+def _job_status(job):
+    return {key: job[key] for key in ["id", "report", "format", "status", "progress", "rows", "error"]}
+
+
+@api_view(["POST"])
+def submit_report(request, report_name, output_format):
+    """
+    Queues a report (parameters as query string, like the synchronous report urls) and returns the job.
+    """
+    definition = report_jobs.get_report_definition(report_name)
+    if definition is None or output_format not in report_jobs.REPORT_FORMATS:
+        raise Http404
+    if not report_jobs.can_run_report(request.user, definition):
+        raise PermissionDenied(_("unauthorized"))
+    job = report_jobs.submit_report(request.user, report_name, output_format, request.GET.dict())
+    return JsonResponse(_job_status(job), status=202)
+
+
+def _get_user_job(request, job_id):
+    job = report_jobs.get_job(job_id)
+    if job is None or not report_jobs.can_read_job(request.user, job):
+        raise Http404
+    return job
+
+
+@api_view(["GET"])
+def report_job(request, job_id):
+    return JsonResponse(_job_status(_get_user_job(request, job_id)))
+
+
+@api_view(["GET"])
+def report_job_artifact(request, job_id):
+    job = _get_user_job(request, job_id)
+    if job["status"] != report_jobs.JOB_DONE or not os.path.exists(job["artifact"]):
+        return JsonResponse(_job_status(job), status=409)
+    return FileResponse(open(job["artifact"], "rb"), as_attachment=True,
+                        filename=f'{job["report"]}.{job["format"]}')